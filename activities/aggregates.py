@@ -0,0 +1,114 @@
+"""Agregados de avance por proyecto, mantenidos incrementalmente.
+
+Cada actividad aporta al proyecto una tupla ``(1, completada, peso,
+peso * avance, en progreso, avance)``; al crear, editar o borrar una actividad se suma al
+proyecto la diferencia entre su aporte nuevo y el anterior con un UPDATE
+``campo = campo + delta``, sin recorrer las demás actividades.
+"""
+from collections import defaultdict
+from django.db.models import F
+from django.utils import timezone
+from core.versioning import ACTIVITIES, bump_versions
+from .models import Project
+
+TRACKED_FIELDS = ('project_id', 'status', 'progress_percent', 'planned_start', 'planned_end')
+AGGREGATE_FIELDS = ('activity_count', 'completed_count', 'progress_weight_total', 'progress_weighted_sum',
+                    'in_progress_count', 'progress_sum')
+NO_ACTIVITIES = (0,) * len(AGGREGATE_FIELDS)
+
+
+def activity_weight(planned_start, planned_end):
+    """Peso de una actividad: su duración planificada en días (1 si no tiene fechas válidas)."""
+    if planned_start and planned_end and planned_end >= planned_start:
+        return (planned_end - planned_start).days + 1
+    return 1
+
+
+def tracked_state(activity):
+    # to_python normaliza fechas asignadas como texto ('2026-01-31')
+    start, end = (activity._meta.get_field(f).to_python(getattr(activity, f)) for f in ('planned_start', 'planned_end'))
+    return activity.project_id, activity.status, activity.progress_percent, start, end
+
+
+def contribution(state):
+    project_id, status, progress, planned_start, planned_end = state
+    weight = activity_weight(planned_start, planned_end)
+    return project_id, (1, int(status == 'completada'), weight, weight * progress, int(status == 'en_progreso'), progress)
+
+
+class ProjectDeltas:
+    """Acumula diferencias de aporte por proyecto y las aplica en un UPDATE por proyecto.
+
+    Cada proyecto tocado además incrementa su ``version`` y ``modified_at``.
+    """
+
+    def __init__(self):
+        self.deltas = defaultdict(lambda: [0] * len(AGGREGATE_FIELDS))
+
+    def touch(self, project_id):
+        return self.deltas[project_id]
+
+    def add(self, state, sign=1):
+        if state is None:
+            return
+        project_id, values = contribution(state)
+        delta = self.touch(project_id)
+        for i, value in enumerate(values):
+            delta[i] += sign * value
+
+    def change(self, old_state, new_state):
+        self.add(old_state, -1)
+        self.add(new_state, 1)
+
+    def apply(self):
+        now = timezone.now()
+        for project_id, delta in self.deltas.items():
+            Project.objects.filter(pk=project_id).update(version=F('version') + 1, modified_at=now, **{
+                field: F(field) + value for field, value in zip(AGGREGATE_FIELDS, delta) if value
+            })
+        self.deltas.clear()
+
+
+def touch_projects(project_ids):
+    """Marca proyectos como modificados cuando sus actividades cambian por una vía sin agregados."""
+    Project.objects.filter(pk__in=project_ids).update(version=F('version') + 1, modified_at=timezone.now())
+
+
+def add_to_project_aggregates(activities):
+    """Suma al proyecto actividades creadas en bloque (``bulk_create`` no dispara señales)."""
+    deltas = ProjectDeltas()
+    for activity in activities:
+        activity._tracked_state = tracked_state(activity)
+        deltas.add(activity._tracked_state)
+    deltas.apply()
+    bump_versions(ACTIVITIES)
+
+
+def compute_project_aggregates(project_ids=None):
+    """Recalcula los agregados desde las actividades: ``{project_id: (conteo, completadas, peso, suma)}``."""
+    from .models import Activity
+    totals = defaultdict(lambda: [0] * len(AGGREGATE_FIELDS))
+    activities = Activity.objects.order_by()
+    if project_ids is not None:
+        activities = activities.filter(project_id__in=project_ids)
+    for state in activities.values_list(*TRACKED_FIELDS).iterator(chunk_size=5000):
+        project_id, values = contribution(state)
+        for i, value in enumerate(values):
+            totals[project_id][i] += value
+    return {pk: tuple(values) for pk, values in totals.items()}
+
+
+def verify_project_aggregates(fix=False):
+    """Compara los agregados guardados con un recálculo completo; devuelve los proyectos con diferencias."""
+    expected = compute_project_aggregates()
+    drifted = []
+    for project in Project.objects.only('id', 'name', *AGGREGATE_FIELDS):
+        values = expected.get(project.pk, NO_ACTIVITIES)
+        if tuple(getattr(project, f) for f in AGGREGATE_FIELDS) != values:
+            drifted.append((project, values))
+            for field, value in zip(AGGREGATE_FIELDS, values):
+                setattr(project, field, value)
+    if fix and drifted:
+        Project.objects.bulk_update([p for p, _ in drifted], AGGREGATE_FIELDS, batch_size=500)
+        bump_versions(ACTIVITIES)
+    return drifted
@@ -0,0 +1,37 @@
+"""Archivado de registros de avance antiguos y lectura del historial archivado.
+
+De cada actividad se conserva en la tabla su último registro anterior al
+corte, así el avance vigente, la validación de fechas de ``record_logs`` y
+la curva S desde el corte en adelante no necesitan leer los archivos.
+"""
+from datetime import date
+from django.db.models import OuterRef, Subquery
+from core.archive import archive_queryset, read_rows
+from .aggregates import touch_projects
+from .models import Project, ActivityLog
+
+KIND = 'activity_logs'
+FIELDS = ('id', 'activity_id', 'date', 'progress_percent', 'notes')
+
+
+def archive_logs(cutoff_day, dry_run=False):
+    """Archiva los registros con fecha anterior a ``cutoff_day`` (salvo el último de cada actividad)."""
+    latest = (ActivityLog.objects.filter(activity=OuterRef('activity'), date__lt=cutoff_day)
+              .order_by('-date', '-id').values('id')[:1])
+    logs = ActivityLog.objects.filter(date__lt=cutoff_day).exclude(pk=Subquery(latest))
+    archived = archive_queryset(KIND, logs, FIELDS, 'date', cutoff_day, dry_run=dry_run)
+    if archived and not dry_run:
+        # las curvas S en caché dependen de la versión de cada proyecto
+        touch_projects(Project.objects.values('id'))
+    return archived
+
+
+def archived_logs(activity_ids=None, start=None, end=None):
+    """Registros archivados (como dicts) con fecha entre ``start`` y ``end`` inclusive."""
+    for row in read_rows(KIND, start, end):
+        if activity_ids is not None and row['activity_id'] not in activity_ids:
+            continue
+        row['date'] = date.fromisoformat(row['date'])
+        if (start and row['date'] < start) or (end and row['date'] > end):
+            continue
+        yield row
@@ -1,5 +1,5 @@
 from django import forms
-from .models import Project, Activity, ActivityLog
+from .models import Project, Activity, ActivityLog, ActivityDependency
 
 class ProjectForm(forms.ModelForm):
     class Meta:
@@ -22,3 +22,20 @@ class ActivityLogForm(forms.ModelForm):
     class Meta:
         model = ActivityLog
         fields = ['activity','date','progress_percent','notes','status']
+
+class ActivityDependencyForm(forms.ModelForm):
+    class Meta:
+        model = ActivityDependency
+        fields = ['predecessor','successor','lag_days']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ('predecessor', 'successor'):
+            self.fields[name].queryset = Activity.objects.select_related('project').order_by('project__name', 'name')
+
+    def clean(self):
+        cleaned = super().clean()
+        predecessor, successor = cleaned.get('predecessor'), cleaned.get('successor')
+        if predecessor and successor and predecessor.project_id != successor.project_id:
+            raise forms.ValidationError('Las actividades deben pertenecer al mismo proyecto.')
+        return cleaned
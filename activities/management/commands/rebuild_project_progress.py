@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from activities.aggregates import AGGREGATE_FIELDS, verify_project_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recalcula los agregados de avance de cada proyecto desde sus actividades."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help='Solo informa las diferencias, sin corregirlas.')
+
+    def handle(self, *args, **options):
+        drifted = verify_project_aggregates(fix=not options['verify'])
+        for project, expected in drifted:
+            values = ', '.join(f"{field}={value}" for field, value in zip(AGGREGATE_FIELDS, expected))
+            self.stdout.write(self.style.WARNING(f"{project}: se esperaba {values}"))
+        if drifted:
+            action = 'con diferencias' if options['verify'] else 'corregidos'
+            self.stdout.write(self.style.WARNING(f"{len(drifted)} proyectos {action}."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Los agregados de todos los proyectos están al día."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from activities.models import Project
+from activities.scheduling import ScheduleCycleError, schedule_project
+
+
+class Command(BaseCommand):
+    help = "Recalcula la ruta crítica (fechas tempranas/tardías y holgura) de los proyectos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help='Id de un proyecto (por defecto, todos).')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.order_by('id')
+        if options['project']:
+            projects = projects.filter(pk=options['project'])
+            if not projects.exists():
+                raise CommandError(f"No existe el proyecto {options['project']}.")
+        for project in projects:
+            try:
+                updated = schedule_project(project)
+            except ScheduleCycleError as e:
+                self.stdout.write(self.style.ERROR(str(e)))
+                continue
+            self.stdout.write(f"{project}: {updated} actividades actualizadas.")
+        self.stdout.write(self.style.SUCCESS("Ruta crítica recalculada."))
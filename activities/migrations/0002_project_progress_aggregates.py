@@ -0,0 +1,135 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_project_aggregates(apps, schema_editor):
+    Project = apps.get_model('activities', 'Project')
+    Activity = apps.get_model('activities', 'Activity')
+    totals = {}
+    rows = Activity.objects.order_by().values_list('project_id', 'status', 'progress_percent',
+                                                   'planned_start', 'planned_end')
+    for project_id, status, progress, start, end in rows.iterator(chunk_size=5000):
+        weight = (end - start).days + 1 if start and end and end >= start else 1
+        entry = totals.setdefault(project_id, [0, 0, 0, 0])
+        entry[0] += 1
+        entry[1] += status == 'completada'
+        entry[2] += weight
+        entry[3] += weight * progress
+    for project_id, (count, completed, weight, weighted) in totals.items():
+        Project.objects.filter(pk=project_id).update(activity_count=count, completed_count=completed,
+                                                     progress_weight_total=weight, progress_weighted_sum=weighted)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='activity',
+            options={'verbose_name': 'Actividad', 'verbose_name_plural': 'Actividades'},
+        ),
+        migrations.AlterModelOptions(
+            name='activitylog',
+            options={'verbose_name': 'Registro de Actividad', 'verbose_name_plural': 'Registros de Actividades'},
+        ),
+        migrations.AlterModelOptions(
+            name='project',
+            options={'verbose_name': 'Proyecto', 'verbose_name_plural': 'Proyectos'},
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='activity_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Actividades'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Actividades Completadas'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='progress_weight_total',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Peso Total'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='progress_weighted_sum',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Avance Ponderado Acumulado'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='name',
+            field=models.CharField(max_length=150, verbose_name='Nombre'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='planned_end',
+            field=models.DateField(blank=True, null=True, verbose_name='Fin Planificado'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='planned_start',
+            field=models.DateField(blank=True, null=True, verbose_name='Inicio Planificado'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='progress_percent',
+            field=models.PositiveIntegerField(default=0, verbose_name='Progreso (%)'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='project',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='activities.project', verbose_name='Proyecto'),
+        ),
+        migrations.AlterField(
+            model_name='activity',
+            name='status',
+            field=models.CharField(choices=[('pendiente', 'Pendiente'), ('en_progreso', 'En progreso'), ('completada', 'Completada')], default='pendiente', max_length=20, verbose_name='Estado'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='activity',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='activities.activity', verbose_name='Actividad'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='date',
+            field=models.DateField(verbose_name='Fecha'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='notes',
+            field=models.TextField(blank=True, verbose_name='Notas'),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='progress_percent',
+            field=models.PositiveIntegerField(verbose_name='Progreso (%)'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Descripción'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='end_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Fecha de Fin'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='name',
+            field=models.CharField(max_length=150, verbose_name='Nombre'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='start_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Fecha de Inicio'),
+        ),
+        migrations.RunPython(fill_project_aggregates, migrations.RunPython.noop),
+    ]
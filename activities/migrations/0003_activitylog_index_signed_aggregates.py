@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0002_project_progress_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['activity', 'date'], name='activities__activit_38c2c5_idx'),
+        ),
+    ]
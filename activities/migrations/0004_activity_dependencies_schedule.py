@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0003_activitylog_index_signed_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activity',
+            name='early_finish',
+            field=models.DateField(editable=False, null=True, verbose_name='Fin Temprano'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='early_start',
+            field=models.DateField(editable=False, null=True, verbose_name='Inicio Temprano'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='late_finish',
+            field=models.DateField(editable=False, null=True, verbose_name='Fin Tardío'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='late_start',
+            field=models.DateField(editable=False, null=True, verbose_name='Inicio Tardío'),
+        ),
+        migrations.AddField(
+            model_name='activity',
+            name='total_float',
+            field=models.IntegerField(editable=False, null=True, verbose_name='Holgura Total (días)'),
+        ),
+        migrations.CreateModel(
+            name='ActivityDependency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lag_days', models.IntegerField(default=0, verbose_name='Desfase (días)')),
+                ('predecessor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='successor_links', to='activities.activity', verbose_name='Predecesora')),
+                ('successor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predecessor_links', to='activities.activity', verbose_name='Sucesora')),
+            ],
+            options={
+                'verbose_name': 'Dependencia',
+                'verbose_name_plural': 'Dependencias',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='activitydependency',
+            constraint=models.UniqueConstraint(fields=('predecessor', 'successor'), name='unique_activity_dependency'),
+        ),
+    ]
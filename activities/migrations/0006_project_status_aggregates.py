@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:11
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def fill_status_aggregates(apps, schema_editor):
+    Project = apps.get_model('activities', 'Project')
+    Activity = apps.get_model('activities', 'Activity')
+    totals = (Activity.objects.order_by().values('project_id')
+              .annotate(in_progress=Count('id', filter=Q(status='en_progreso')), progress=Sum('progress_percent')))
+    for row in totals.iterator(chunk_size=5000):
+        Project.objects.filter(pk=row['project_id']).update(in_progress_count=row['in_progress'],
+                                                            progress_sum=row['progress'] or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0005_project_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='in_progress_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Actividades en Progreso'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='progress_sum',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Avance Acumulado'),
+        ),
+        migrations.RunPython(fill_status_aggregates, migrations.RunPython.noop),
+    ]
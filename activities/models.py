@@ -5,9 +5,35 @@ class Project(models.Model):
     description = models.TextField(blank=True, verbose_name='Descripción')
     start_date = models.DateField(null=True, blank=True, verbose_name='Fecha de Inicio')
     end_date = models.DateField(null=True, blank=True, verbose_name='Fecha de Fin')
+    # agregados de actividades, mantenidos por activities.signals (ver activities/aggregates.py)
+    activity_count = models.IntegerField(default=0, editable=False, verbose_name='Actividades')
+    completed_count = models.IntegerField(default=0, editable=False, verbose_name='Actividades Completadas')
+    progress_weight_total = models.BigIntegerField(default=0, editable=False, verbose_name='Peso Total')
+    progress_weighted_sum = models.BigIntegerField(default=0, editable=False, verbose_name='Avance Ponderado Acumulado')
+    in_progress_count = models.IntegerField(default=0, editable=False, verbose_name='Actividades en Progreso')
+    progress_sum = models.BigIntegerField(default=0, editable=False, verbose_name='Avance Acumulado')
+    # cambia con cada modificación de sus actividades (ETag/Last-Modified del cronograma)
+    version = models.PositiveIntegerField(default=0, editable=False, verbose_name='Versión')
+    modified_at = models.DateTimeField(auto_now=True, verbose_name='Última Modificación')
 
     def __str__(self): return self.name
 
+    @property
+    def progress_percent(self):
+        """Avance del proyecto ponderado por la duración planificada de cada actividad."""
+        if not self.progress_weight_total:
+            return 0
+        return round(self.progress_weighted_sum / self.progress_weight_total)
+
+    @property
+    def pending_count(self):
+        return self.activity_count - self.completed_count - self.in_progress_count
+
+    @property
+    def avg_progress(self):
+        """Avance medio simple de las actividades (sin ponderar)."""
+        return self.progress_sum / self.activity_count if self.activity_count else 0
+
     class Meta:
         verbose_name = 'Proyecto'
         verbose_name_plural = 'Proyectos'
@@ -20,9 +46,28 @@ class Activity(models.Model):
     planned_end = models.DateField(null=True, blank=True, verbose_name='Fin Planificado')
     progress_percent = models.PositiveIntegerField(default=0, verbose_name='Progreso (%)')
     status = models.CharField(max_length=20, choices=STATUS, default='pendiente', verbose_name='Estado')
+    # ruta crítica, calculada por activities.scheduling
+    early_start = models.DateField(null=True, editable=False, verbose_name='Inicio Temprano')
+    early_finish = models.DateField(null=True, editable=False, verbose_name='Fin Temprano')
+    late_start = models.DateField(null=True, editable=False, verbose_name='Inicio Tardío')
+    late_finish = models.DateField(null=True, editable=False, verbose_name='Fin Tardío')
+    total_float = models.IntegerField(null=True, editable=False, verbose_name='Holgura Total (días)')
 
     def __str__(self): return f"{self.project} - {self.name}"
 
+    @property
+    def is_critical(self):
+        return self.total_float is not None and self.total_float <= 0
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # recuerda el aporte cargado para calcular el delta de agregados al guardar
+        from .aggregates import TRACKED_FIELDS, tracked_state
+        instance = super().from_db(db, field_names, values)
+        loaded = set(field_names)
+        instance._tracked_state = tracked_state(instance) if loaded.issuperset(TRACKED_FIELDS) else None
+        return instance
+
     class Meta:
         verbose_name = 'Actividad'
         verbose_name_plural = 'Actividades'
@@ -38,3 +83,19 @@ class ActivityLog(models.Model):
     class Meta:
         verbose_name = 'Registro de Actividad'
         verbose_name_plural = 'Registros de Actividades'
+        indexes = [models.Index(fields=['activity', 'date'])]
+
+class ActivityDependency(models.Model):
+    """Relación fin-a-inicio: el sucesor empieza ``lag_days`` días después de que termina el predecesor."""
+    predecessor = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='successor_links', verbose_name='Predecesora')
+    successor = models.ForeignKey(Activity, on_delete=models.CASCADE, related_name='predecessor_links', verbose_name='Sucesora')
+    lag_days = models.IntegerField(default=0, verbose_name='Desfase (días)')
+
+    def __str__(self): return f"{self.predecessor.name} → {self.successor.name}"
+
+    class Meta:
+        verbose_name = 'Dependencia'
+        verbose_name_plural = 'Dependencias'
+        constraints = [
+            models.UniqueConstraint(fields=['predecessor', 'successor'], name='unique_activity_dependency'),
+        ]
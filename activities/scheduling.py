@@ -0,0 +1,191 @@
+"""Ruta crítica (CPM) de un proyecto con recálculo incremental.
+
+Las fechas se manejan como ordinales de día (``date.toordinal()``). El
+grafo de dependencias del proyecto se carga con dos consultas; la pasada
+hacia adelante (inicio/fin temprano) y hacia atrás (inicio/fin tardío)
+avanza en orden topológico solo desde las actividades que cambiaron, y se
+detiene en cada rama donde las fechas recalculadas coinciden con las
+guardadas. Solo las actividades con fechas distintas se escriben.
+"""
+import heapq
+from datetime import date
+from django.db import connection, transaction
+from .aggregates import activity_weight, touch_projects
+from .models import Project, Activity, ActivityDependency
+
+SCHEDULE_FIELDS = ('early_start', 'early_finish', 'late_start', 'late_finish', 'total_float')
+
+
+class ScheduleCycleError(Exception):
+    pass
+
+
+def _ordinal(value):
+    return value.toordinal() if value else None
+
+
+class ProjectSchedule:
+    def __init__(self, project):
+        self.project = project
+        rows = list(Activity.objects.filter(project=project).order_by('id').values_list(
+            'id', 'planned_start', 'planned_end', *SCHEDULE_FIELDS))
+        n = len(rows)
+        self.ids = [r[0] for r in rows]
+        self.index = {pk: i for i, pk in enumerate(self.ids)}
+        self.duration = [activity_weight(r[1], r[2]) for r in rows]
+        self.not_before = [_ordinal(r[1]) for r in rows]
+        self.stored = [(_ordinal(r[3]), _ordinal(r[4]), _ordinal(r[5]), _ordinal(r[6]), r[7]) for r in rows]
+        self.es = [s[0] for s in self.stored]
+        self.ef = [s[1] for s in self.stored]
+        self.ls = [s[2] for s in self.stored]
+        self.lf = [s[3] for s in self.stored]
+
+        self.preds = [[] for _ in range(n)]
+        self.succs = [[] for _ in range(n)]
+        edges = ActivityDependency.objects.filter(successor__project=project).values_list(
+            'predecessor_id', 'successor_id', 'lag_days')
+        for pred, succ, lag in edges:
+            if pred in self.index and succ in self.index:
+                p, s = self.index[pred], self.index[succ]
+                self.preds[s].append((p, lag))
+                self.succs[p].append((s, lag))
+        self.rank = self._topological_rank()
+
+        # inicio de las actividades sin fecha ni predecesoras
+        starts = [d for d in self.not_before if d is not None]
+        if project.start_date:
+            self.anchor = project.start_date.toordinal()
+        else:
+            self.anchor = min(starts) if starts else date.today().toordinal()
+
+    def _topological_rank(self):
+        n = len(self.ids)
+        indegree = [len(p) for p in self.preds]
+        queue = [i for i in range(n) if not indegree[i]]
+        rank = [None] * n
+        position = 0
+        while position < len(queue):  # cola de Kahn: la lista crece mientras se recorre
+            i = queue[position]
+            rank[i] = position
+            position += 1
+            for s, _ in self.succs[i]:
+                indegree[s] -= 1
+                if not indegree[s]:
+                    queue.append(s)
+        if None in rank:
+            raise ScheduleCycleError(f'Las dependencias del proyecto "{self.project}" forman un ciclo.')
+        return rank
+
+    def _forward(self, dirty):
+        heap = [(self.rank[i], i) for i in dirty]
+        heapq.heapify(heap)
+        seen = set()
+        while heap:
+            _, i = heapq.heappop(heap)
+            if i in seen:
+                continue
+            seen.add(i)
+            es = self.not_before[i]
+            if es is None and not self.preds[i]:
+                es = self.anchor
+            for p, lag in self.preds[i]:
+                candidate = self.ef[p] + lag + 1
+                es = candidate if es is None else max(es, candidate)
+            ef = es + self.duration[i] - 1
+            if (es, ef) != (self.es[i], self.ef[i]):
+                self.es[i], self.ef[i] = es, ef
+                for s, _ in self.succs[i]:
+                    heapq.heappush(heap, (self.rank[s], s))
+
+    def _backward(self, dirty, finish):
+        heap = [(-self.rank[i], i) for i in dirty]
+        heapq.heapify(heap)
+        seen = set()
+        while heap:
+            _, i = heapq.heappop(heap)
+            if i in seen:
+                continue
+            seen.add(i)
+            lf = min((self.ls[s] - lag - 1 for s, lag in self.succs[i]), default=finish)
+            ls = lf - self.duration[i] + 1
+            if (ls, lf) != (self.ls[i], self.lf[i]):
+                self.ls[i], self.lf[i] = ls, lf
+                for p, _ in self.preds[i]:
+                    heapq.heappush(heap, (-self.rank[p], p))
+
+    def compute(self, activity_ids=None):
+        """Recalcula las fechas; con ``activity_ids`` solo desde esas actividades.
+
+        Devuelve los índices de las actividades cuyas fechas u holgura cambiaron.
+        """
+        n = len(self.ids)
+        everything = range(n)
+        incremental = activity_ids is not None and all(s[0] is not None for s in self.stored)
+        if incremental:
+            dirty = {self.index[pk] for pk in activity_ids if pk in self.index}
+            # las actividades sin fecha ni predecesoras dependen del inicio del proyecto
+            dirty.update(i for i in everything if self.not_before[i] is None and not self.preds[i])
+        else:
+            dirty = set(everything)
+        self._forward(dirty)
+
+        finish = max(self.ef, default=None)
+        previous_finish = max((s[3] for s in self.stored if s[3] is not None), default=None)
+        if not incremental or finish != previous_finish:
+            dirty = set(everything)
+        self._backward(dirty, finish)
+
+        changed = []
+        for i in everything:
+            values = (self.es[i], self.ef[i], self.ls[i], self.lf[i], self.ls[i] - self.es[i])
+            if values != self.stored[i]:
+                changed.append(i)
+        return changed
+
+    def save(self, changed):
+        # UPDATE parametrizado con executemany: bulk_update arma un CASE por fila y
+        # compilarlo domina el tiempo cuando cambian miles de actividades
+        rows = []
+        for i in changed:
+            values = (self.es[i], self.ef[i], self.ls[i], self.lf[i], self.ls[i] - self.es[i])
+            self.stored[i] = values
+            rows.append([*(date.fromordinal(d) for d in values[:4]), values[4], self.ids[i]])
+        if rows:
+            meta, quote = Activity._meta, connection.ops.quote_name
+            columns = ', '.join(f'{quote(meta.get_field(f).column)} = %s' for f in SCHEDULE_FIELDS)
+            with connection.cursor() as cursor:
+                cursor.executemany(f'UPDATE {quote(meta.db_table)} SET {columns} WHERE {quote(meta.pk.column)} = %s', rows)
+        return len(rows)
+
+
+def schedule_project(project, activity_ids=None):
+    """Calcula la ruta crítica del proyecto (completa, o incremental desde ``activity_ids``).
+
+    Devuelve el número de actividades actualizadas.
+    """
+    if not isinstance(project, Project):
+        # reprogramación diferida (on_commit) de un proyecto que se borró entretanto
+        project = Project.objects.filter(pk=project).first()
+        if project is None:
+            return 0
+    with transaction.atomic():
+        schedule = ProjectSchedule(project)
+        updated = schedule.save(schedule.compute(activity_ids))
+        if updated:
+            touch_projects([project.pk])
+    return updated
+
+
+def add_dependency(predecessor, successor, lag_days=0):
+    """Crea la dependencia ``predecessor → successor`` y reprograma lo que queda aguas abajo."""
+    if predecessor.project_id != successor.project_id:
+        raise ValueError('Las actividades deben pertenecer al mismo proyecto.')
+    if predecessor.pk == successor.pk:
+        raise ScheduleCycleError('Una actividad no puede depender de sí misma.')
+    with transaction.atomic():
+        dependency, _ = ActivityDependency.objects.update_or_create(
+            predecessor=predecessor, successor=successor, defaults={'lag_days': lag_days})
+        # un ciclo lanza ScheduleCycleError y deshace la dependencia recién creada
+        schedule_project(successor.project_id, [predecessor.pk, successor.pk])
+    return dependency
+
@@ -0,0 +1,129 @@
+"""Curva S (avance planificado vs. real) de un proyecto o de toda la cartera.
+
+Las actividades y sus registros de avance se cargan en bloque en arreglos
+NumPy y ambas curvas se construyen en una pasada vectorizada:
+
+- planificada: cada actividad avanza linealmente entre su inicio y fin
+  planificados (o las fechas tempranas de la ruta crítica si no tiene);
+- real: el avance de cada actividad se mantiene desde un registro hasta el
+  siguiente (forward-fill), sumando por día solo los cambios entre registros.
+
+Ambas se ponderan por duración planificada, como ``Project.progress_percent``.
+El resultado se guarda en caché con la versión de los proyectos en la
+clave, así que cualquier avance nuevo (que incrementa ``Project.version``)
+la invalida sin borrar nada.
+"""
+from datetime import date, timedelta
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from .aggregates import activity_weight
+from .archive import archived_logs
+from .models import Project, Activity, ActivityLog
+
+CACHE_SECONDS = 60 * 60
+
+
+def _ordinals(values):
+    return np.array([d.toordinal() if d else -1 for d in values], dtype=np.int64)
+
+
+def build_scurve(project_ids=None, today=None, include_archive=False):
+    """Curvas diarias ``{'origin', 'days', 'planned', 'actual'}`` en porcentaje (0-100).
+
+    Con ``include_archive`` también se leen los registros archivados, para
+    reconstruir la curva real anterior al último archivado.
+    """
+    today = today or timezone.localdate()
+    activities = Activity.objects.order_by('id')
+    logs = ActivityLog.objects.order_by('activity_id', 'date', 'id')
+    if project_ids is not None:
+        activities = activities.filter(project_id__in=project_ids)
+        logs = logs.filter(activity__project_id__in=project_ids)
+    rows = list(activities.values_list('id', 'planned_start', 'planned_end', 'early_start', 'early_finish'))
+    if not rows:
+        return {'origin': None, 'days': 0, 'planned': [], 'actual': []}
+
+    ids = np.array([r[0] for r in rows], dtype=np.int64)
+    starts = _ordinals([r[1] or r[3] for r in rows])
+    ends = _ordinals([r[2] or r[4] for r in rows])
+    weights = np.array([activity_weight(r[1], r[2]) for r in rows], dtype=np.float64)
+    log_rows = list(logs.values_list('activity_id', 'date', 'progress_percent', 'id').iterator(chunk_size=10000))
+    if include_archive:
+        wanted = set(ids.tolist())
+        log_rows += [(r['activity_id'], r['date'], r['progress_percent'], r['id'])
+                     for r in archived_logs(wanted)]
+        log_rows.sort(key=lambda r: (r[0], r[1], r[3]))
+    log_activity = np.array([r[0] for r in log_rows], dtype=np.int64)
+    log_day = _ordinals([r[1] for r in log_rows])
+    log_progress = np.array([r[2] for r in log_rows], dtype=np.float64)
+
+    dated = (starts >= 0) & (ends >= starts)
+    bounds = np.concatenate([starts[dated], ends[dated], log_day, [today.toordinal()]])
+    first, last = int(bounds.min()), int(bounds.max())
+    n_days = last - first + 1
+    total_weight = weights.sum()
+
+    # planificada: tasa diaria w/duración entre inicio y fin (arreglo de diferencias)
+    duration = (ends - starts + 1)[dated]
+    rate = weights[dated] / duration
+    slope = np.zeros(n_days + 1)
+    np.add.at(slope, starts[dated] - first, rate)
+    np.add.at(slope, ends[dated] - first + 1, -rate)
+    planned = np.cumsum(np.cumsum(slope)[:n_days])
+
+    # real: cambio de avance en cada registro respecto del anterior de la misma actividad
+    change = np.zeros(n_days)
+    if len(log_rows):
+        previous = np.concatenate(([0.0], log_progress[:-1]))
+        previous[np.concatenate(([True], log_activity[1:] != log_activity[:-1]))] = 0.0
+        row = np.searchsorted(ids, log_activity)
+        np.add.at(change, log_day - first, (log_progress - previous) * weights[row])
+    actual = np.cumsum(change)
+
+    scale = 100.0 / total_weight
+    return {
+        'origin': date.fromordinal(first).isoformat(),
+        'days': n_days,
+        'planned': np.round(planned * scale, 2).tolist(),
+        'actual': np.round(actual * scale / 100.0, 2).tolist(),
+    }
+
+
+def _cache_key(project_ids, include_archive=False):
+    projects = Project.objects.all() if project_ids is None else Project.objects.filter(pk__in=project_ids)
+    stamp = projects.aggregate(n=Count('id'), versions=Sum('version'), modified=Max('modified_at'))
+    if stamp['modified'] is None:
+        return None
+    scope = 'all' if project_ids is None else '-'.join(map(str, sorted(project_ids)))
+    scope += ':archivo' if include_archive else ''
+    return f"scurve:{scope}:{stamp['n']}:{stamp['versions']}:{stamp['modified'].timestamp():.6f}:{timezone.localdate()}"
+
+
+def cached_scurve(project_ids=None, include_archive=False):
+    """Curva S de los proyectos indicados (o de todos), desde la caché si no cambiaron."""
+    key = _cache_key(project_ids, include_archive)
+    if key is None:
+        return build_scurve(project_ids, include_archive=include_archive)
+    curve = cache.get(key)
+    if curve is None:
+        curve = build_scurve(project_ids, include_archive=include_archive)
+        cache.set(key, curve, CACHE_SECONDS)
+    return curve
+
+
+def weekly_points(curve):
+    """Muestra la curva cada 7 días (y el último día) para tablas y reportes."""
+    if not curve['days']:
+        return []
+    origin = date.fromisoformat(curve['origin'])
+    indexes = list(range(0, curve['days'], 7))
+    if indexes[-1] != curve['days'] - 1:
+        indexes.append(curve['days'] - 1)
+    return [{
+        'day': origin + timedelta(days=i),
+        'planned': curve['planned'][i],
+        'actual': curve['actual'][i],
+        'variance': round(curve['actual'][i] - curve['planned'][i], 2),
+    } for i in indexes]
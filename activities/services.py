@@ -0,0 +1,135 @@
+from datetime import date
+from django.db import transaction
+from django.db.models import Max
+from core.versioning import ACTIVITIES, bump_versions
+from .aggregates import ProjectDeltas, touch_projects, tracked_state
+from .models import Activity, ActivityLog
+
+STATUSES = dict(Activity.STATUS)
+
+
+def derive_status(progress, status=None):
+    """Estado de una actividad tras registrar avance: el indicado, o el que corresponde al progreso."""
+    if status:
+        return status
+    if progress == 0:
+        return 'pendiente'
+    if progress == 100:
+        return 'completada'
+    return 'en_progreso'
+
+
+class LogResult:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.errors = []  # [(fila, mensaje)]
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'errors': [{'row': row, 'error': msg} for row, msg in self.errors],
+        }
+
+
+def _parse_entry(entry, activity_ids):
+    if not isinstance(entry, dict):
+        raise ValueError('Formato de fila inválido.')
+    try:
+        activity_id = int(entry.get('activity'))
+    except (TypeError, ValueError):
+        activity_id = None
+    if activity_id not in activity_ids:
+        raise ValueError(f'Actividad desconocida: "{entry.get("activity")}".')
+    try:
+        day = date.fromisoformat(str(entry.get('date')))
+    except ValueError:
+        raise ValueError(f'Fecha inválida: "{entry.get("date")}" (use AAAA-MM-DD).')
+    progress = entry.get('progress', entry.get('progress_percent'))
+    if isinstance(progress, bool) or not isinstance(progress, (int, str)) or not str(progress).strip().isdecimal():
+        raise ValueError(f'Progreso inválido: "{progress}".')
+    progress = int(progress)
+    if progress > 100:
+        raise ValueError('El progreso debe estar entre 0 y 100.')
+    status = str(entry.get('status') or '').strip()
+    if status and status not in STATUSES:
+        raise ValueError(f'Estado inválido: "{status}".')
+    return ActivityLog(activity_id=activity_id, date=day, progress_percent=progress,
+                       notes=str(entry.get('notes') or '')), status
+
+
+def record_logs(entries):
+    """Registra un lote de avances ``{activity, date, progress, status?, notes?}``.
+
+    Todos los registros válidos se guardan con ``bulk_create``; cada actividad
+    se actualiza una sola vez (``bulk_update``) con el avance de su registro
+    más reciente, y solo si su fecha no es anterior al último registro ya
+    guardado: un avance atrasado queda en el historial sin pisar uno más
+    nuevo. Las filas inválidas se informan en ``LogResult.errors``.
+    """
+    entries = list(entries)
+    result = LogResult()
+    refs = {str(e.get('activity')).strip() for e in entries if isinstance(e, dict)}
+    activity_ids = set(Activity.objects.filter(pk__in=[r for r in refs if r.isdecimal()])
+                       .values_list('id', flat=True))
+    parsed = []
+    for line, entry in enumerate(entries, start=1):
+        try:
+            parsed.append((line, *_parse_entry(entry, activity_ids)))
+        except ValueError as e:
+            result.errors.append((line, str(e)))
+    if not parsed:
+        return result
+
+    with transaction.atomic():
+        ids = {log.activity_id for _, log, _ in parsed}
+        activities = {a.pk: a for a in Activity.objects.select_for_update().filter(pk__in=ids).order_by('pk')}
+        last_dates = dict(ActivityLog.objects.filter(activity_id__in=ids).order_by()
+                          .values('activity_id').annotate(last=Max('date')).values_list('activity_id', 'last'))
+
+        # el registro más reciente del lote por actividad (a igual fecha, el último enviado)
+        latest = {}
+        for line, log, status in sorted(parsed, key=lambda p: (p[1].date, p[0])):
+            latest[log.activity_id] = (log, status)
+
+        deltas = ProjectDeltas()
+        for activity in activities.values():
+            deltas.touch(activity.project_id)
+        changed = []
+        for activity_id, (log, status) in latest.items():
+            last = last_dates.get(activity_id)
+            if last and log.date < last:
+                continue
+            activity = activities[activity_id]
+            old_state = tracked_state(activity)
+            activity.progress_percent = log.progress_percent
+            activity.status = derive_status(log.progress_percent, status)
+            new_state = tracked_state(activity)
+            if new_state != old_state:
+                deltas.change(old_state, new_state)
+                activity._tracked_state = new_state
+                changed.append(activity)
+
+        ActivityLog.objects.bulk_create([log for _, log, _ in parsed], batch_size=1000)
+        Activity.objects.bulk_update(changed, ['progress_percent', 'status'], batch_size=500)
+        deltas.apply()
+        if changed:
+            bump_versions(ACTIVITIES)
+
+    result.created = len(parsed)
+    result.updated = len(changed)
+    return result
+
+
+def delete_logs(logs):
+    """Borra los registros de avance de ``logs`` (un QuerySet) y marca sus proyectos una sola vez.
+
+    Devuelve la cantidad de registros borrados.
+    """
+    with transaction.atomic():
+        project_ids = set(Activity.objects.filter(pk__in=logs.values('activity_id')).values_list('project_id', flat=True))
+        deleted, _ = logs.delete()
+        if deleted:
+            touch_projects(project_ids)
+    return deleted
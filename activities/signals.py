@@ -0,0 +1,97 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .aggregates import ProjectDeltas, TRACKED_FIELDS, touch_projects, tracked_state
+from .models import Project, Activity, ActivityLog, ActivityDependency
+from .scheduling import schedule_project
+
+
+def saved_fields(update_fields):
+    """Índices de ``TRACKED_FIELDS`` que escribe un ``save(update_fields=...)`` (todos si es ``None``)."""
+    if update_fields is None:
+        return range(len(TRACKED_FIELDS))
+    names = {Activity._meta.get_field(name).attname for name in update_fields}
+    return [i for i, field in enumerate(TRACKED_FIELDS) if field in names]
+
+
+@receiver(pre_save, sender=Activity)
+def load_previous_state(sender, instance, update_fields=None, **kwargs):
+    if not saved_fields(update_fields):
+        return
+    if instance.pk and not instance._state.adding and getattr(instance, '_tracked_state', None) is None:
+        instance._tracked_state = Activity.objects.filter(pk=instance.pk).values_list(*TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=Activity)
+def activity_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    fields = saved_fields(update_fields)
+    if raw or not fields:
+        return
+    old_state = None if created else getattr(instance, '_tracked_state', None)
+    new_state = tracked_state(instance)
+    if old_state is not None and update_fields is not None:
+        # los campos que no se guardaron conservan en la base su valor anterior
+        new_state = tuple(new_state[i] if i in fields else old_state[i] for i in range(len(TRACKED_FIELDS)))
+    deltas = ProjectDeltas()
+    deltas.change(old_state, new_state)
+    deltas.apply()
+    instance._tracked_state = new_state
+
+    # reprogramar la ruta crítica si cambió el proyecto o las fechas planificadas
+    if old_state is None or old_state[0] != new_state[0] or old_state[3:] != new_state[3:]:
+        project_id, pk = new_state[0], instance.pk
+        transaction.on_commit(lambda: schedule_project(project_id, [pk]))
+        if old_state and old_state[0] != project_id:
+            transaction.on_commit(lambda: schedule_project(old_state[0]))
+
+
+def deleting_project(origin):
+    """``True`` si el borrado en curso es el de un proyecto (o de un QuerySet de proyectos)."""
+    return isinstance(origin, Project) or getattr(origin, 'model', None) is Project
+
+
+@receiver(post_delete, sender=Activity)
+def remove_from_project_aggregates(sender, instance, origin=None, **kwargs):
+    # en el borrado en cascada de un proyecto sus agregados se borran con él
+    if deleting_project(origin):
+        return
+    deltas = ProjectDeltas()
+    deltas.add(getattr(instance, '_tracked_state', None) or tracked_state(instance), -1)
+    deltas.apply()
+
+
+@receiver(pre_delete, sender=Activity)
+def load_schedule_neighbors(sender, instance, origin=None, **kwargs):
+    # las dependencias se borran en cascada antes del post_delete: se leen aquí
+    if not deleting_project(origin):
+        instance._schedule_neighbors = list(
+            ActivityDependency.objects.filter(predecessor=instance).values_list('successor_id', flat=True)
+            .union(ActivityDependency.objects.filter(successor=instance).values_list('predecessor_id', flat=True)))
+
+
+@receiver(post_delete, sender=Activity)
+def reschedule_after_activity_delete(sender, instance, origin=None, **kwargs):
+    neighbors = getattr(instance, '_schedule_neighbors', None)
+    if neighbors is not None:
+        project_id = instance.project_id
+        transaction.on_commit(lambda: schedule_project(project_id, neighbors))
+
+
+@receiver(post_delete, sender=ActivityDependency)
+def reschedule_after_dependency_delete(sender, instance, origin=None, **kwargs):
+    # en el borrado de una actividad o de un proyecto la reprogramación la hace su receptor
+    if isinstance(origin, (Activity, Project)) or getattr(origin, 'model', None) in (Activity, Project):
+        return
+    project_id = Activity.objects.filter(pk=instance.successor_id).values_list('project_id', flat=True).first()
+    if project_id is not None:
+        ids = [instance.predecessor_id, instance.successor_id]
+        transaction.on_commit(lambda: schedule_project(project_id, ids))
+
+
+@receiver(post_save, sender=ActivityLog)
+def log_saved(sender, instance, raw=False, **kwargs):
+    # la curva S en caché se invalida con la versión del proyecto; los borrados
+    # no tienen receptor (conservan el borrado rápido en cascada): el de una
+    # actividad ya toca su proyecto y los directos pasan por ``delete_logs``
+    if not raw:
+        touch_projects(Activity.objects.filter(pk=instance.activity_id).values('project_id'))
@@ -3,6 +3,9 @@ from . import views
 urlpatterns = [
     path('', views.project_list, name='project_list'),
     path('projects/new/', views.project_create, name='project_create'),
+    path('projects/<int:pk>/timeline/', views.project_timeline, name='project_timeline'),
     path('activities/new/', views.activity_create, name='activity_create'),
+    path('dependencies/new/', views.dependency_create, name='dependency_create'),
     path('logs/new/', views.activity_log_create, name='activity_log_create'),
+    path('logs/batch/', views.activity_log_batch, name='activity_log_batch'),
 ]
@@ -1,12 +1,24 @@
+import json
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib import messages
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_POST
+from django.db.models import Prefetch
+from core.pagination import keyset_paginate
 from .models import Project, Activity, ActivityLog
-from .forms import ProjectForm, ActivityForm, ActivityLogForm
+from .forms import ProjectForm, ActivityForm, ActivityLogForm, ActivityDependencyForm
+from .services import derive_status, record_logs
+from .scheduling import ScheduleCycleError, add_dependency
 
 @login_required
 def project_list(request):
-    return render(request, 'activities/project_list.html', {'projects': Project.objects.all()})
+    # conteos y avance ponderado vienen de los campos agregados de Project
+    projects = Project.objects.all().prefetch_related(
+        Prefetch('activities', queryset=Activity.objects.order_by('planned_start', 'id')),
+    )
+    page = keyset_paginate(request, projects, keys=('name', 'id'), per_page=10)
+    return render(request, 'activities/project_list.html', {'projects': page, 'page': page})
 
 @login_required
 def project_create(request):
@@ -26,6 +38,20 @@ def activity_create(request):
         return redirect('project_list')
     return render(request, 'activities/activity_form.html', {'form': form})
 
+@login_required
+def dependency_create(request):
+    form = ActivityDependencyForm(request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        try:
+            add_dependency(form.cleaned_data['predecessor'], form.cleaned_data['successor'],
+                           form.cleaned_data['lag_days'])
+        except ScheduleCycleError as e:
+            form.add_error(None, str(e))
+        else:
+            messages.success(request, 'Dependencia registrada. Ruta crítica actualizada.')
+            return redirect('project_list')
+    return render(request, 'activities/dependency_form.html', {'form': form})
+
 @login_required
 def activity_log_create(request):
     form = ActivityLogForm(request.POST or None)
@@ -36,18 +62,75 @@ def activity_log_create(request):
         activity.progress_percent = activity_log.progress_percent
 
         # Actualizar el estado: usar el estado del formulario si se especificó, sino automático
-        if form.cleaned_data.get('status'):
-            activity.status = form.cleaned_data['status']
-        else:
-            # Actualizar el estado basado en el progreso
-            if activity_log.progress_percent == 0:
-                activity.status = 'pendiente'
-            elif activity_log.progress_percent == 100:
-                activity.status = 'completada'
-            else:
-                activity.status = 'en_progreso'
+        activity.status = derive_status(activity_log.progress_percent, form.cleaned_data.get('status'))
 
         activity.save()
         messages.success(request, f'Avance registrado. Actividad actualizada a {activity_log.progress_percent}% - {activity.get_status_display()}.')
         return redirect('project_list')
     return render(request, 'activities/activity_log_form.html', {'form': form})
+
+@login_required
+@require_POST
+def activity_log_batch(request):
+    """Registro masivo de avances desde terreno.
+
+    Recibe JSON ``[{"activity": id, "date": "AAAA-MM-DD", "progress": 0-100, "status": opcional, "notes": opcional}, ...]``
+    o ``{"logs": [...]}``.
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'JSON inválido.'}, status=400)
+    if isinstance(data, dict):
+        data = data.get('logs', [])
+    if not isinstance(data, list):
+        return JsonResponse({'error': 'Se esperaba una lista de avances.'}, status=400)
+    return JsonResponse(record_logs(data).as_dict())
+
+def _project_stamp(request, pk):
+    # una sola consulta para ETag y Last-Modified; no toca la tabla de actividades
+    if not hasattr(request, '_project_stamp'):
+        request._project_stamp = Project.objects.filter(pk=pk).values_list('version', 'modified_at').first()
+    return request._project_stamp
+
+def _timeline_etag(request, pk):
+    stamp = _project_stamp(request, pk)
+    return f'{pk}-{stamp[0]}-{stamp[1].timestamp():.6f}' if stamp else None
+
+def _timeline_last_modified(request, pk):
+    stamp = _project_stamp(request, pk)
+    return stamp[1] if stamp else None
+
+@login_required
+@condition(etag_func=_timeline_etag, last_modified_func=_timeline_last_modified)
+def project_timeline(request, pk):
+    """Cronograma del proyecto en formato columnar para el Gantt.
+
+    Las fechas son días desde ``origin``; sin fecha planificada se usan las
+    fechas tempranas de la ruta crítica. ``status`` son índices en
+    ``status_codes``.
+    """
+    project = get_object_or_404(Project, pk=pk)
+    rows = list(project.activities.order_by('id').values_list(
+        'id', 'name', 'planned_start', 'planned_end', 'early_start', 'early_finish',
+        'progress_percent', 'status', 'total_float'))
+    status_codes = [code for code, _ in Activity.STATUS]
+    status_index = {code: i for i, code in enumerate(status_codes)}
+    starts = [r[2] or r[4] for r in rows]
+    ends = [r[3] or r[5] for r in rows]
+    dated = [d for d in starts if d]
+    origin = project.start_date or (min(dated) if dated else None)
+    offset = lambda d: (d - origin).days if d and origin else None
+    return JsonResponse({
+        'project': {'id': project.pk, 'name': project.name, 'origin': origin.isoformat() if origin else None},
+        'status_codes': status_codes,
+        'activities': {
+            'id': [r[0] for r in rows],
+            'name': [r[1] for r in rows],
+            'start': [offset(d) for d in starts],
+            'end': [offset(d) for d in ends],
+            'progress': [r[6] for r in rows],
+            'status': [status_index.get(r[7]) for r in rows],
+            'critical': [r[8] is not None and r[8] <= 0 for r in rows],
+        },
+    }, json_dumps_params={'separators': (',', ':')})
@@ -0,0 +1,114 @@
+"""Archivo de historial antiguo en archivos gzip JSONL, uno por tipo y mes.
+
+``ARCHIVE_ROOT/<tipo>/<AAAA-MM>.jsonl.gz`` sólo crece: cada archivado agrega
+un miembro gzip nuevo al final (los lectores de gzip leen los miembros
+concatenados). Las filas se escriben y sincronizan a disco antes de
+borrarlas de la tabla; si el borrado falla y se reintenta, la lectura
+descarta los duplicados por ``id``.
+"""
+import gzip
+import json
+import os
+from datetime import date, datetime, time
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from .models import ArchiveRun
+
+DELETE_CHUNK = 1000
+
+
+def archive_dir(kind):
+    return settings.ARCHIVE_ROOT / kind
+
+
+def month_key(day):
+    return f'{day.year:04d}-{day.month:02d}'
+
+
+def append_rows(kind, month, rows):
+    path = archive_dir(kind) / f'{month}.jsonl.gz'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as gz:
+            for row in rows:
+                gz.write(json.dumps(row, separators=(',', ':'), default=str).encode() + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def read_rows(kind, start=None, end=None):
+    """Itera las filas archivadas de ``kind`` en los meses que cubren ``[start, end]`` (fechas)."""
+    folder = archive_dir(kind)
+    if not folder.exists():
+        return
+    first = month_key(start) if start else None
+    last = month_key(end) if end else None
+    seen = set()
+    for path in sorted(folder.glob('*.jsonl.gz')):
+        month = path.name[:7]
+        if (first and month < first) or (last and month > last):
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as fh:
+            for line in fh:
+                row = json.loads(line)
+                if row['id'] not in seen:
+                    seen.add(row['id'])
+                    yield row
+
+
+def local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def archived_before(kind):
+    """Instante hasta el cual ``kind`` está archivado (``None`` si nunca se archivó)."""
+    return ArchiveRun.objects.filter(kind=kind).aggregate(cutoff=Max('cutoff'))['cutoff']
+
+
+def delete_ids(model, ids):
+    # DELETE directo por id: evita que Django cargue cada fila para enviar señales
+    meta, quote = model._meta, connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for i in range(0, len(ids), DELETE_CHUNK):
+            chunk = ids[i:i + DELETE_CHUNK]
+            cursor.execute(f'DELETE FROM {quote(meta.db_table)} WHERE {quote(meta.pk.column)} IN '
+                           f'({", ".join(["%s"] * len(chunk))})', chunk)
+
+
+def _next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def archive_queryset(kind, queryset, fields, date_field, cutoff_day, to_bound=None, dry_run=False):
+    """Mueve las filas de ``queryset`` (ya filtrado antes de ``cutoff_day``) al archivo de ``kind``.
+
+    Se procesa un mes por transacción. ``fields`` son las columnas guardadas (deben incluir ``id``) y
+    ``date_field`` la fecha que decide el mes; ``to_bound`` convierte el
+    primer día de cada mes en el valor de filtro (p. ej. medianoche local
+    para campos DateTime). Sólo un mes de filas está en memoria a la vez.
+    Devuelve el número de filas archivadas (o por archivar, con ``dry_run``).
+    """
+    if dry_run:
+        return queryset.count()
+    to_bound = to_bound or (lambda day: day)
+    oldest = queryset.order_by(date_field).values_list(date_field, flat=True).first()
+    if oldest is None:
+        return 0
+    oldest = timezone.localdate(oldest) if isinstance(oldest, datetime) else oldest
+    month, total = oldest.replace(day=1), 0
+    while True:
+        following = _next_month(month)
+        rows = list(queryset.filter(**{f'{date_field}__gte': to_bound(month), f'{date_field}__lt': to_bound(following)})
+                    .order_by('pk').values(*fields))
+        if rows:
+            with transaction.atomic():
+                append_rows(kind, month_key(month), rows)
+                delete_ids(queryset.model, [row['id'] for row in rows])
+            total += len(rows)
+        if following >= cutoff_day:
+            break
+        month = following
+    ArchiveRun.objects.create(kind=kind, cutoff=local_midnight(cutoff_day), rows=total)
+    return total
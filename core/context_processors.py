@@ -0,0 +1,7 @@
+from django.utils.functional import SimpleLazyObject
+from .groups import user_group_names
+
+
+def user_groups(request):
+    """``user_groups``: nombres de los grupos del usuario, leídos solo si la plantilla los usa."""
+    return {'user_groups': SimpleLazyObject(lambda: user_group_names(request.user))}
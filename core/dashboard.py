@@ -0,0 +1,68 @@
+"""Datos del panel de control (página de inicio después de iniciar sesión).
+
+Los contadores se calculan en una sola consulta (una subconsulta escalar
+por contador) y se guardan en caché junto con los últimos movimientos,
+con la versión de los datos de materiales, movimientos, herramientas y
+actividades en la clave
+(``core.versioning``): cualquier cambio registrado por las señales de los
+modelos o por una operación en bloque deja la entrada obsoleta. Mientras
+nada cambie, cargar el panel cuesta la lectura de las versiones y de la
+caché, sin importar el tamaño de las tablas.
+"""
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from activities.models import Project, Activity
+from inventory.models import Material, Tool, MaterialMovement, MaterialDailyTotal
+from .versioning import ACTIVITIES, MATERIALS, MOVEMENTS, TOOLS, data_stamp
+
+CACHE_SECONDS = 60
+RECENT_MOVEMENTS = 10
+
+
+def count_stats():
+    """Contadores del panel en un solo viaje a la base de datos."""
+    quote = connection.ops.quote_name
+
+    def table(model):
+        return quote(model._meta.db_table)
+
+    def column(model, name):
+        return quote(model._meta.get_field(name).column)
+
+    sql = (f"SELECT (SELECT COUNT(*) FROM {table(Material)}), "
+           f"(SELECT COUNT(*) FROM {table(Tool)}), "
+           f"(SELECT COUNT(*) FROM {table(Project)}), "
+           f"(SELECT COUNT(*) FROM {table(Activity)}), "
+           f"(SELECT COUNT(*) FROM {table(Material)} WHERE {column(Material, 'below_min')} = %s), "
+           f"(SELECT SUM({column(MaterialDailyTotal, 'movement_count')}) FROM {table(MaterialDailyTotal)} "
+           f"WHERE {column(MaterialDailyTotal, 'day')} > %s)")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [True, timezone.localdate() - timedelta(days=30)])
+        materials, tools, projects, activities, low_stock, movements_30d = cursor.fetchone()
+    return {
+        'materials': materials,
+        'tools': tools,
+        'projects': projects,
+        'activities': activities,
+        'low_stock': low_stock,
+        'movements_30d': int(movements_30d or 0),
+    }
+
+
+def recent_movements(limit=RECENT_MOVEMENTS):
+    """Últimos movimientos, leídos desde el final del índice de ``created_at``."""
+    return list(MaterialMovement.objects.select_related('material', 'user')
+                .only('created_at', 'kind', 'quantity', 'material__name', 'user__username')
+                .order_by('-created_at')[:limit])
+
+
+def dashboard_data():
+    """``{'stats': contadores, 'recent_movs': últimos movimientos}``, desde la caché si los datos no cambiaron."""
+    key = f"dashboard:{timezone.localdate()}:{data_stamp([MATERIALS, MOVEMENTS, TOOLS, ACTIVITIES])}"
+    data = cache.get(key)
+    if data is None:
+        data = {'stats': count_stats(), 'recent_movs': recent_movements()}
+        cache.set(key, data, CACHE_SECONDS)
+    return data
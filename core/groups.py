@@ -0,0 +1,42 @@
+"""Grupos del usuario para los permisos de las plantillas.
+
+Los nombres de los grupos se leen una vez y quedan guardados en el objeto
+usuario (el mismo ``request.user`` durante toda la solicitud), así que el
+filtro ``has_group`` y el procesador de contexto ``user_groups`` cuestan a
+lo sumo una consulta por página. Si ``GROUP_CACHE_SECONDS`` es mayor que
+cero, también se guardan en la caché entre solicitudes; los receptores de
+``core/signals.py`` borran esa entrada cuando cambian los grupos del
+usuario o se renombra o borra un grupo.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+ATTRIBUTE = '_group_names'
+
+
+def cache_key(user_id):
+    return f"user_groups:{user_id}"
+
+
+def user_group_names(user):
+    """Conjunto de nombres de los grupos de ``user`` (vacío si no inició sesión)."""
+    if not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, ATTRIBUTE, None)
+    if names is None:
+        seconds = settings.GROUP_CACHE_SECONDS
+        names = cache.get(cache_key(user.pk)) if seconds else None
+        if names is None:
+            names = frozenset(user.groups.values_list('name', flat=True))
+            if seconds:
+                cache.set(cache_key(user.pk), names, seconds)
+        setattr(user, ATTRIBUTE, names)
+    return names
+
+
+def forget_user_groups(user_ids, user=None):
+    """Descarta los grupos guardados de ``user_ids`` (y los del objeto ``user``, si se indica)."""
+    if user is not None:
+        user.__dict__.pop(ATTRIBUTE, None)
+    if user_ids and settings.GROUP_CACHE_SECONDS:
+        cache.delete_many([cache_key(pk) for pk in user_ids])
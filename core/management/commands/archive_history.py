@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from activities.archive import archive_logs
+from inventory.archive import archive_movements
+
+
+class Command(BaseCommand):
+    help = ("Mueve movimientos de material y registros de avance antiguos a archivos gzip JSONL "
+            "por mes (ARCHIVE_ROOT), tras actualizar totales diarios y cortes de stock.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', help='Archiva lo anterior a esta fecha (AAAA-MM-DD).')
+        parser.add_argument('--keep-days', type=int, default=730,
+                            help='Sin --before: días de historial que se conservan en las tablas (730).')
+        parser.add_argument('--only', choices=['movements', 'logs'], help='Archiva sólo un tipo de historial.')
+        parser.add_argument('--dry-run', action='store_true', help='Solo cuenta las filas que se archivarían.')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                cutoff = date.fromisoformat(options['before'])
+            except ValueError:
+                raise CommandError('Fecha inválida, use AAAA-MM-DD.')
+        else:
+            cutoff = timezone.localdate() - timedelta(days=options['keep_days'])
+        if cutoff > timezone.localdate() - timedelta(days=1):
+            raise CommandError('El corte debe ser anterior a ayer.')
+
+        verb = 'por archivar' if options['dry_run'] else 'archivados'
+        if options['only'] != 'logs':
+            count = archive_movements(cutoff, dry_run=options['dry_run'])
+            self.stdout.write(f"Movimientos de material anteriores al {cutoff:%d/%m/%Y}: {count} {verb}.")
+        if options['only'] != 'movements':
+            count = archive_logs(cutoff, dry_run=options['dry_run'])
+            self.stdout.write(f"Registros de avance anteriores al {cutoff:%d/%m/%Y}: {count} {verb}.")
+        self.stdout.write(self.style.SUCCESS("Archivado completado."))
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Tipo')),
+                ('cutoff', models.DateTimeField(verbose_name='Archivado Hasta')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='Filas')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+            ],
+            options={
+                'verbose_name': 'Archivado',
+                'verbose_name_plural': 'Archivados',
+                'ordering': ['-cutoff'],
+                'indexes': [models.Index(fields=['kind', 'cutoff'], name='core_archiv_kind_f430a5_idx')],
+            },
+        ),
+    ]
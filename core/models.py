@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class ArchiveRun(models.Model):
+    """Registro de cada archivado: las filas de ``kind`` anteriores a ``cutoff`` ya no están en la tabla."""
+    kind = models.CharField(max_length=50, verbose_name='Tipo')
+    cutoff = models.DateTimeField(verbose_name='Archivado Hasta')
+    rows = models.PositiveIntegerField(default=0, verbose_name='Filas')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha')
+
+    def __str__(self): return f"{self.kind} < {self.cutoff:%Y-%m-%d} ({self.rows})"
+
+    class Meta:
+        verbose_name = 'Archivado'
+        verbose_name_plural = 'Archivados'
+        ordering = ['-cutoff']
+        indexes = [models.Index(fields=['kind', 'cutoff'])]
+
+
+class DataVersion(models.Model):
+    """Contador de cambios de un grupo de datos; las cachés de reportes lo incluyen en su clave."""
+    name = models.CharField(max_length=50, unique=True, verbose_name='Datos')
+    version = models.PositiveBigIntegerField(default=0, verbose_name='Versión')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Modificación')
+
+    def __str__(self): return f"{self.name} v{self.version}"
+
+    class Meta:
+        verbose_name = 'Versión de Datos'
+        verbose_name_plural = 'Versiones de Datos'
@@ -0,0 +1,95 @@
+import base64
+import json
+from django.db.models import CharField, Q, TextField
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def key_types(model, keys):
+    """Tipo JSON esperado en el cursor para cada clave: ``str`` para campos de texto, ``int`` para el resto."""
+    return [str if isinstance(model._meta.get_field(k), (CharField, TextField)) else int for k in keys]
+
+
+def decode_cursor(cursor, types):
+    """Valores del cursor, o ``None`` si está mal formado o no coincide con ``types`` (uno por clave)."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != len(types):
+        return None
+    # type() y no isinstance(): un bool no es un id válido
+    if any(type(value) is not expected for value, expected in zip(values, types)):
+        return None
+    return values
+
+
+def _beyond(keys, values, op):
+    """Condición ``(k1, k2, ...) op (v1, v2, ...)`` en orden lexicográfico."""
+    condition = Q()
+    for i in reversed(range(len(keys))):
+        step = Q(**{f'{keys[i]}__{op}': values[i]})
+        condition = step | (Q(**{keys[i]: values[i]}) & condition) if condition else step
+    return condition
+
+
+class KeysetPage:
+    def __init__(self, request, object_list, keys, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next = has_next and bool(object_list)
+        self.has_previous = has_previous and bool(object_list)
+        self._request = request
+        self._keys = keys
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def _url(self, param, obj):
+        params = self._request.GET.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[param] = encode_cursor([getattr(obj, k) for k in self._keys])
+        return f'?{params.urlencode()}'
+
+    @property
+    def next_url(self):
+        return self._url('after', self.object_list[-1]) if self.has_next else None
+
+    @property
+    def previous_url(self):
+        return self._url('before', self.object_list[0]) if self.has_previous else None
+
+
+def keyset_paginate(request, queryset, keys=('name', 'id'), per_page=50):
+    """Pagina ``queryset`` por cursor sobre ``keys`` (deben identificar la fila de forma única).
+
+    A diferencia de OFFSET, cada página es un rango del índice que empieza
+    en el cursor, así que el costo no crece al avanzar en las páginas. Los
+    cursores viajan en los parámetros ``after``/``before`` del GET.
+    """
+    keys = list(keys)
+    types = key_types(queryset.model, keys)
+    after = decode_cursor(request.GET.get('after'), types)
+    before = decode_cursor(request.GET.get('before'), types)
+    if before:
+        qs = queryset.filter(_beyond(keys, before, 'lt')).order_by(*[f'-{k}' for k in keys])
+        rows = list(qs[:per_page + 1])
+        has_previous = len(rows) > per_page
+        return KeysetPage(request, rows[:per_page][::-1], keys, True, has_previous)
+
+    qs = queryset.order_by(*keys)
+    if after:
+        qs = qs.filter(_beyond(keys, after, 'gt'))
+    rows = list(qs[:per_page + 1])
+    return KeysetPage(request, rows[:per_page], keys, len(rows) > per_page, bool(after))
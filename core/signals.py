@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from activities.models import Project, Activity
+from inventory.models import Material, Tool, MaterialMovement, ToolAssignment
+from .groups import forget_user_groups
+from .versioning import ACTIVITIES, MATERIALS, MOVEMENTS, TOOLS, bump_versions
+
+User = get_user_model()
+
+# grupos de datos que cambian al guardar o borrar cada modelo
+DATA_GROUPS = {
+    Material: (MATERIALS,),
+    Tool: (TOOLS,),
+    Project: (ACTIVITIES,),
+    Activity: (ACTIVITIES,),
+}
+# al registrarse cambian además el stock o el estado de la herramienta; un receptor
+# de post_delete impediría el borrado en cascada rápido, así que los borrados
+# directos de movimientos pasan por ``inventory.services.delete_movements``
+SAVE_ONLY_GROUPS = {
+    MaterialMovement: (MOVEMENTS, MATERIALS),
+    ToolAssignment: (TOOLS,),
+}
+
+
+def data_changed(sender, raw=False, **kwargs):
+    if not raw:
+        bump_versions(*(DATA_GROUPS.get(sender) or SAVE_ONLY_GROUPS[sender]))
+
+
+for model in DATA_GROUPS:
+    post_save.connect(data_changed, sender=model, dispatch_uid=f'data_version_save_{model._meta.label_lower}')
+    post_delete.connect(data_changed, sender=model, dispatch_uid=f'data_version_delete_{model._meta.label_lower}')
+for model in SAVE_ONLY_GROUPS:
+    post_save.connect(data_changed, sender=model, dispatch_uid=f'data_version_save_{model._meta.label_lower}')
+
+
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:  # user.groups.add(...)
+        forget_user_groups([instance.pk], instance)
+    elif action == 'pre_clear':  # group.user_set.clear(): los usuarios se conocen antes de quitarlos
+        forget_user_groups(list(instance.user_set.values_list('pk', flat=True)))
+    else:
+        forget_user_groups(pk_set)
+
+
+def group_changed(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        forget_user_groups(list(instance.user_set.values_list('pk', flat=True)))
+
+
+m2m_changed.connect(user_groups_changed, sender=User.groups.through, dispatch_uid='user_groups_changed')
+post_save.connect(group_changed, sender=Group, dispatch_uid='user_groups_group_saved')
+pre_delete.connect(group_changed, sender=Group, dispatch_uid='user_groups_group_deleted')
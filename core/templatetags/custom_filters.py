@@ -1,7 +1,8 @@
 from django import template
+from core.groups import user_group_names
 
 register = template.Library()
 
 @register.filter
 def has_group(user, group_name):
-    return user.groups.filter(name=group_name).exists()
+    return group_name in user_group_names(user)
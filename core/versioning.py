@@ -0,0 +1,71 @@
+"""Versiones de datos para invalidar cachés sin borrarlas.
+
+Cada grupo (``MATERIALS``, ``MOVEMENTS``, ``TOOLS``, ``ACTIVITIES``) tiene
+un contador en ``DataVersion`` que sube con cada escritura: por señales en las
+operaciones con modelos (``core/signals.py``) y explícitamente en las
+operaciones en bloque (``bulk_create``, ``update()``), que no las emiten.
+Una caché que incluye las versiones de sus grupos en la clave queda
+obsoleta sola con cualquier cambio de esos datos y no se ve afectada por
+los demás: asignar una herramienta no invalida el libro de movimientos.
+
+El incremento se aplica al confirmar la transacción: así no retiene el
+bloqueo de la fila del contador mientras dura la escritura. Los grupos
+marcados durante una misma transacción se juntan y se incrementan una sola
+vez, con un único ``on_commit``, sin importar cuántas filas se escribieron.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import DataVersion
+
+MATERIALS = 'materials'  # materiales, incluido su stock
+MOVEMENTS = 'movements'  # movimientos y sus resúmenes diario y mensual
+TOOLS = 'tools'  # herramientas y asignaciones
+ACTIVITIES = 'activities'
+
+
+def _bump(names):
+    for name in names:
+        updated = DataVersion.objects.filter(name=name).update(version=F('version') + 1, updated_at=timezone.now())
+        if not updated:
+            try:
+                with transaction.atomic():
+                    DataVersion.objects.create(name=name, version=1)
+            except IntegrityError:  # otro proceso creó el contador
+                DataVersion.objects.filter(name=name).update(version=F('version') + 1, updated_at=timezone.now())
+
+
+PENDING = '_pending_data_versions'
+
+
+def _flush():
+    _bump(sorted(transaction.get_connection().__dict__.pop(PENDING, ())))
+
+
+def bump_versions(*names):
+    """Marca como cambiados los grupos ``names`` (al confirmar la transacción en curso)."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _bump(names)
+        return
+    pending = connection.__dict__.get(PENDING)
+    # tras un rollback (de la transacción o del savepoint que lo registró) el on_commit ya no está
+    if pending is None or not any(func is _flush for _, func, _ in connection.run_on_commit):
+        pending = connection.__dict__[PENDING] = set()
+        transaction.on_commit(_flush)
+    pending.update(names)
+
+
+def data_stamp(names):
+    """Texto que cambia con cualquier escritura en ``names``: versión y hora del último cambio de cada grupo.
+
+    La hora evita repetir un sello si la base vuelve a una versión anterior
+    (respaldo restaurado, ``flush``) mientras quedan archivos en caché.
+    """
+    rows = {name: (version, updated_at) for name, version, updated_at in
+            DataVersion.objects.filter(name__in=names).values_list('name', 'version', 'updated_at')}
+    parts = []
+    for name in names:
+        version, updated_at = rows.get(name, (0, None))
+        parts.append(f"{version}x{int(updated_at.timestamp() * 1000000):x}" if updated_at else '0')
+    return '.'.join(parts)
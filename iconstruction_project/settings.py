@@ -68,6 +68,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.user_groups',
             ],
         },
     },
@@ -143,3 +144,15 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
+
+# Archivos de historial archivado (gzip JSONL por mes); en Render usar un disco persistente
+ARCHIVE_ROOT = Path(os.getenv("ARCHIVE_ROOT", BASE_DIR / "archive"))
+
+# Reportes generados en segundo plano (comando report_worker) y horas que se conservan
+REPORT_ROOT = Path(os.getenv("REPORT_ROOT", BASE_DIR / "report_files"))
+REPORT_TTL_HOURS = int(os.getenv("REPORT_TTL_HOURS", "24"))
+
+# Segundos que los grupos de cada usuario se guardan en la caché entre solicitudes (0 = solo durante
+# la solicitud). Activarlo solo con una caché compartida por los procesos (Redis, Memcached): con la
+# caché en memoria por defecto, un cambio de grupos no se borraría en los demás procesos.
+GROUP_CACHE_SECONDS = int(os.getenv("GROUP_CACHE_SECONDS", "0"))
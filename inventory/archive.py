@@ -0,0 +1,62 @@
+"""Archivado de movimientos de material antiguos y lectura del historial archivado.
+
+Antes de sacar movimientos de la tabla se rehacen sus totales diarios y se
+escribe un corte de stock al instante del archivado, de modo que los
+reportes de consumo (``MaterialDailyTotal``) y ``stock_as_of`` siguen
+funcionando sin leer los archivos; el detalle de los movimientos queda en
+``ARCHIVE_ROOT/material_movements/``.
+"""
+from datetime import datetime
+from decimal import Decimal
+from django.utils import timezone
+from core.archive import archive_queryset, archived_before, local_midnight, read_rows
+from core.versioning import MOVEMENTS, bump_versions
+from .models import MaterialMovement
+
+KIND = 'material_movements'
+FIELDS = ('id', 'material_id', 'kind', 'quantity', 'user_id', 'created_at', 'notes')
+
+
+def archive_movements(cutoff_day, dry_run=False):
+    """Archiva los movimientos anteriores a la medianoche local de ``cutoff_day``."""
+    from .checkpoints import create_checkpoints
+    from .rollups import rebuild_daily_totals
+    cutoff = local_midnight(cutoff_day)
+    movements = MaterialMovement.objects.filter(created_at__lt=cutoff)
+    if dry_run:
+        return movements.count()
+    oldest = movements.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return 0
+    rebuild_daily_totals(since=timezone.localdate(oldest), until=cutoff_day)
+    create_checkpoints(cutoff)
+    archived = archive_queryset(KIND, movements, FIELDS, 'created_at', cutoff_day, to_bound=local_midnight)
+    bump_versions(MOVEMENTS)  # el libro de movimientos pasa esas filas a la sección de archivados
+    return archived
+
+
+def archived_movements(material_id=None, start=None, end=None):
+    """Movimientos archivados (como dicts) entre los instantes ``start`` y ``end`` inclusive."""
+    first = timezone.localdate(start) if start else None
+    last = timezone.localdate(end) if end else None
+    for row in read_rows(KIND, first, last):
+        if material_id is not None and row['material_id'] != material_id:
+            continue
+        row['created_at'] = datetime.fromisoformat(row['created_at'])
+        if (start and row['created_at'] < start) or (end and row['created_at'] > end):
+            continue
+        row['quantity'] = Decimal(row['quantity'])
+        yield row
+
+
+def archived_ledger_sum(material_id, after=None, until=None):
+    """Suma firmada de los movimientos archivados en ``(after, until]``."""
+    cutoff = archived_before(KIND)
+    if cutoff is None or (after and after >= cutoff):
+        return Decimal('0')
+    total = Decimal('0')
+    for row in archived_movements(material_id, after, until):
+        if after and row['created_at'] == after:
+            continue
+        total += row['quantity'] if row['kind'] == 'ingreso' else -row['quantity']
+    return total
@@ -0,0 +1,135 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models import DecimalField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from core.archive import archived_before
+from .archive import KIND as ARCHIVE_KIND, archived_ledger_sum
+from .models import Material, MaterialMovement, StockCheckpoint
+from .services import signed_quantity
+
+ZERO = Decimal('0')
+
+
+def default_cutoff():
+    """Medianoche de hoy (hora local): deja fuera movimientos de transacciones aún en curso."""
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ledger_sum(qs):
+    return qs.aggregate(total=Sum(signed_quantity()))['total'] or ZERO
+
+
+def stocks_at(when):
+    """Materiales anotados con ``stock_at``: su stock actual menos los movimientos posteriores a ``when``.
+
+    ``Material.stock`` incluye el stock inicial y los ajustes manuales, que
+    no pasan por el libro de movimientos. Stock y movimientos se leen en una
+    sola consulta, así que un movimiento que se confirma entre medio no
+    descuadra el resultado.
+    """
+    later = (MaterialMovement.objects.filter(material=OuterRef('pk'), created_at__gt=when).order_by()
+             .values('material').annotate(total=Sum(signed_quantity())).values('total'))
+    zero = Value(ZERO, output_field=DecimalField(max_digits=14, decimal_places=2))
+    return Material.objects.annotate(later=Coalesce(Subquery(later), zero)).values_list('pk', 'stock', 'later')
+
+
+def stock_as_of(material, when):
+    """Stock de ``material`` al instante ``when``.
+
+    Parte del corte más cercano anterior a ``when`` y suma sólo los
+    movimientos posteriores a él. Sin cortes anteriores, parte del corte
+    siguiente (o del stock actual, si no hay) y descuenta los movimientos
+    entre ``when`` y ese punto. El costo depende de los movimientos desde el
+    corte y no del historial completo.
+    """
+    checkpoints = StockCheckpoint.objects.filter(material=material).only('taken_at', 'stock')
+    movements = MaterialMovement.objects.filter(material=material)
+    checkpoint = checkpoints.filter(taken_at__lte=when).order_by('-taken_at').first()
+    if checkpoint is not None:
+        # si el corte es anterior al archivado, parte del tramo está en los archivos
+        return (checkpoint.stock + _ledger_sum(movements.filter(created_at__gt=checkpoint.taken_at, created_at__lte=when))
+                + archived_ledger_sum(material.pk, checkpoint.taken_at, when))
+    following = checkpoints.filter(taken_at__gt=when).order_by('taken_at').first()
+    if following is not None:
+        base, until = following.stock, following.taken_at
+        movements = movements.filter(created_at__lte=until)
+    else:
+        base, until = Material.objects.filter(pk=material.pk).values_list('stock', flat=True).get(), None
+    return base - _ledger_sum(movements.filter(created_at__gt=when)) - archived_ledger_sum(material.pk, when, until)
+
+
+def create_checkpoints(when=None):
+    """Escribe un corte al instante ``when`` para cada material con movimientos desde su último corte.
+
+    Los materiales se agrupan por la fecha de su corte previo (normalmente
+    todos comparten la del corte anterior) para saber, con una consulta por
+    grupo, cuáles se movieron. El stock del corte es el actual menos los
+    movimientos posteriores a ``when`` (``stocks_at``). Devuelve el número de
+    cortes creados.
+    """
+    when = when or default_cutoff()
+    previous = dict(StockCheckpoint.objects.filter(taken_at__lt=when)
+                    .values_list('material').annotate(last=Max('taken_at')).order_by())
+    groups = defaultdict(set)
+    for material_id, taken_at in previous.items():
+        groups[taken_at].add(material_id)
+
+    moved = set()
+    movements = MaterialMovement.objects.filter(created_at__lte=when).order_by()
+    for taken_at, material_ids in groups.items():
+        moved.update(material_ids & set(movements.filter(created_at__gt=taken_at)
+                                        .values_list('material', flat=True).distinct()))
+    # materiales sin cortes previos
+    with_previous = StockCheckpoint.objects.filter(taken_at__lt=when).values('material')
+    moved.update(movements.exclude(material__in=with_previous).values_list('material', flat=True).distinct())
+
+    new = [StockCheckpoint(material_id=material_id, taken_at=when, stock=stock - later)
+           for material_id, stock, later in stocks_at(when).iterator(chunk_size=5000) if material_id in moved]
+    StockCheckpoint.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+    return len(new)
+
+
+def backfill_checkpoints(until=None, every=timedelta(days=30)):
+    """Crea cortes periódicos cada ``every`` desde el primer movimiento hasta ``until``."""
+    until = until or default_cutoff()
+    first = MaterialMovement.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    if first is None:
+        return 0
+    created = 0
+    when = timezone.localtime(first).replace(hour=0, minute=0, second=0, microsecond=0) + every
+    while when < until:
+        created += create_checkpoints(when)
+        when += every
+    return created + create_checkpoints(until)
+
+
+def verify_checkpoints(checkpoints=None):
+    """Compara cada corte con el stock actual del material menos los movimientos posteriores.
+
+    Es una reconstrucción completa desde el libro, sin usar otros cortes:
+    ``stocks_at`` descuenta del stock actual todos los movimientos
+    posteriores al corte, para todos los materiales del grupo a la vez.
+    Devuelve una lista de ``(corte, stock_esperado)`` para los cortes que no
+    coinciden: un ajuste manual de ``Material.stock`` o un movimiento que no
+    pasó por el libro aparecen como diferencia. Se ejecuta una consulta por
+    cada fecha de corte. Si hubo archivado, los cortes anteriores a él se
+    omiten.
+    """
+    checkpoints = checkpoints if checkpoints is not None else StockCheckpoint.objects.select_related('material')
+    archived = archived_before(ARCHIVE_KIND)
+    if archived:
+        checkpoints = checkpoints.filter(taken_at__gte=archived)
+    by_time = defaultdict(list)
+    for checkpoint in checkpoints.order_by('taken_at'):
+        by_time[checkpoint.taken_at].append(checkpoint)
+
+    mismatches = []
+    for taken_at, group in by_time.items():
+        expected = {material_id: stock - later for material_id, stock, later in
+                    stocks_at(taken_at).filter(pk__in=[c.material_id for c in group])}
+        for checkpoint in group:
+            if checkpoint.stock != expected[checkpoint.material_id]:
+                mismatches.append((checkpoint, expected[checkpoint.material_id]))
+    return mismatches
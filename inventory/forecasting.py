@@ -0,0 +1,155 @@
+"""Pronóstico de consumo y punto de reorden para todos los materiales a la vez.
+
+El historial de salidas se lee en bloque desde el resumen diario
+(``MaterialDailyTotal``, derivado de ``MaterialMovement``) y se carga en
+arreglos NumPy; los cálculos se hacen en una pasada vectorizada sobre todos
+los materiales, sin un ciclo Python por material.
+
+Solo la ventana de la media móvil se carga día por día; para la media de
+todo el historial basta el total por material, que se suma desde el
+resumen mensual (``MaterialMonthlyTotal``): unas 24 filas por material para
+dos años en lugar de hasta 730.
+"""
+from datetime import timedelta
+import numpy as np
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import CharField, FloatField, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+from core.versioning import MATERIALS, MOVEMENTS, data_stamp
+from .models import Material, MaterialDailyTotal, MaterialMonthlyTotal
+
+WINDOW_DAYS = 30
+HISTORY_DAYS = 730
+LEAD_TIME_DAYS = 7
+SERVICE_Z = 1.65  # ~95 % de nivel de servicio
+CACHE_SECONDS = 60 * 60
+
+
+class History:
+    """Salidas diarias por material como arreglos paralelos (formato coordenado)."""
+
+    def __init__(self, material_ids, stock, min_stock, rows, days, quantities, totals, span, horizon, detail_days):
+        self.material_ids = material_ids  # (n,) ids ordenados
+        self.stock = stock                # (n,)
+        self.min_stock = min_stock        # (n,)
+        self.rows = rows                  # (k,) índice del material de cada registro
+        self.days = days                  # (k,) día relativo: 0 = más antiguo, horizon - 1 = hoy
+        self.quantities = quantities      # (k,) salida del día
+        self.totals = totals              # (n,) salida total de cada material en los últimos ``span`` días
+        self.span = span                  # días cubiertos por ``totals``: desde el inicio del mes del primer día
+        self.horizon = horizon
+        self.detail_days = detail_days    # últimos días cargados día por día (rows/days/quantities)
+
+
+def _fetch_array(queryset, dtype):
+    # filas crudas del cursor directo a un arreglo estructurado, sin conversiones de Django ni un ciclo por fila
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return np.array(cursor.fetchall(), dtype=dtype)
+
+
+def load_history(horizon=HISTORY_DAYS, today=None, window=WINDOW_DAYS):
+    """Historial de salidas de los últimos ``horizon`` días.
+
+    Los últimos ``window`` días se cargan día por día; el total de cada
+    material se toma por meses completos, desde el primer día del mes en que
+    empieza el horizonte.
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=horizon - 1)
+    detail_days = min(window, horizon)
+    materials = np.array(list(Material.objects.order_by('id').values_list('id', 'stock', 'min_stock')),
+                         dtype=np.float64).reshape(-1, 3)
+    material_ids = materials[:, 0].astype(np.int64)
+
+    # día como texto ISO y cantidad como float: ambos pasan al arreglo sin convertir
+    records = _fetch_array(
+        MaterialDailyTotal.objects.filter(day__gte=today - timedelta(days=detail_days - 1), day__lte=today,
+                                          salida_total__gt=0).order_by()
+        .annotate(day_text=Cast('day', CharField(max_length=10)), quantity=Cast('salida_total', FloatField()))
+        .values_list('material_id', 'day_text', 'quantity'),
+        [('material', np.int64), ('day', 'datetime64[D]'), ('quantity', np.float64)])
+    first_month = start.replace(day=1)
+    sums = _fetch_array(
+        MaterialMonthlyTotal.objects.filter(month__gte=first_month, month__lte=today, salida_total__gt=0).order_by()
+        .values_list('material_id').annotate(total=Sum(Cast('salida_total', FloatField()))),
+        [('material', np.int64), ('total', np.float64)])
+    totals = np.zeros(len(material_ids))
+    totals[np.searchsorted(material_ids, sums['material'])] = sums['total']
+
+    return History(
+        material_ids=material_ids,
+        stock=materials[:, 1],
+        min_stock=materials[:, 2],
+        rows=np.searchsorted(material_ids, records['material']),
+        days=(records['day'] - np.datetime64(start, 'D')).astype(np.int64),
+        quantities=records['quantity'],
+        totals=totals,
+        span=(today - first_month).days + 1,
+        horizon=horizon,
+        detail_days=detail_days,
+    )
+
+
+def forecast(history, window=WINDOW_DAYS, lead_time=LEAD_TIME_DAYS, z=SERVICE_Z):
+    """Calcula consumo medio, días hasta quiebre y punto de reorden sugerido.
+
+    - ``avg_daily``: media móvil de las salidas de los últimos ``window`` días.
+    - ``avg_history``: media diaria sobre todo el historial cargado (por meses completos).
+    - ``days_left``: stock / consumo medio (``inf`` si no hay consumo).
+    - ``reorder_point``: demanda durante el plazo de reposición más stock de
+      seguridad ``z * σ * sqrt(plazo)``.
+    """
+    n = len(history.material_ids)
+    window = min(window, history.detail_days)
+    first_day = history.horizon - window
+    recent = history.days >= first_day
+    # matriz materiales x días de la ventana (bincount sobre índice plano)
+    flat = history.rows[recent] * window + (history.days[recent] - first_day)
+    daily = np.bincount(flat, weights=history.quantities[recent], minlength=n * window).reshape(n, window)
+
+    avg_daily = daily.mean(axis=1)
+    std_daily = daily.std(axis=1)
+    avg_history = history.totals / history.span
+    with np.errstate(divide='ignore', invalid='ignore'):
+        days_left = np.where(avg_daily > 0, history.stock / avg_daily, np.inf)
+    reorder_point = avg_daily * lead_time + z * std_daily * np.sqrt(lead_time)
+    return {
+        'material_ids': history.material_ids,
+        'stock': history.stock,
+        'min_stock': history.min_stock,
+        'avg_daily': avg_daily,
+        'avg_history': avg_history,
+        'days_left': days_left,
+        'reorder_point': np.ceil(reorder_point * 100) / 100,
+    }
+
+
+def critical_materials(result, limit=50):
+    """Materiales con consumo, ordenados por días hasta el quiebre de stock."""
+    consuming = np.flatnonzero(result['avg_daily'] > 0)
+    order = consuming[np.argsort(result['days_left'][consuming], kind='stable')][:limit]
+    names = Material.objects.in_bulk(result['material_ids'][order].tolist())
+    return [{
+        'material': names[int(result['material_ids'][i])],
+        'stock': result['stock'][i],
+        'min_stock': result['min_stock'][i],
+        'avg_daily': result['avg_daily'][i],
+        'avg_history': result['avg_history'][i],
+        'days_left': result['days_left'][i],
+        'reorder_point': result['reorder_point'][i],
+    } for i in order]
+
+
+def cached_forecast(window=WINDOW_DAYS, lead_time=LEAD_TIME_DAYS, limit=100):
+    """Materiales críticos y cantidad con consumo, desde la caché mientras no cambien movimientos ni materiales."""
+    key = f"forecast:{window}:{lead_time}:{limit}:{timezone.localdate()}:{data_stamp([MOVEMENTS, MATERIALS])}"
+    data = cache.get(key)
+    if data is None:
+        result = forecast(load_history(window=window), window, lead_time)
+        data = {'rows': critical_materials(result, limit=limit), 'consuming': int((result['avg_daily'] > 0).sum())}
+        cache.set(key, data, CACHE_SECONDS)
+    return data
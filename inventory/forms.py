@@ -11,6 +11,12 @@ class MaterialMovementForm(forms.ModelForm):
         model = MaterialMovement
         fields = ['material','kind','quantity','notes']
 
+    def clean_quantity(self):
+        quantity = self.cleaned_data['quantity']
+        if quantity <= 0:
+            raise forms.ValidationError("La cantidad debe ser mayor que cero.")
+        return quantity
+
 class ToolForm(forms.ModelForm):
     class Meta:
         model = Tool
@@ -27,3 +33,6 @@ class ToolAssignmentForm(forms.ModelForm):
         if tool and tool.status == 'asignada':
             raise forms.ValidationError("Esta herramienta ya está asignada a otro usuario.")
         return cleaned_data
+
+class MovementImportForm(forms.Form):
+    file = forms.FileField(label='Archivo CSV o JSON')
@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from core.versioning import MATERIALS, MOVEMENTS, bump_versions
+from .models import Material, MaterialMovement
+from .services import stock_delta
+from .rollups import add_to_daily_totals
+
+KINDS = dict(MaterialMovement.KIND)
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # [(fila, mensaje)]
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'errors': [{'row': row, 'error': msg} for row, msg in self.errors],
+        }
+
+
+def read_rows(uploaded):
+    """Itera las filas de un archivo CSV o JSON subido, sin cargarlo entero en memoria (CSV)."""
+    if uploaded.name.lower().endswith('.json'):
+        return read_json(uploaded.read())
+    return csv.DictReader(io.TextIOWrapper(uploaded, encoding='utf-8-sig'))
+
+
+def read_json(raw):
+    data = json.loads(raw)
+    if isinstance(data, dict):
+        data = data.get('rows', [])
+    if not isinstance(data, list):
+        raise ValueError('Se esperaba una lista de movimientos.')
+    return data
+
+
+def _material_lookup():
+    by_id, by_name = {}, {}
+    for pk, name in Material.objects.values_list('id', 'name'):
+        by_id[str(pk)] = pk
+        # nombres repetidos no se pueden resolver por nombre
+        by_name[name.strip().lower()] = None if name.strip().lower() in by_name else pk
+    return by_id, by_name
+
+
+def import_movements(rows, user=None):
+    """Valida e importa un lote de movimientos de material.
+
+    Las filas se validan en una sola pasada; las inválidas se informan en
+    ``ImportResult.errors`` sin abortar el lote. Las válidas se insertan con
+    ``bulk_create`` y el stock de cada material se ajusta una sola vez con el
+    delta agregado, todo dentro de una transacción. Las salidas que dejarían
+    el stock en negativo (según el orden del lote) se rechazan como error.
+    """
+    result = ImportResult()
+    by_id, by_name = _material_lookup()
+    quantity_field = MaterialMovement._meta.get_field('quantity')
+    pending = []
+
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            result.errors.append((line, 'Formato de fila inválido.'))
+            continue
+        ref = str(row.get('material') or '').strip()
+        material_id = by_id.get(ref) or by_name.get(ref.lower())
+        if not material_id:
+            result.errors.append((line, f'Material desconocido o ambiguo: "{ref}".'))
+            continue
+        kind = str(row.get('kind') or '').strip().lower()
+        if kind not in KINDS:
+            result.errors.append((line, f'Tipo inválido: "{kind}".'))
+            continue
+        try:
+            quantity = quantity_field.to_python(row.get('quantity'))
+            quantity_field.run_validators(quantity)
+        except ValidationError as e:
+            result.errors.append((line, f'Cantidad inválida: {" ".join(e.messages)}'))
+            continue
+        if quantity is None or quantity <= 0:
+            result.errors.append((line, 'La cantidad debe ser mayor que cero.'))
+            continue
+        pending.append((line, MaterialMovement(
+            material_id=material_id, kind=kind, quantity=quantity,
+            user=user, notes=str(row.get('notes') or ''),
+        )))
+
+    if not pending:
+        return result
+
+    with transaction.atomic():
+        ids = {mov.material_id for _, mov in pending}
+        materials = {
+            m.pk: m for m in
+            Material.objects.select_for_update().filter(pk__in=ids).order_by('pk').only('id', 'stock')
+        }
+        deltas = defaultdict(int)
+        accepted = []
+        for line, mov in pending:
+            material = materials[mov.material_id]
+            delta = stock_delta(mov.kind, mov.quantity)
+            if material.stock + deltas[material.pk] + delta < 0:
+                result.errors.append((line, 'Stock insuficiente para la salida.'))
+                continue
+            deltas[material.pk] += delta
+            accepted.append(mov)
+
+        MaterialMovement.objects.bulk_create(accepted, batch_size=1000)
+        add_to_daily_totals(accepted)
+        changed = []
+        for pk, delta in deltas.items():
+            if delta:
+                materials[pk].stock += delta
+                changed.append(materials[pk])
+        Material.objects.bulk_update(changed, ['stock'], batch_size=500)
+        bump_versions(MOVEMENTS, MATERIALS)
+
+    result.created = len(accepted)
+    result.errors.sort()
+    return result
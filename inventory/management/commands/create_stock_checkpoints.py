@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from inventory.checkpoints import create_checkpoints, backfill_checkpoints, default_cutoff
+
+
+class Command(BaseCommand):
+    help = "Escribe cortes de stock por material (pensado para ejecutarse a diario vía cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--at', help='Fecha de corte YYYY-MM-DD (por defecto, medianoche de hoy).')
+        parser.add_argument('--backfill-days', type=int,
+                            help='Genera cortes cada N días desde el primer movimiento hasta la fecha de corte.')
+
+    def handle(self, *args, **options):
+        when = default_cutoff()
+        if options['at']:
+            try:
+                when = timezone.make_aware(datetime.strptime(options['at'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('Fecha inválida, use el formato YYYY-MM-DD.')
+
+        if options['backfill_days']:
+            created = backfill_checkpoints(when, timedelta(days=options['backfill_days']))
+        else:
+            created = create_checkpoints(when)
+        self.stdout.write(self.style.SUCCESS(f"{created} cortes de stock creados (corte: {when:%Y-%m-%d %H:%M})."))
@@ -0,0 +1,37 @@
+from decimal import Decimal
+import numpy as np
+from django.core.management.base import BaseCommand
+from core.versioning import MATERIALS, bump_versions
+from inventory.forecasting import (load_history, forecast, critical_materials,
+                                   WINDOW_DAYS, LEAD_TIME_DAYS, HISTORY_DAYS)
+from inventory.models import Material
+
+
+class Command(BaseCommand):
+    help = "Pronostica consumo y días hasta quiebre de stock; opcionalmente actualiza el stock mínimo."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=WINDOW_DAYS, help='Días de la media móvil.')
+        parser.add_argument('--lead-time', type=int, default=LEAD_TIME_DAYS, help='Plazo de reposición en días.')
+        parser.add_argument('--history', type=int, default=HISTORY_DAYS, help='Días de historial a cargar.')
+        parser.add_argument('--limit', type=int, default=20, help='Materiales críticos a listar.')
+        parser.add_argument('--apply', action='store_true',
+                            help='Guarda el punto de reorden sugerido como stock mínimo de cada material con consumo.')
+
+    def handle(self, *args, **options):
+        result = forecast(load_history(options['history'], window=options['window']),
+                          options['window'], options['lead_time'])
+        for row in critical_materials(result, options['limit']):
+            self.stdout.write(
+                f"{row['material'].name:40} stock {row['stock']:>10.2f}  consumo/día {row['avg_daily']:>8.2f}  "
+                f"días {row['days_left']:>7.1f}  reorden {row['reorder_point']:>10.2f}"
+            )
+
+        if options['apply']:
+            consuming = np.flatnonzero(result['avg_daily'] > 0)
+            materials = Material.objects.in_bulk(result['material_ids'][consuming].tolist())
+            for i in consuming:
+                materials[int(result['material_ids'][i])].min_stock = Decimal(f"{result['reorder_point'][i]:.2f}")
+            Material.objects.bulk_update(materials.values(), ['min_stock'], batch_size=500)
+            bump_versions(MATERIALS)
+            self.stdout.write(self.style.SUCCESS(f"Stock mínimo actualizado en {len(materials)} materiales."))
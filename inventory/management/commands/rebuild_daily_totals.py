@@ -0,0 +1,20 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from inventory.rollups import rebuild_daily_totals
+
+
+class Command(BaseCommand):
+    help = "Recalcula los resúmenes diario y mensual de movimientos por material desde la tabla de movimientos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Recalcula sólo desde esta fecha (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = datetime.strptime(options['since'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Fecha inválida, use el formato YYYY-MM-DD.')
+        rows = rebuild_daily_totals(since)
+        self.stdout.write(self.style.SUCCESS(f"{rows} totales diarios recalculados."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from inventory.checkpoints import verify_checkpoints
+
+
+class Command(BaseCommand):
+    help = "Verifica los cortes de stock contra el stock actual de cada material y los movimientos posteriores."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Corrige los cortes que no coinciden.')
+
+    def handle(self, *args, **options):
+        mismatches = verify_checkpoints()
+        for checkpoint, expected in mismatches:
+            self.stdout.write(self.style.WARNING(f"{checkpoint}: se esperaba {expected}"))
+            if options['fix']:
+                checkpoint.stock = expected
+                checkpoint.save(update_fields=['stock'])
+        if mismatches:
+            action = 'corregidos' if options['fix'] else 'con diferencias'
+            self.stdout.write(self.style.WARNING(f"{len(mismatches)} cortes {action}."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Todos los cortes coinciden con el stock actual y el historial de movimientos."))
@@ -0,0 +1,163 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(verbose_name='Fecha de Corte')),
+                ('stock', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Stock')),
+            ],
+            options={
+                'verbose_name': 'Corte de Stock',
+                'verbose_name_plural': 'Cortes de Stock',
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='material',
+            options={'verbose_name': 'Material', 'verbose_name_plural': 'Materiales'},
+        ),
+        migrations.AlterModelOptions(
+            name='materialmovement',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Movimiento de Material', 'verbose_name_plural': 'Movimientos de Materiales'},
+        ),
+        migrations.AlterModelOptions(
+            name='tool',
+            options={'verbose_name': 'Herramienta', 'verbose_name_plural': 'Herramientas'},
+        ),
+        migrations.AlterModelOptions(
+            name='toolassignment',
+            options={'verbose_name': 'Asignación de Herramienta', 'verbose_name_plural': 'Asignaciones de Herramientas'},
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Descripción'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='min_stock',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Stock Mínimo'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='name',
+            field=models.CharField(max_length=120, verbose_name='Nombre'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='stock',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Stock'),
+        ),
+        migrations.AlterField(
+            model_name='material',
+            name='unit',
+            field=models.CharField(choices=[('un', 'Unidad'), ('kg', 'Kilogramo'), ('m', 'Metro'), ('lt', 'Litro')], default='un', max_length=4, verbose_name='Unidad'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='kind',
+            field=models.CharField(choices=[('ingreso', 'Ingreso'), ('salida', 'Salida')], max_length=10, verbose_name='Tipo'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='material',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventory.material', verbose_name='Material'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='notes',
+            field=models.TextField(blank=True, verbose_name='Notas'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='quantity',
+            field=models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Cantidad'),
+        ),
+        migrations.AlterField(
+            model_name='materialmovement',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuario'),
+        ),
+        migrations.AlterField(
+            model_name='tool',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tools', to=settings.AUTH_USER_MODEL, verbose_name='Asignada a'),
+        ),
+        migrations.AlterField(
+            model_name='tool',
+            name='code',
+            field=models.CharField(max_length=50, unique=True, verbose_name='Código'),
+        ),
+        migrations.AlterField(
+            model_name='tool',
+            name='name',
+            field=models.CharField(max_length=120, verbose_name='Nombre'),
+        ),
+        migrations.AlterField(
+            model_name='tool',
+            name='notes',
+            field=models.TextField(blank=True, verbose_name='Notas'),
+        ),
+        migrations.AlterField(
+            model_name='tool',
+            name='status',
+            field=models.CharField(choices=[('disponible', 'Disponible'), ('asignada', 'Asignada'), ('mantenimiento', 'Mantenimiento')], default='disponible', max_length=20, verbose_name='Estado'),
+        ),
+        migrations.AlterField(
+            model_name='toolassignment',
+            name='assigned_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Asignación'),
+        ),
+        migrations.AlterField(
+            model_name='toolassignment',
+            name='notes',
+            field=models.TextField(blank=True, verbose_name='Notas'),
+        ),
+        migrations.AlterField(
+            model_name='toolassignment',
+            name='returned_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Devolución'),
+        ),
+        migrations.AlterField(
+            model_name='toolassignment',
+            name='tool',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventory.tool', verbose_name='Herramienta'),
+        ),
+        migrations.AlterField(
+            model_name='toolassignment',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuario'),
+        ),
+        migrations.AddIndex(
+            model_name='materialmovement',
+            index=models.Index(fields=['material', 'created_at'], name='inventory_m_materia_b849d1_idx'),
+        ),
+        migrations.AddField(
+            model_name='stockcheckpoint',
+            name='material',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='inventory.material', verbose_name='Material'),
+        ),
+        migrations.AddConstraint(
+            model_name='stockcheckpoint',
+            constraint=models.UniqueConstraint(fields=('material', 'taken_at'), name='unique_checkpoint_per_material'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_stockcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['name', 'id'], name='inventory_m_name_13da94_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['unit', 'name', 'id'], name='inventory_m_unit_29511c_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_material_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='material',
+            name='below_min',
+            field=models.GeneratedField(db_persist=True, expression=models.Q(('stock__lte', models.F('min_stock'))), output_field=models.BooleanField(), verbose_name='Bajo Mínimo'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['below_min', 'name', 'id'], name='inventory_m_below_m_094142_idx'),
+        ),
+    ]
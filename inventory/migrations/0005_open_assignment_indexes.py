@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_material_below_min'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='toolassignment',
+            index=models.Index(fields=['tool', 'returned_at'], name='inventory_t_tool_id_b675fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='toolassignment',
+            index=models.Index(fields=['returned_at', '-assigned_at'], name='inventory_t_returne_6b9b92_idx'),
+        ),
+    ]
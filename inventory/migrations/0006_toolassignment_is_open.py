@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def close_stale_assignments(apps, schema_editor):
+    """Marca como cerradas las asignaciones devueltas y, si una herramienta
+    quedó con varias abiertas (checkouts duplicados), cierra las antiguas con
+    la fecha de la siguiente asignación."""
+    ToolAssignment = apps.get_model('inventory', 'ToolAssignment')
+    ToolAssignment.objects.filter(returned_at__isnull=False).update(is_open=None)
+    newer = {}
+    for assign in ToolAssignment.objects.filter(is_open=True).order_by('tool_id', '-assigned_at', '-id'):
+        if assign.tool_id in newer:
+            assign.returned_at = newer[assign.tool_id]
+            assign.is_open = None
+            assign.save(update_fields=['returned_at', 'is_open'])
+        newer[assign.tool_id] = assign.assigned_at
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_open_assignment_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='toolassignment',
+            name='is_open',
+            field=models.BooleanField(default=True, editable=False, null=True, verbose_name='Abierta'),
+        ),
+        migrations.RunPython(close_stale_assignments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='toolassignment',
+            constraint=models.UniqueConstraint(fields=('tool', 'is_open'), name='unique_open_assignment_per_tool'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-18 07:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_toolassignment_is_open'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialDailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('ingreso_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Ingresos')),
+                ('salida_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Salidas')),
+                ('movement_count', models.PositiveIntegerField(default=0, verbose_name='Movimientos')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_totals', to='inventory.material', verbose_name='Material')),
+            ],
+            options={
+                'verbose_name': 'Total Diario de Material',
+                'verbose_name_plural': 'Totales Diarios de Materiales',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day', 'material'], name='inventory_m_day_31e672_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='materialdailytotal',
+            constraint=models.UniqueConstraint(fields=('material', 'day'), name='unique_daily_total_per_material'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0007_materialdailytotal'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='materialmovement',
+            index=models.Index(fields=['created_at'], name='inventory_m_created_3a3610_idx'),
+        ),
+    ]
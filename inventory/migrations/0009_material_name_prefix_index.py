@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-18 10:12
+
+from django.db import migrations
+
+INDEX_NAME = 'inventory_material_upper_name_like'
+
+
+def prefix_index():
+    from django.contrib.postgres.indexes import OpClass
+    from django.db.models import Index
+    from django.db.models.functions import Upper
+    return Index(OpClass(Upper('name'), name='text_pattern_ops'), name=INDEX_NAME)
+
+
+def add_prefix_index(apps, schema_editor):
+    """En PostgreSQL ``name__istartswith`` se compila a ``UPPER(name) LIKE UPPER(...)``,
+    que solo puede usar un índice sobre ``UPPER(name)`` con ``text_pattern_ops``.
+    MySQL (collation sin distinción de mayúsculas) ya usa el índice ``(name, id)``."""
+    if schema_editor.connection.vendor == 'postgresql':
+        Material = apps.get_model('inventory', 'Material')
+        schema_editor.add_index(Material, prefix_index())
+
+
+def remove_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        Material = apps.get_model('inventory', 'Material')
+        schema_editor.remove_index(Material, prefix_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_movement_created_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_prefix_index, remove_prefix_index),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-18 09:41
+
+import django.db.models.deletion
+from collections import defaultdict
+from django.db import migrations, models
+
+
+def backfill_monthly_totals(apps, schema_editor):
+    """Suma por mes los totales diarios existentes."""
+    MaterialDailyTotal = apps.get_model('inventory', 'MaterialDailyTotal')
+    MaterialMonthlyTotal = apps.get_model('inventory', 'MaterialMonthlyTotal')
+    totals = defaultdict(lambda: [0, 0, 0])
+    rows = MaterialDailyTotal.objects.order_by().values_list('material_id', 'day', 'ingreso_total', 'salida_total',
+                                                             'movement_count')
+    for material_id, day, ingreso, salida, count in rows.iterator(chunk_size=5000):
+        entry = totals[(material_id, day.replace(day=1))]
+        entry[0] += ingreso
+        entry[1] += salida
+        entry[2] += count
+    MaterialMonthlyTotal.objects.bulk_create([
+        MaterialMonthlyTotal(material_id=material_id, month=month, ingreso_total=ingreso,
+                             salida_total=salida, movement_count=count)
+        for (material_id, month), (ingreso, salida, count) in totals.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_material_name_prefix_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialMonthlyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='Mes')),
+                ('ingreso_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Ingresos')),
+                ('salida_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Salidas')),
+                ('movement_count', models.PositiveIntegerField(default=0, verbose_name='Movimientos')),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_totals', to='inventory.material', verbose_name='Material')),
+            ],
+            options={
+                'verbose_name': 'Total Mensual de Material',
+                'verbose_name_plural': 'Totales Mensuales de Materiales',
+                'ordering': ['-month'],
+                'indexes': [models.Index(fields=['month', 'material'], name='inventory_m_month_4f9e2e_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='materialmonthlytotal',
+            constraint=models.UniqueConstraint(fields=('material', 'month'), name='unique_monthly_total_per_material'),
+        ),
+        migrations.RunPython(backfill_monthly_totals, migrations.RunPython.noop),
+    ]
@@ -14,12 +14,25 @@ class Material(models.Model):
     unit = models.CharField(max_length=4, choices=UNIT_CHOICES, default='un', verbose_name='Unidad')
     stock = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name='Stock')
     min_stock = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name='Stock Mínimo')
+    # columna calculada y almacenada por la base de datos: se mantiene sola en
+    # cualquier UPDATE de stock/min_stock (incluidos update() y bulk_update())
+    below_min = models.GeneratedField(
+        expression=models.Q(stock__lte=models.F('min_stock')),
+        output_field=models.BooleanField(),
+        db_persist=True,
+        verbose_name='Bajo Mínimo',
+    )
 
     def __str__(self): return self.name
 
     class Meta:
         verbose_name = 'Material'
         verbose_name_plural = 'Materiales'
+        indexes = [
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['unit', 'name', 'id']),
+            models.Index(fields=['below_min', 'name', 'id']),
+        ]
 
 class Tool(models.Model):
     STATUS = [('disponible','Disponible'),('asignada','Asignada'),('mantenimiento','Mantenimiento')]
@@ -48,18 +61,78 @@ class MaterialMovement(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Movimiento de Material'
         verbose_name_plural = 'Movimientos de Materiales'
+        indexes = [models.Index(fields=['material', 'created_at']), models.Index(fields=['created_at'])]
 
     def __str__(self): return f"{self.kind} {self.quantity} de {self.material}"
 
+class StockCheckpoint(models.Model):
+    """Stock de un material al instante ``taken_at`` (incluye los movimientos hasta ese instante)."""
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='checkpoints', verbose_name='Material')
+    taken_at = models.DateTimeField(verbose_name='Fecha de Corte')
+    stock = models.DecimalField(max_digits=14, decimal_places=2, verbose_name='Stock')
+
+    def __str__(self): return f"{self.material} al {self.taken_at:%Y-%m-%d %H:%M}: {self.stock}"
+
+    class Meta:
+        ordering = ['-taken_at']
+        verbose_name = 'Corte de Stock'
+        verbose_name_plural = 'Cortes de Stock'
+        constraints = [models.UniqueConstraint(fields=['material', 'taken_at'], name='unique_checkpoint_per_material')]
+
+class MaterialDailyTotal(models.Model):
+    """Resumen diario de movimientos por material, mantenido al registrar cada movimiento."""
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='daily_totals', verbose_name='Material')
+    day = models.DateField(verbose_name='Día')
+    ingreso_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Total Ingresos')
+    salida_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Total Salidas')
+    movement_count = models.PositiveIntegerField(default=0, verbose_name='Movimientos')
+
+    def __str__(self): return f"{self.material} {self.day}"
+
+    class Meta:
+        ordering = ['-day']
+        verbose_name = 'Total Diario de Material'
+        verbose_name_plural = 'Totales Diarios de Materiales'
+        constraints = [models.UniqueConstraint(fields=['material', 'day'], name='unique_daily_total_per_material')]
+        indexes = [models.Index(fields=['day', 'material'])]
+
+class MaterialMonthlyTotal(models.Model):
+    """Resumen mensual de movimientos por material (suma de sus totales diarios), para lecturas de meses o años."""
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='monthly_totals', verbose_name='Material')
+    month = models.DateField(verbose_name='Mes')  # primer día del mes
+    ingreso_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Total Ingresos')
+    salida_total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Total Salidas')
+    movement_count = models.PositiveIntegerField(default=0, verbose_name='Movimientos')
+
+    def __str__(self): return f"{self.material} {self.month:%Y-%m}"
+
+    class Meta:
+        ordering = ['-month']
+        verbose_name = 'Total Mensual de Material'
+        verbose_name_plural = 'Totales Mensuales de Materiales'
+        constraints = [models.UniqueConstraint(fields=['material', 'month'], name='unique_monthly_total_per_material')]
+        indexes = [models.Index(fields=['month', 'material'])]
+
 class ToolAssignment(models.Model):
     tool = models.ForeignKey(Tool, on_delete=models.CASCADE, verbose_name='Herramienta')
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='Usuario')
     assigned_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Asignación')
     returned_at = models.DateTimeField(null=True, blank=True, verbose_name='Fecha de Devolución')
     notes = models.TextField(blank=True, verbose_name='Notas')
+    # True mientras la asignación está abierta y NULL al devolverla: la
+    # restricción única (tool, is_open) admite muchos NULL pero un solo True,
+    # lo que funciona igual en MySQL, que no soporta restricciones parciales.
+    is_open = models.BooleanField(null=True, default=True, editable=False, verbose_name='Abierta')
 
     def __str__(self): return f"{self.tool} -> {self.user}"
 
     class Meta:
         verbose_name = 'Asignación de Herramienta'
         verbose_name_plural = 'Asignaciones de Herramientas'
+        indexes = [
+            # asignación abierta de una herramienta (returned_at IS NULL)
+            models.Index(fields=['tool', 'returned_at']),
+            # "quién tiene qué ahora": abiertas, de la más reciente a la más antigua
+            models.Index(fields=['returned_at', '-assigned_at']),
+        ]
+        constraints = [models.UniqueConstraint(fields=['tool', 'is_open'], name='unique_open_assignment_per_tool')]
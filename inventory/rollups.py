@@ -0,0 +1,186 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from core.archive import archived_before
+from core.versioning import MOVEMENTS, bump_versions, data_stamp
+from .models import MaterialMovement, MaterialDailyTotal, MaterialMonthlyTotal
+from .archive import KIND as ARCHIVE_KIND
+
+ZERO = Decimal('0')
+CACHE_SECONDS = 60 * 60
+
+
+def _accumulate(totals, material_id, kind, quantity, created_at):
+    entry = totals[(material_id, timezone.localdate(created_at))]
+    entry[0 if kind == 'ingreso' else 1] += quantity
+    entry[2] += 1
+
+
+def _increments(ingreso, salida, count, sign=1):
+    return {
+        'ingreso_total': F('ingreso_total') + sign * ingreso,
+        'salida_total': F('salida_total') + sign * salida,
+        'movement_count': F('movement_count') + sign * count,
+    }
+
+
+def _increment(model, ingreso, salida, count, **lookup):
+    qs = model.objects.filter(**lookup)
+    increment = _increments(ingreso, salida, count)
+    if qs.update(**increment):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, ingreso_total=ingreso, salida_total=salida, movement_count=count)
+    except IntegrityError:
+        qs.update(**increment)
+
+
+def _group_totals(movements):
+    """Totales ``{(material, día): [...]}`` y ``{(material, mes): [...]}``, en orden de material y fecha."""
+    totals = defaultdict(lambda: [ZERO, ZERO, 0])
+    for mov in movements:
+        _accumulate(totals, mov.material_id, mov.kind, mov.quantity, mov.created_at)
+    months = defaultdict(lambda: [ZERO, ZERO, 0])
+    for (material_id, day), values in totals.items():
+        entry = months[(material_id, day.replace(day=1))]
+        for i, value in enumerate(values):
+            entry[i] += value
+    # siempre en el mismo orden, para que dos lotes simultáneos no se bloqueen mutuamente
+    return sorted(totals.items()), sorted(months.items())
+
+
+def add_to_daily_totals(movements):
+    """Suma movimientos ya guardados a sus totales diarios y mensuales (una fila por material y día o mes).
+
+    Cada total se incrementa con un UPDATE ``campo = campo + x``; si la fila
+    del día (o del mes) aún no existe se crea, y si otra transacción la creó
+    entretanto se vuelve a aplicar el UPDATE.
+    """
+    days, months = _group_totals(movements)
+    for (material_id, day), (ingreso, salida, count) in days:
+        _increment(MaterialDailyTotal, ingreso, salida, count, material_id=material_id, day=day)
+    for (material_id, month), (ingreso, salida, count) in months:
+        _increment(MaterialMonthlyTotal, ingreso, salida, count, material_id=material_id, month=month)
+
+
+def remove_from_daily_totals(movements):
+    """Descuenta de sus totales diarios y mensuales movimientos que se van a borrar."""
+    days, months = _group_totals(movements)
+    for (material_id, day), values in days:
+        MaterialDailyTotal.objects.filter(material_id=material_id, day=day).update(**_increments(*values, sign=-1))
+    for (material_id, month), values in months:
+        MaterialMonthlyTotal.objects.filter(material_id=material_id, month=month).update(**_increments(*values, sign=-1))
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def rebuild_monthly_totals(since=None, until=None):
+    """Recalcula desde el resumen diario los totales de los meses que tocan ``[since, until)`` (o de todos)."""
+    days = MaterialDailyTotal.objects.order_by()
+    rollups = MaterialMonthlyTotal.objects.all()
+    if since:
+        since = since.replace(day=1)
+        days = days.filter(day__gte=since)
+        rollups = rollups.filter(month__gte=since)
+    if until:
+        end = _next_month(until - timedelta(days=1))
+        days = days.filter(day__lt=end)
+        rollups = rollups.filter(month__lt=end)
+
+    totals = defaultdict(lambda: [ZERO, ZERO, 0])
+    rows = days.values_list('material_id', 'day', 'ingreso_total', 'salida_total', 'movement_count')
+    for material_id, day, ingreso, salida, count in rows.iterator(chunk_size=5000):
+        entry = totals[(material_id, day.replace(day=1))]
+        entry[0] += ingreso
+        entry[1] += salida
+        entry[2] += count
+
+    with transaction.atomic():
+        rollups.delete()
+        MaterialMonthlyTotal.objects.bulk_create([
+            MaterialMonthlyTotal(material_id=material_id, month=month, ingreso_total=ingreso,
+                                 salida_total=salida, movement_count=count)
+            for (material_id, month), (ingreso, salida, count) in totals.items()
+        ], batch_size=1000)
+    return len(totals)
+
+
+def rebuild_daily_totals(since=None, until=None):
+    """Recalcula los totales diarios desde los movimientos (todos, o de ``since`` hasta antes de ``until``).
+
+    La agrupación por día se hace en Python con la zona horaria local, para
+    no depender de las tablas de zonas horarias de MySQL. Los totales
+    mensuales de los meses tocados se rehacen a partir de los diarios.
+    Devuelve el número de filas diarias escritas.
+    """
+    # los días ya archivados no se pueden recalcular: sus movimientos no están en la tabla
+    archived = archived_before(ARCHIVE_KIND)
+    if archived:
+        since = max(since, timezone.localdate(archived)) if since else timezone.localdate(archived)
+    movements = MaterialMovement.objects.order_by()
+    rollups = MaterialDailyTotal.objects.all()
+    if since:
+        movements = movements.filter(created_at__gte=timezone.make_aware(datetime.combine(since, time.min)))
+        rollups = rollups.filter(day__gte=since)
+    if until:
+        movements = movements.filter(created_at__lt=timezone.make_aware(datetime.combine(until, time.min)))
+        rollups = rollups.filter(day__lt=until)
+
+    totals = defaultdict(lambda: [ZERO, ZERO, 0])
+    for row in movements.values_list('material_id', 'kind', 'quantity', 'created_at').iterator(chunk_size=5000):
+        _accumulate(totals, *row)
+
+    with transaction.atomic():
+        rollups.delete()
+        MaterialDailyTotal.objects.bulk_create([
+            MaterialDailyTotal(material_id=material_id, day=day, ingreso_total=ingreso,
+                               salida_total=salida, movement_count=count)
+            for (material_id, day), (ingreso, salida, count) in totals.items()
+        ], batch_size=1000)
+        rebuild_monthly_totals(since, until)
+        bump_versions(MOVEMENTS)
+    return len(totals)
+
+
+def monthly_totals(since, material=None):
+    """Totales por mes desde ``since`` leídos del resumen diario (no de los movimientos).
+
+    La base agrupa por día (a lo sumo una fila por día, sobre el índice
+    ``(day, material)``) y los días se suman por mes en Python: ``TruncMonth``
+    sobre cientos de miles de filas no usa el índice y en SQLite se evalúa
+    fila por fila.
+    """
+    qs = MaterialDailyTotal.objects.filter(day__gte=since)
+    if material is not None:
+        qs = qs.filter(material=material)
+    days = (qs.values('day').annotate(ingreso=Sum('ingreso_total'), salida=Sum('salida_total'),
+                                      movements=Sum('movement_count')).order_by('day'))
+    months = {}
+    for row in days:
+        month = row['day'].replace(day=1)
+        entry = months.get(month)
+        if entry is None:
+            months[month] = {'month': month, 'ingreso': row['ingreso'], 'salida': row['salida'],
+                             'movements': row['movements']}
+        else:
+            entry['ingreso'] += row['ingreso']
+            entry['salida'] += row['salida']
+            entry['movements'] += row['movements']
+    return list(months.values())
+
+
+def cached_monthly_totals(since, material=None):
+    """``monthly_totals`` desde la caché mientras no cambien los movimientos."""
+    key = f"consumption:{since}:{material.pk if material is not None else 'all'}:{data_stamp([MOVEMENTS])}"
+    months = cache.get(key)
+    if months is None:
+        months = monthly_totals(since, material)
+        cache.set(key, months, CACHE_SECONDS)
+    return months
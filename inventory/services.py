@@ -0,0 +1,159 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+from core.versioning import MOVEMENTS, TOOLS, bump_versions
+from .models import Material, MaterialMovement, Tool, ToolAssignment
+from .rollups import add_to_daily_totals, remove_from_daily_totals
+
+
+class InsufficientStockError(Exception):
+    """La salida dejaría el stock del material en negativo."""
+
+
+class ToolUnavailableError(Exception):
+    """La herramienta no está disponible para asignarse."""
+
+
+def stock_delta(kind, quantity):
+    return quantity if kind == 'ingreso' else -quantity
+
+
+def signed_quantity():
+    """Expresión SQL equivalente a ``stock_delta`` para agregar movimientos en la base de datos."""
+    return Case(When(kind='salida', then=-F('quantity')), default=F('quantity'))
+
+
+def post_movement(movement):
+    """Registra un movimiento y aplica su efecto sobre el stock.
+
+    La actualización se hace en la base de datos (``stock = stock + delta``)
+    y sólo toca la columna ``stock``, de modo que dos movimientos simultáneos
+    sobre el mismo material no se pisan. Para las salidas el UPDATE lleva la
+    condición ``stock >= cantidad``: si no afecta filas, el stock no alcanza
+    y se lanza ``InsufficientStockError`` sin guardar el movimiento.
+    """
+    with transaction.atomic():
+        qs = Material.objects.filter(pk=movement.material_id)
+        if movement.kind == 'salida':
+            qs = qs.filter(stock__gte=movement.quantity)
+        updated = qs.update(stock=F('stock') + stock_delta(movement.kind, movement.quantity))
+        if not updated:
+            raise InsufficientStockError(
+                f'Stock insuficiente de {movement.material} para una salida de {movement.quantity}.'
+            )
+        movement.save()
+        add_to_daily_totals([movement])
+    return movement
+
+
+def delete_movements(movements):
+    """Borra los movimientos de ``movements`` (un QuerySet) y los descuenta de los totales diarios y mensuales.
+
+    El stock de los materiales no se toca: borrar un movimiento corrige el
+    libro, no el inventario (``verify_stock_checkpoints`` lo muestra como
+    diferencia). Devuelve la cantidad de movimientos borrados.
+    """
+    with transaction.atomic():
+        rows = list(movements.select_for_update().only('material_id', 'kind', 'quantity', 'created_at'))
+        if not rows:
+            return 0
+        remove_from_daily_totals(rows)
+        MaterialMovement.objects.filter(pk__in=[mov.pk for mov in rows]).delete()
+        bump_versions(MOVEMENTS)
+    return len(rows)
+
+
+def checkout_tool(assignment):
+    """Asigna una herramienta disponible y guarda la asignación.
+
+    El cambio de estado es un UPDATE condicional (``status='disponible'``):
+    de varios intentos simultáneos sobre la misma herramienta sólo uno
+    afecta la fila. La restricción única de asignaciones abiertas respalda
+    esa garantía en la base de datos.
+    """
+    try:
+        with transaction.atomic():
+            updated = (Tool.objects.filter(pk=assignment.tool_id, status='disponible')
+                       .update(status='asignada', assigned_to=assignment.user))
+            if not updated:
+                raise ToolUnavailableError(f'La herramienta {assignment.tool} no está disponible.')
+            assignment.save()
+    except IntegrityError:
+        raise ToolUnavailableError(f'La herramienta {assignment.tool} ya tiene una asignación abierta.')
+    return assignment
+
+
+def return_tool(assignment):
+    """Cierra una asignación abierta y libera la herramienta.
+
+    Devuelve ``False`` si la asignación ya estaba cerrada.
+    """
+    with transaction.atomic():
+        now = timezone.now()
+        closed = (ToolAssignment.objects.filter(pk=assignment.pk, returned_at__isnull=True)
+                  .update(returned_at=now, is_open=None))
+        if not closed:
+            return False
+        Tool.objects.filter(pk=assignment.tool_id, status='asignada').update(status='disponible', assigned_to=None)
+        bump_versions(TOOLS)
+    assignment.returned_at, assignment.is_open = now, None
+    return True
+
+
+def batch_tool_action(codes, action, user=None):
+    """Asigna (``checkout``) o devuelve (``return``) un lote de herramientas por código.
+
+    Resuelve todos los códigos en una consulta (bloqueando las filas), crea o
+    cierra las asignaciones en bloque y actualiza las herramientas con un solo
+    UPDATE. Devuelve un resultado por código, en el orden recibido. Una
+    herramienta con una asignación abierta no se vuelve a asignar; si otra
+    vía la crea mientras se procesa el lote, la restricción única deshace el
+    lote entero con ``ToolUnavailableError``.
+    """
+    if action not in ('checkout', 'return'):
+        raise ValueError(f'Acción inválida: "{action}".')
+    if action == 'checkout' and user is None:
+        raise ValueError('Se requiere un usuario para asignar herramientas.')
+    if isinstance(codes, str):
+        raise ValueError('Los códigos deben enviarse como lista.')
+
+    results, accepted, seen = [], [], set()
+    try:
+        with transaction.atomic():
+            tools = {t.code: t for t in Tool.objects.select_for_update().filter(code__in=set(codes))
+                     .order_by('pk').only('id', 'code', 'status')}
+            open_assignments = dict(ToolAssignment.objects.filter(
+                tool__in=[t.pk for t in tools.values()], returned_at__isnull=True).values_list('tool_id', 'id'))
+
+            for code in codes:
+                tool = tools.get(code)
+                if code in seen:
+                    error = 'Código repetido en el lote.'
+                elif tool is None:
+                    error = 'Herramienta no encontrada.'
+                elif action == 'checkout' and tool.status != 'disponible':
+                    error = f'No disponible ({tool.get_status_display()}).'
+                elif action == 'checkout' and tool.pk in open_assignments:
+                    error = 'Ya tiene una asignación abierta.'
+                elif action == 'return' and tool.pk not in open_assignments:
+                    error = 'No tiene una asignación abierta.'
+                else:
+                    error = None
+                    accepted.append(tool)
+                seen.add(code)
+                results.append({'code': code, 'ok': error is None, 'error': error})
+
+            tool_ids = [t.pk for t in accepted]
+            if action == 'checkout':
+                ToolAssignment.objects.bulk_create([ToolAssignment(tool=t, user=user) for t in accepted])
+                Tool.objects.filter(pk__in=tool_ids).update(status='asignada', assigned_to=user)
+            else:
+                ToolAssignment.objects.filter(pk__in=[open_assignments[pk] for pk in tool_ids]).update(
+                    returned_at=timezone.now(), is_open=None)
+                Tool.objects.filter(pk__in=tool_ids, status='asignada').update(status='disponible', assigned_to=None)
+            if accepted:
+                bump_versions(TOOLS)
+    except IntegrityError:
+        # una asignación abierta creada por otra vía entre la lectura y el INSERT
+        raise ToolUnavailableError('Una de las herramientas del lote ya tiene una asignación abierta; no se aplicó el lote.')
+    return results
@@ -3,9 +3,12 @@ from . import views
 urlpatterns = [
     path('', views.material_list, name='material_list'),
     path('materials/new/', views.material_create, name='material_create'),
+    path('materials/low-stock/', views.material_low_stock, name='material_low_stock'),
     path('movements/new/', views.movement_create, name='movement_create'),
+    path('movements/import/', views.movement_import, name='movement_import'),
     path('tools/', views.tool_list, name='tool_list'),
     path('tools/new/', views.tool_create, name='tool_create'),
     path('tools/assign/', views.tool_assign, name='tool_assign'),
     path('tools/return/<int:assign_id>/', views.tool_return, name='tool_return'),
+    path('tools/batch/', views.tool_batch, name='tool_batch'),
 ]
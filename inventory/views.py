@@ -1,13 +1,44 @@
+import json
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.db.models import F
+from core.pagination import keyset_paginate
 from .models import Material, MaterialMovement, Tool, ToolAssignment
-from .forms import MaterialForm, MaterialMovementForm, ToolForm, ToolAssignmentForm
+from .forms import MaterialForm, MaterialMovementForm, ToolForm, ToolAssignmentForm, MovementImportForm
+from .services import (post_movement, InsufficientStockError, checkout_tool, return_tool,
+                       ToolUnavailableError, batch_tool_action)
+from .imports import import_movements, read_rows, read_json
 
 @login_required
 def material_list(request):
-    qs = Material.objects.all().order_by('name')
-    return render(request, 'inventory/material_list.html', {'materials': qs})
+    qs = Material.objects.all()
+    q = request.GET.get('q', '').strip()
+    if q:
+        # la búsqueda por prefijo usa un índice: (name, id) en MySQL y UPPER(name)
+        # text_pattern_ops en PostgreSQL (migración 0009); "contiene" recorre la tabla
+        lookup = 'name__icontains' if request.GET.get('match') == 'contiene' else 'name__istartswith'
+        qs = qs.filter(**{lookup: q})
+    unit = request.GET.get('unit')
+    if unit in dict(Material.UNIT_CHOICES):
+        qs = qs.filter(unit=unit)
+    if request.GET.get('below_min'):
+        qs = qs.filter(below_min=True)
+    page = keyset_paginate(request, qs, keys=('name', 'id'))
+    return render(request, 'inventory/material_list.html', {
+        'materials': page,
+        'page': page,
+        'unit_choices': Material.UNIT_CHOICES,
+    })
+
+@login_required
+def material_low_stock(request):
+    qs = Material.objects.filter(below_min=True).annotate(shortage=F('min_stock') - F('stock'))
+    page = keyset_paginate(request, qs, keys=('name', 'id'))
+    return render(request, 'inventory/material_low_stock.html', {'materials': page, 'page': page})
 
 @login_required
 def material_create(request):
@@ -24,22 +55,53 @@ def movement_create(request):
     if request.method == 'POST' and form.is_valid():
         mov = form.save(commit=False)
         mov.user = request.user
-        mov.save()
-        # update stock
-        if mov.kind == 'ingreso':
-            mov.material.stock += mov.quantity
+        try:
+            post_movement(mov)
+        except InsufficientStockError as e:
+            form.add_error('quantity', str(e))
         else:
-            mov.material.stock -= mov.quantity
-        mov.material.save()
-        messages.success(request, 'Movimiento registrado.')
-        return redirect('material_list')
+            messages.success(request, 'Movimiento registrado.')
+            return redirect('material_list')
     return render(request, 'inventory/movement_form.html', {'form': form})
 
+@login_required
+def movement_import(request):
+    if request.method == 'POST' and request.content_type == 'application/json':
+        try:
+            rows = read_json(request.body)
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        return JsonResponse(import_movements(rows, user=request.user).as_dict())
+
+    form = MovementImportForm(request.POST or None, request.FILES or None)
+    result = None
+    if request.method == 'POST' and form.is_valid():
+        try:
+            result = import_movements(read_rows(form.cleaned_data['file']), user=request.user)
+        except (ValueError, UnicodeDecodeError) as e:
+            form.add_error('file', f'No se pudo leer el archivo: {e}')
+        else:
+            messages.success(request, f'{result.created} movimientos importados.')
+            if result.errors:
+                messages.warning(request, f'{len(result.errors)} filas con errores.')
+    return render(request, 'inventory/movement_import.html', {'form': form, 'result': result})
+
 @login_required
 def tool_list(request):
+    tools = Tool.objects.select_related('assigned_to')
+    status = request.GET.get('status')
+    if status in dict(Tool.STATUS):
+        tools = tools.filter(status=status)
+    page = keyset_paginate(request, tools, keys=('code', 'id'))
+
+    assignments = ToolAssignment.objects.select_related('tool', 'user')
+    if request.GET.get('open'):
+        assignments = assignments.filter(returned_at__isnull=True)
     return render(request, 'inventory/tool_list.html', {
-        'tools': Tool.objects.all().order_by('code'),
-        'assignments': ToolAssignment.objects.select_related('tool','user').order_by('-assigned_at')[:20],
+        'tools': page,
+        'page': page,
+        'status_choices': Tool.STATUS,
+        'assignments': assignments.order_by('-assigned_at')[:20],
     })
 
 @login_required
@@ -55,23 +117,53 @@ def tool_create(request):
 def tool_assign(request):
     form = ToolAssignmentForm(request.POST or None)
     if request.method == 'POST' and form.is_valid():
-        assign = form.save()
-        tool = assign.tool
-        tool.status = 'asignada'
-        tool.assigned_to = assign.user
-        tool.save()
-        messages.success(request, 'Herramienta asignada.')
-        return redirect('tool_list')
+        try:
+            checkout_tool(form.save(commit=False))
+        except ToolUnavailableError as e:
+            form.add_error('tool', str(e))
+        else:
+            messages.success(request, 'Herramienta asignada.')
+            return redirect('tool_list')
     return render(request, 'inventory/tool_assign_form.html', {'form': form})
 
 @login_required
 def tool_return(request, assign_id):
     assign = get_object_or_404(ToolAssignment, id=assign_id)
-    assign.returned_at = assign.returned_at or __import__('datetime').datetime.now()
-    assign.save()
-    tool = assign.tool
-    tool.status = 'disponible'
-    tool.assigned_to = None
-    tool.save()
-    messages.success(request, 'Herramienta devuelta.')
+    if return_tool(assign):
+        messages.success(request, 'Herramienta devuelta.')
+    else:
+        messages.info(request, 'La herramienta ya había sido devuelta.')
     return redirect('tool_list')
+
+@login_required
+@require_POST
+def tool_batch(request):
+    """Asignación o devolución masiva por lectura de códigos.
+
+    Recibe JSON ``{"action": "checkout"|"return", "user": id o username, "codes": [...]}``.
+    """
+    try:
+        data = json.loads(request.body)
+        codes = data.get('codes', [])
+        if not isinstance(codes, list):
+            return JsonResponse({'error': '"codes" debe ser una lista.'}, status=400)
+        codes = [str(c).strip() for c in codes]
+        action = data.get('action')
+    except (ValueError, AttributeError, TypeError):
+        return JsonResponse({'error': 'JSON inválido.'}, status=400)
+
+    user = None
+    if data.get('user'):
+        ref = str(data['user'])
+        User = get_user_model()
+        user = User.objects.filter(pk=ref).first() if ref.isdecimal() else User.objects.filter(username=ref).first()
+        if user is None:
+            return JsonResponse({'error': f'Usuario desconocido: "{ref}".'}, status=400)
+    try:
+        results = batch_tool_action(codes, action, user)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except ToolUnavailableError as e:
+        return JsonResponse({'error': str(e)}, status=409)
+    ok = sum(r['ok'] for r in results)
+    return JsonResponse({'ok': ok, 'errors': len(results) - ok, 'results': results})
@@ -6,6 +6,32 @@ Evalúa tiempos de respuesta y estabilidad con grandes volúmenes de datos.
 Casos de prueba:
 - PT-R-001: Listado de 200+ ítems < 2s
 - PT-R-002: Exportación CSV con 5.000 filas ≤ 5s
+- PT-R-003: Registro concurrente de movimientos sin pérdida de stock
+- PT-R-004: Importación masiva de 50.000 movimientos en segundos
+- PT-R-005: Conteo y listado de stock bajo mínimo con 100.000 materiales
+- PT-R-006: Listado de herramientas con número de consultas constante
+- PT-R-007: Asignación concurrente de una herramienta con un único ganador
+- PT-R-008: Asignación y devolución por lote de 1.000 códigos < 1s
+- PT-R-009: Tendencia de consumo a 12 meses desde el resumen diario (todos los materiales y uno)
+- PT-R-010: Pronóstico de reposición para 10.000 materiales x 2 años, desde la base de datos
+- PT-R-011: Listado de proyectos paginado (500 proyectos x 200 actividades)
+- PT-R-012: Avance de proyecto incremental: costo por edición independiente del tamaño
+- PT-R-013: Registro masivo de 5.000 avances en una transacción < 2s
+- PT-R-014: Ruta crítica de un proyecto de 20.000 actividades; recálculo incremental < 1s
+- PT-R-015: Cronograma JSON de 20.000 actividades; 304 sin leer actividades
+- PT-R-016: Curva S de cartera (20.000 actividades, 200.000 registros de avance) < 3s
+- PT-R-018: CSV en streaming de 200.000 materiales con memoria acotada
+- PT-R-019: Excel de 100.000 materiales: write_only vs. libro normal (tiempo y memoria)
+- PT-R-020: Reporte en segundo plano: encolar responde al instante y una solicitud igual reutiliza el archivo
+- PT-R-021: Excel de 20.000 materiales desde la caché versionada; 304 con ETag e invalidación solo del reporte afectado
+- PT-R-022: Libro de movimientos: un mes de 300.000 movimientos (1.000 materiales) en segundos
+- PT-R-023: Tabla material x mes (12 meses, 5.000 materiales) desde el resumen mensual; repetición desde caché
+- PT-R-024: Panel de control: contadores en una consulta y p95 estable de 20.000 a 200.000 movimientos
+- PT-R-025: Grupos del usuario (has_group y user_groups) en a lo sumo una consulta por página
+
+Uso:
+    python performance_test.py            # pruebas generales
+    python performance_test.py stock      # benchmarks específicos por nombre
 """
 
 import os
@@ -13,14 +39,29 @@ import django
 import time
 import csv
 import io
+import sys
+import threading
 from datetime import datetime
+from decimal import Decimal
 
 # Configurar Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'iconstruction_project.settings')
 django.setup()
 
-from inventory.models import Material, MaterialMovement
-from activities.models import Project, Activity
+from inventory.models import Material, MaterialMovement, Tool, ToolAssignment, MaterialDailyTotal, MaterialMonthlyTotal
+from inventory.rollups import monthly_totals, cached_monthly_totals
+from activities.models import Project, Activity, ActivityDependency, ActivityLog
+from activities.aggregates import add_to_project_aggregates, touch_projects, verify_project_aggregates
+from activities.services import record_logs
+from activities.scheduling import schedule_project
+from django.db import connection, transaction
+from django.db.models import F
+from django.contrib.auth.models import User
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from inventory.services import (post_movement, InsufficientStockError, checkout_tool, return_tool,
+                                ToolUnavailableError, batch_tool_action)
+from inventory.imports import import_movements
 
 def measure_time(func):
     """Decorador para medir tiempo de ejecución"""
@@ -129,7 +170,7 @@ def test_dashboard_stats():
         'tools': 50,  # Simulado
         'projects': Project.objects.count(),
         'activities': Activity.objects.count(),
-        'low_stock': Material.objects.filter(stock__lte=100).count(),
+        'low_stock': Material.objects.filter(below_min=True).count(),
     }
 
     recent_movs = MaterialMovement.objects.select_related('material','user').order_by('-created_at')[:10]
@@ -204,5 +245,956 @@ def run_performance_tests():
     print("- Optimizar consultas N+1 en listados de proyectos/actividades")
     print("=" * 60)
 
+def test_concurrent_stock_posting(threads=8, iterations=50):
+    """PT-R-003: N hilos registran ingresos y salidas sobre un mismo material.
+
+    Cada iteración registra un ingreso de 2 y una salida de 1, por lo que el
+    stock final debe ser exactamente threads * iterations.
+    """
+    material = Material.objects.create(name='Benchmark concurrencia', unit='kg')
+    rejected = []
+
+    def worker():
+        try:
+            for _ in range(iterations):
+                post_movement(MaterialMovement(material_id=material.pk, kind='ingreso', quantity=Decimal('2')))
+                try:
+                    post_movement(MaterialMovement(material_id=material.pk, kind='salida', quantity=Decimal('1')))
+                except InsufficientStockError:
+                    rejected.append(1)
+        finally:
+            connection.close()
+
+    try:
+        start_time = time.time()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.time() - start_time
+        material.refresh_from_db(fields=['stock'])
+        expected = Decimal(threads * iterations - len(rejected))
+        return material.stock, expected, 2 * threads * iterations, elapsed
+    finally:
+        material.delete()
+
+def run_stock_benchmark():
+    print("PT-R-003: Registro concurrente de movimientos")
+    print("-" * 40)
+    stock, expected, total, elapsed = test_concurrent_stock_posting()
+    print(f"Resultado: {total} movimientos en {elapsed:.2f}s ({total / elapsed:.0f} mov/s)")
+    print(f"Stock final: {stock} (esperado: {expected})")
+    status = "✅ PASÓ" if stock == expected else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: stock exacto)")
+    print()
+
+@measure_time
+def test_bulk_import(rows=50000, materials=100):
+    """PT-R-004: Importación masiva de movimientos con un delta de stock por material"""
+    created = Material.objects.bulk_create([
+        Material(name=f'Benchmark importación {i}', unit='kg') for i in range(materials)
+    ])
+    try:
+        batch = []
+        for i in range(rows):
+            material = created[i % materials]
+            batch.append({
+                'material': str(material.pk),
+                'kind': 'ingreso' if i % 3 else 'salida',
+                'quantity': '1.50',
+                'notes': f'Fila {i}',
+            })
+        result = import_movements(batch)
+        return f"{result.created} movimientos importados, {len(result.errors)} filas rechazadas", result.created
+    finally:
+        Material.objects.filter(pk__in=[m.pk for m in created]).delete()
+
+def run_import_benchmark():
+    print("PT-R-004: Importación masiva de 50.000 movimientos")
+    print("-" * 40)
+    result, time_taken = test_bulk_import()
+    print(f"Resultado: {result[0]} en {time_taken:.2f}s")
+    status = "✅ PASÓ" if time_taken < 10.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 10.0s)")
+    print()
+
+def test_low_stock_index(materials=100000):
+    """PT-R-005: Stock bajo mínimo vía columna indexada vs. comparación stock <= min_stock"""
+    prefix = 'Benchmark bajo mínimo'
+    Material.objects.bulk_create([
+        Material(name=f'{prefix} {i:06d}', stock=i % 1000, min_stock=(i * 7) % 60)
+        for i in range(materials)
+    ], batch_size=5000)
+    try:
+        start_time = time.time()
+        scan_count = Material.objects.filter(stock__lte=F('min_stock')).count()
+        scan_time = time.time() - start_time
+
+        start_time = time.time()
+        index_count = Material.objects.filter(below_min=True).count()
+        first_page = list(Material.objects.filter(below_min=True).order_by('name', 'id')[:50])
+        index_time = time.time() - start_time
+        return scan_count, index_count, len(first_page), scan_time, index_time
+    finally:
+        Material.objects.filter(name__startswith=prefix).delete()
+
+def run_low_stock_benchmark():
+    print("PT-R-005: Stock bajo mínimo con 100.000 materiales")
+    print("-" * 40)
+    scan_count, index_count, page_size, scan_time, index_time = test_low_stock_index()
+    print(f"Comparación de columnas: {scan_count} materiales en {scan_time * 1000:.1f} ms")
+    print(f"Columna below_min indexada: {index_count} materiales + primera página ({page_size}) en {index_time * 1000:.1f} ms")
+    status = "✅ PASÓ" if scan_count == index_count and index_time < 1.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: mismo resultado, < 1.0s)")
+    print()
+
+def count_view_queries(view, path, user):
+    """Ejecuta una vista (con su plantilla) y devuelve el número de consultas SQL."""
+    request = RequestFactory().get(path)
+    request.user = User.objects.get(pk=user.pk)  # como en cada solicitud: sin grupos ya leídos
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(request)
+    assert response.status_code == 200, response.status_code
+    return len(ctx.captured_queries)
+
+def test_tool_list_queries():
+    """PT-R-006: tool_list no debe ejecutar una consulta por herramienta asignada"""
+    from inventory.views import tool_list
+    counts = []
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_herramientas')
+        for size in (5, 60):
+            start = Tool.objects.count()
+            tools = Tool.objects.bulk_create([
+                Tool(code=f'BENCH{start + i:06d}', name=f'Herramienta benchmark {i}', status='asignada', assigned_to=user)
+                for i in range(size)
+            ])
+            ToolAssignment.objects.bulk_create([ToolAssignment(tool=t, user=user) for t in tools])
+            counts.append(count_view_queries(tool_list, '/inventory/tools/', user))
+        transaction.set_rollback(True)
+    return counts
+
+def create_projects(count, activities_per_project):
+    start = Project.objects.count()
+    projects = Project.objects.bulk_create([Project(name=f'Proyecto benchmark {start + i:05d}') for i in range(count)])
+    activities = Activity.objects.bulk_create((
+        Activity(project=p, name=f'Actividad {j}', progress_percent=(j * 7) % 101,
+                 status=('pendiente', 'en_progreso', 'completada')[j % 3])
+        for p in projects for j in range(activities_per_project)
+    ), batch_size=5000)
+    add_to_project_aggregates(activities)
+    return projects
+
+def test_project_list_queries():
+    """PT-R-006: project_list no debe ejecutar consultas por proyecto"""
+    from activities.views import project_list
+    counts = []
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_proyectos')
+        for size in (2, 10):
+            create_projects(size, 5)
+            counts.append(count_view_queries(project_list, '/activities/', user))
+        transaction.set_rollback(True)
+    return counts
+
+def run_query_count_checks():
+    print("PT-R-006: Consultas por página constantes")
+    print("-" * 40)
+    for name, check in (('tool_list', test_tool_list_queries), ('project_list', test_project_list_queries)):
+        counts = check()
+        print(f"{name}: {counts[0]} consultas con pocos registros, {counts[1]} con más registros")
+        status = "✅ PASÓ" if counts[0] == counts[1] else "❌ FALLÓ"
+        print(f"Estado: {status} (Objetivo: mismo número de consultas)")
+    print()
+
+def test_project_list_render(projects=500, activities=200):
+    """PT-R-011: Render de la primera página de project_list con muchos proyectos y actividades"""
+    from activities.views import project_list
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_render')
+        create_projects(projects, activities)
+        request = RequestFactory().get('/activities/')
+        request.user = user
+        start_time = time.time()
+        with CaptureQueriesContext(connection) as ctx:
+            response = project_list(request)
+        elapsed = time.time() - start_time
+        transaction.set_rollback(True)
+    return len(response.content), len(ctx.captured_queries), elapsed
+
+def run_project_list_benchmark():
+    print("PT-R-011: Listado de proyectos (500 proyectos x 200 actividades)")
+    print("-" * 40)
+    size, queries, elapsed = test_project_list_render()
+    print(f"Resultado: página de {size / 1024:.0f} KB con {queries} consultas en {elapsed:.2f}s")
+    status = "✅ PASÓ" if elapsed < 2.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 2.0s)")
+    print()
+
+def test_concurrent_checkout(threads=16, rounds=20):
+    """PT-R-007: Muchos hilos intentan asignar la misma herramienta a la vez.
+
+    En cada ronda todos los hilos compiten por la herramienta y luego se
+    devuelve; debe haber exactamente un ganador por ronda y nunca más de una
+    asignación abierta.
+    """
+    users = [User.objects.create(username=f'benchmark_checkout_{i}') for i in range(threads)]
+    tool = Tool.objects.create(code='BENCH-CHECKOUT', name='Excavadora benchmark')
+    winners_per_round, errors = [], []
+    try:
+        for _ in range(rounds):
+            winners = []
+            barrier = threading.Barrier(threads)
+
+            def worker(user):
+                try:
+                    barrier.wait()
+                    winners.append(checkout_tool(ToolAssignment(tool_id=tool.pk, user=user)))
+                except ToolUnavailableError:
+                    pass
+                except Exception as e:  # p. ej. bloqueos de SQLite
+                    errors.append(e)
+                finally:
+                    connection.close()
+
+            pool = [threading.Thread(target=worker, args=(u,)) for u in users]
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            winners_per_round.append(len(winners))
+            open_count = ToolAssignment.objects.filter(tool=tool, returned_at__isnull=True).count()
+            if open_count > 1:
+                errors.append(f'{open_count} asignaciones abiertas')
+            for assignment in winners:
+                return_tool(assignment)
+        return winners_per_round, errors
+    finally:
+        tool.delete()
+        User.objects.filter(pk__in=[u.pk for u in users]).delete()
+
+def run_checkout_benchmark():
+    print("PT-R-007: Asignación concurrente de herramientas")
+    print("-" * 40)
+    winners, errors = test_concurrent_checkout()
+    print(f"Resultado: {len(winners)} rondas, ganadores por ronda: {sorted(set(winners))}")
+    for e in errors[:5]:
+        print(f"Error: {e}")
+    status = "✅ PASÓ" if set(winners) == {1} and not errors else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: exactamente un ganador por ronda)")
+    print()
+
+def test_batch_scan(size=1000):
+    """PT-R-008: Lote de códigos escaneados en el cambio de turno"""
+    user = User.objects.create(username='benchmark_lote')
+    tools = Tool.objects.bulk_create([Tool(code=f'BENCH-LOTE-{i:05d}', name=f'Herramienta lote {i}') for i in range(size)])
+    codes = [t.code for t in tools]
+    try:
+        start_time = time.time()
+        checkout = batch_tool_action(codes, 'checkout', user)
+        checkout_time = time.time() - start_time
+        start_time = time.time()
+        returned = batch_tool_action(codes, 'return', user)
+        return_time = time.time() - start_time
+        ok = sum(r['ok'] for r in checkout) + sum(r['ok'] for r in returned)
+        return ok, checkout_time, return_time
+    finally:
+        Tool.objects.filter(pk__in=[t.pk for t in tools]).delete()
+        user.delete()
+
+def run_batch_scan_benchmark():
+    print("PT-R-008: Asignación/devolución por lote de 1.000 códigos")
+    print("-" * 40)
+    ok, checkout_time, return_time = test_batch_scan()
+    print(f"Resultado: {ok} operaciones; asignación {checkout_time * 1000:.0f} ms, devolución {return_time * 1000:.0f} ms")
+    status = "✅ PASÓ" if ok == 2000 and max(checkout_time, return_time) < 1.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 1.0s por lote)")
+    print()
+
+def test_consumption_trend(materials=1000, days=365):
+    """PT-R-009: Tendencia mensual de 12 meses leída del resumen diario (materials x days filas)"""
+    from datetime import timedelta
+    from core.versioning import MATERIALS, MOVEMENTS, bump_versions
+    from django.utils import timezone
+    created = Material.objects.bulk_create([Material(name=f'Benchmark consumo {i}') for i in range(materials)])
+    today = timezone.localdate()
+    try:
+        MaterialDailyTotal.objects.bulk_create((
+            MaterialDailyTotal(material=m, day=today - timedelta(days=d), ingreso_total=d % 7,
+                               salida_total=d % 5, movement_count=2)
+            for m in created for d in range(days)
+        ), batch_size=5000)
+        bump_versions(MATERIALS, MOVEMENTS)  # bulk_create no emite señales
+        since = (today - timedelta(days=365)).replace(day=1)
+        start_time = time.time()
+        overall = list(monthly_totals(since))
+        overall_time = time.time() - start_time
+        cached_monthly_totals(since)
+        start_time = time.time()
+        cached_monthly_totals(since)
+        cached_time = time.time() - start_time
+        start_time = time.time()
+        single = list(monthly_totals(since, created[0]))
+        single_time = time.time() - start_time
+        return len(overall), len(single), overall_time, cached_time, single_time
+    finally:
+        Material.objects.filter(pk__in=[m.pk for m in created]).delete()
+
+def run_consumption_benchmark():
+    print("PT-R-009: Tendencia de consumo a 12 meses")
+    print("-" * 40)
+    overall, single, overall_time, cached_time, single_time = test_consumption_trend()
+    print(f"Todos los materiales: {overall} meses en {overall_time * 1000:.1f} ms "
+          f"({cached_time * 1000:.1f} ms desde la caché)")
+    print(f"Un material: {single} meses en {single_time * 1000:.1f} ms")
+    # la vista sin filtro (todos los materiales) es la que se abre por defecto
+    ok = overall_time < 1.0 and cached_time < 0.05 and single_time < 0.1
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: todos los materiales < 1s y < 50 ms desde la caché; un material < 100 ms)")
+    print()
+
+def test_forecast(materials=10000, days=730, density=0.5):
+    """PT-R-010: Pronóstico de reposición completo: lectura del resumen diario y cálculo vectorizado"""
+    import numpy as np
+    from datetime import timedelta
+    from django.test import TestCase
+    from django.utils import timezone
+    from core.versioning import MATERIALS, MOVEMENTS, bump_versions
+    from inventory.forecasting import cached_forecast, forecast, load_history
+    from inventory.rollups import rebuild_monthly_totals
+    rng = np.random.default_rng(42)
+    cells = rng.random((materials, days)) < density
+    quantities = np.round(rng.gamma(2.0, 10.0, cells.shape), 2) + 0.01
+    today = timezone.localdate()
+    with transaction.atomic():
+        created = Material.objects.bulk_create([Material(name=f'Material pronóstico {i:05d}', stock=i % 5000,
+                                                         min_stock=i % 500) for i in range(materials)])
+        MaterialDailyTotal.objects.bulk_create((
+            MaterialDailyTotal(material=created[m], day=today - timedelta(days=int(d)), ingreso_total=0,
+                               salida_total=Decimal(f'{quantities[m, d]:.2f}'), movement_count=1)
+            for m, d in zip(*np.nonzero(cells))), batch_size=5000)
+        rebuild_monthly_totals()
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            bump_versions(MATERIALS, MOVEMENTS)  # bulk_create no emite señales
+        start_time = time.time()
+        history = load_history(days)
+        load_time = time.time() - start_time
+        start_time = time.time()
+        result = forecast(history)
+        forecast_time = time.time() - start_time
+        cached_forecast()
+        start_time = time.time()
+        cached_forecast()
+        cached_time = time.time() - start_time
+        transaction.set_rollback(True)
+    return int(cells.sum()), int(np.isfinite(result['days_left']).sum()), load_time, forecast_time, cached_time
+
+def run_forecast_benchmark():
+    print("PT-R-010: Pronóstico de reposición (10.000 materiales x 2 años)")
+    print("-" * 40)
+    records, with_forecast, load_time, forecast_time, cached_time = test_forecast()
+    print(f"Resultado: {records} registros diarios, {with_forecast} materiales pronosticados")
+    print(f"  lectura del historial {load_time * 1000:.0f} ms, cálculo {forecast_time * 1000:.0f} ms, "
+          f"total {(load_time + forecast_time) * 1000:.0f} ms; desde la caché {cached_time * 1000:.1f} ms")
+    status = "✅ PASÓ" if load_time + forecast_time < 3.0 and cached_time < 0.05 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: lectura + cálculo < 3.0s; repetición < 50 ms)")
+    print()
+
+def test_project_progress(sizes=(10, 2000), edits=200):
+    """PT-R-012: Editar una actividad cuesta lo mismo con 10 o 2.000 actividades por proyecto"""
+    timings = []
+    with transaction.atomic():
+        for size in sizes:
+            project, = create_projects(1, size)
+            activities = list(project.activities.order_by('id')[:edits])
+            start_time = time.time()
+            for i, activity in enumerate(activities):
+                activity.progress_percent = (activity.progress_percent + 10) % 101
+                activity.status = 'completada' if i % 2 else 'en_progreso'
+                activity.save()
+            timings.append((time.time() - start_time) / len(activities))
+        drifted = len(verify_project_aggregates())
+        transaction.set_rollback(True)
+    return timings, drifted
+
+def run_project_progress_benchmark():
+    print("PT-R-012: Avance de proyecto incremental")
+    print("-" * 40)
+    (small, large), drifted = test_project_progress()
+    print(f"Resultado: {small * 1000:.2f} ms por edición (10 actividades), {large * 1000:.2f} ms (2.000 actividades)")
+    print(f"Proyectos con agregados desfasados: {drifted}")
+    status = "✅ PASÓ" if drifted == 0 and large < small * 3 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: sin desfase y costo constante)")
+    print()
+
+def test_log_batch(activities=1000, logs_per_activity=5):
+    """PT-R-013: Lote de avances con fechas desordenadas; gana el más reciente"""
+    with transaction.atomic():
+        projects = create_projects(activities // 100, 100)
+        ids = list(Activity.objects.filter(project__in=projects).values_list('id', flat=True))
+        # fechas en orden inverso: el avance del día más reciente es el último de cada actividad
+        entries = [{'activity': pk, 'date': f'2026-01-{day:02d}', 'progress': 100 - day * 10}
+                   for day in range(logs_per_activity, 0, -1) for pk in ids]
+        with CaptureQueriesContext(connection) as ctx:
+            start_time = time.time()
+            result = record_logs(entries)
+            elapsed = time.time() - start_time
+        latest_ok = not Activity.objects.filter(pk__in=ids).exclude(progress_percent=100 - logs_per_activity * 10).exists()
+        drifted = len(verify_project_aggregates())
+        transaction.set_rollback(True)
+    return result, len(ctx.captured_queries), elapsed, latest_ok and drifted == 0
+
+def run_log_batch_benchmark():
+    print("PT-R-013: Registro masivo de avances (1.000 actividades x 5 fechas)")
+    print("-" * 40)
+    result, queries, elapsed, consistent = test_log_batch()
+    print(f"Resultado: {result.created} registros, {result.updated} actividades actualizadas, "
+          f"{queries} consultas en {elapsed:.2f}s")
+    print(f"Avance más reciente conservado y agregados al día: {'sí' if consistent else 'no'}")
+    status = "✅ PASÓ" if consistent and elapsed < 2.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 2.0s y sin pisar avances más nuevos)")
+    print()
+
+def test_critical_path(activities=20000, fan_in=2, span=50):
+    """PT-R-014: Programación completa y recálculo tras cambiar una actividad intermedia"""
+    import random
+    from datetime import date, timedelta
+    rng = random.Random(42)
+    base = date(2026, 1, 1)
+    with transaction.atomic():
+        project, = create_projects(1, 0)
+        created = Activity.objects.bulk_create((
+            Activity(project=project, name=f'Actividad {i}',
+                     planned_start=base + timedelta(days=i // 100) if i % 10 == 0 else None,
+                     planned_end=base + timedelta(days=i // 100 + rng.randint(0, 15)) if i % 10 == 0 else None)
+            for i in range(activities)
+        ), batch_size=5000)
+        ActivityDependency.objects.bulk_create((
+            ActivityDependency(predecessor=created[j], successor=created[i], lag_days=rng.randint(0, 2))
+            for i in range(1, activities)
+            for j in set(rng.randrange(max(0, i - span), i) for _ in range(fan_in))
+        ), batch_size=5000)
+
+        start_time = time.time()
+        schedule_project(project)
+        full_time = time.time() - start_time
+
+        target = created[activities // 2]
+        Activity.objects.filter(pk=target.pk).update(planned_start=base, planned_end=base + timedelta(days=90))
+        start_time = time.time()
+        updated = schedule_project(project, [target.pk])
+        incremental_time = time.time() - start_time
+        transaction.set_rollback(True)
+    return full_time, incremental_time, updated
+
+def run_critical_path_benchmark():
+    print("PT-R-014: Ruta crítica (20.000 actividades, ~40.000 dependencias)")
+    print("-" * 40)
+    full_time, incremental_time, updated = test_critical_path()
+    print(f"Programación completa: {full_time:.2f}s")
+    print(f"Recálculo incremental: {incremental_time:.2f}s ({updated} actividades actualizadas)")
+    status = "✅ PASÓ" if incremental_time < 1.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 1.0s por cambio)")
+    print()
+
+def test_timeline(activities=20000):
+    """PT-R-015: Cronograma completo y respuesta condicional (If-None-Match)"""
+    from activities.views import project_timeline
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_cronograma')
+        project, = create_projects(1, activities)
+        path = f'/activities/projects/{project.pk}/timeline/'
+        request = RequestFactory().get(path)
+        request.user = user
+        start_time = time.time()
+        response = project_timeline(request, pk=project.pk)
+        elapsed = time.time() - start_time
+
+        request = RequestFactory().get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+        request.user = user
+        with CaptureQueriesContext(connection) as ctx:
+            cached = project_timeline(request, pk=project.pk)
+        touches_activities = any(Activity._meta.db_table in q['sql'] for q in ctx.captured_queries)
+        transaction.set_rollback(True)
+    return len(response.content), elapsed, cached.status_code, touches_activities
+
+def run_timeline_benchmark():
+    print("PT-R-015: Cronograma JSON (20.000 actividades)")
+    print("-" * 40)
+    size, elapsed, cached_status, touches_activities = test_timeline()
+    print(f"Resultado: {size / 1024:.0f} KB en {elapsed:.2f}s; revalidación: HTTP {cached_status}"
+          f"{' leyendo actividades' if touches_activities else ' sin leer actividades'}")
+    status = "✅ PASÓ" if elapsed < 2.0 and cached_status == 304 and not touches_activities else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 2.0s y 304 sin leer actividades)")
+    print()
+
+def test_scurve(projects=100, activities_per_project=200, logs_per_activity=10):
+    """PT-R-016: Curva S de toda la cartera, en frío y desde la caché"""
+    import random
+    from datetime import date, timedelta
+    from activities.scurve import cached_scurve
+    rng = random.Random(7)
+    base = date(2025, 1, 1)
+    with transaction.atomic():
+        created = create_projects(projects, 0)
+        activities = []
+        for p in created:
+            for j in range(activities_per_project):
+                start = base + timedelta(days=rng.randint(0, 500))
+                activities.append(Activity(project=p, name=f'Actividad {j}', planned_start=start,
+                                           planned_end=start + timedelta(days=rng.randint(0, 60))))
+        activities = Activity.objects.bulk_create(activities, batch_size=5000)
+        add_to_project_aggregates(activities)
+        ActivityLog.objects.bulk_create((
+            ActivityLog(activity=a, date=a.planned_start + timedelta(days=k * 7), progress_percent=min(100, k * 12))
+            for a in activities for k in range(1, logs_per_activity + 1)
+        ), batch_size=5000)
+        touch_projects([p.pk for p in created])
+
+        start_time = time.time()
+        curve = cached_scurve()
+        cold = time.time() - start_time
+        start_time = time.time()
+        cached_scurve()
+        warm = time.time() - start_time
+        transaction.set_rollback(True)
+    return curve['days'], cold, warm
+
+def run_scurve_benchmark():
+    print("PT-R-016: Curva S de cartera (20.000 actividades x 10 registros)")
+    print("-" * 40)
+    days, cold, warm = test_scurve()
+    print(f"Resultado: {days} días calculados en {cold:.2f}s; desde caché en {warm * 1000:.1f} ms")
+    status = "✅ PASÓ" if cold < 3.0 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: < 3.0s en frío)")
+    print()
+
+def test_streaming_csv(rows=200000, compress=False):
+    """PT-R-018: Primer byte inmediato y memoria máxima acotada al exportar en streaming"""
+    import tracemalloc
+    from reports.views import inventory_csv
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_csv')
+        Material.objects.bulk_create((Material(name=f'Material streaming {i:06d}', unit='kg', stock=i % 500, min_stock=10)
+                                      for i in range(rows)), batch_size=5000)
+        request = RequestFactory().get('/reports/inventory/csv/' + ('?gzip=1' if compress else ''))
+        request.user = user
+        start_time = time.time()
+        chunks = iter(inventory_csv(request).streaming_content)
+        size = len(next(chunks))
+        first_byte = time.time() - start_time
+        for chunk in chunks:
+            size += len(chunk)
+        elapsed = time.time() - start_time
+        # segunda pasada solo para medir memoria (tracemalloc hace todo más lento)
+        tracemalloc.start()
+        for chunk in inventory_csv(request).streaming_content:
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        transaction.set_rollback(True)
+    return size, first_byte, elapsed, peak
+
+def run_streaming_csv_benchmark():
+    print("PT-R-018: Exportación CSV en streaming (200.000 materiales)")
+    print("-" * 40)
+    ok = True
+    for compress in (False, True):
+        size, first_byte, elapsed, peak = test_streaming_csv(compress=compress)
+        label = 'gzip' if compress else 'csv'
+        print(f"Resultado ({label}): {size / 1024 / 1024:.1f} MB en {elapsed:.2f}s, primer byte a los "
+              f"{first_byte * 1000:.0f} ms, memoria máxima {peak / 1024 / 1024:.1f} MB")
+        ok = ok and first_byte < 0.5 and peak < 32 * 1024 * 1024
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: primer byte < 0.5s y memoria < 32 MB)")
+    print()
+
+def legacy_inventory_excel(output):
+    """Copia de la exportación Excel anterior (libro normal, estilos por celda), como referencia."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Border, Side, Alignment, PatternFill, Font
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Inventario"
+    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+    header_fill = PatternFill(start_color="FFD3D3D3", end_color="FFD3D3D3", fill_type="solid")
+    header_font = Font(bold=True)
+    for col, label in zip('ABCD', ['Material', 'Unidad', 'Stock', 'Stock Mínimo']):
+        ws[f'{col}1'] = label
+        ws[f'{col}1'].border = thin_border
+        ws[f'{col}1'].fill = header_fill
+        ws[f'{col}1'].font = header_font
+        ws[f'{col}1'].alignment = Alignment(horizontal='center')
+    row = 2
+    for m in Material.objects.all():
+        ws[f'A{row}'] = m.name
+        ws[f'B{row}'] = m.get_unit_display()
+        ws[f'C{row}'] = m.stock
+        ws[f'D{row}'] = m.min_stock
+        for col in ['A', 'B', 'C', 'D']:
+            ws[f'{col}{row}'].border = thin_border
+        row += 1
+    for col, width in zip('ABCD', [20, 15, 15, 15]):
+        ws.column_dimensions[col].width = width
+    wb.save(output)
+
+def test_excel_export(rows=100000):
+    """PT-R-019: Exportación Excel con write_only y estilos compartidos vs. la implementación anterior"""
+    import tracemalloc
+    from openpyxl import load_workbook
+    from reports.views import inventory_excel
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_excel')
+        Material.objects.bulk_create((Material(name=f'Material excel {i:06d}', unit='kg', stock=i % 500, min_stock=10)
+                                      for i in range(rows)), batch_size=5000)
+        request = RequestFactory().get('/reports/inventory/excel/')
+        request.user = user
+
+        def legacy():
+            legacy_inventory_excel(io.BytesIO())
+
+        def current():
+            return b''.join(inventory_excel(request).streaming_content)
+
+        results = {}
+        for label, export in (('anterior', legacy), ('write_only', current)):
+            start_time = time.time()
+            export()
+            elapsed = time.time() - start_time
+            # segunda pasada solo para medir memoria (tracemalloc hace todo más lento)
+            tracemalloc.start()
+            export()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[label] = (elapsed, peak)
+        sheet = load_workbook(io.BytesIO(current()), read_only=True).active
+        written = sum(1 for _ in sheet.iter_rows(values_only=True))
+        transaction.set_rollback(True)
+    return results, written
+
+def run_excel_export_benchmark():
+    rows = 100000
+    print(f"PT-R-019: Exportación Excel de inventario ({rows:,} materiales)".replace(',', '.'))
+    print("-" * 40)
+    results, written = test_excel_export(rows)
+    print("Resultado:")
+    for label, (elapsed, peak) in results.items():
+        print(f"  {label:<10} {elapsed:6.2f}s  memoria máxima {peak / 1024 / 1024:7.1f} MB")
+    legacy_time, legacy_peak = results['anterior']
+    new_time, new_peak = results['write_only']
+    print(f"  Filas en el libro: {written} (encabezados y separador incluidos)")
+    ok = new_time < legacy_time and new_peak * 4 < legacy_peak and written >= rows
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: más rápido y < 1/4 de la memoria que la versión anterior)")
+    print()
+
+def test_report_job(rows=50000):
+    """PT-R-020: La vista encola sin generar el archivo; el procesador lo genera una sola vez"""
+    from reports.jobs import claim_next, run_job, job_path
+    from reports.models import ReportJob
+    from reports.views import report_job_create
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_jobs')
+        Material.objects.bulk_create((Material(name=f'Material cola {i:06d}', unit='kg', stock=i % 500, min_stock=10)
+                                      for i in range(rows)), batch_size=5000)
+        factory = RequestFactory()
+
+        def post():
+            request = factory.post('/reports/jobs/inventory_excel/new/?format=json')
+            request.user = user
+            return report_job_create(request, 'inventory_excel')
+
+        start_time = time.time()
+        first = post()
+        enqueue_time = time.time() - start_time
+        start_time = time.time()
+        job = run_job(claim_next())
+        build_time = time.time() - start_time
+        start_time = time.time()
+        again = post()
+        reuse_time = time.time() - start_time
+        jobs = ReportJob.objects.filter(kind='inventory_excel', requested_by=user).count()
+        job_path(job).unlink(missing_ok=True)
+        transaction.set_rollback(True)
+    return first.status_code, again.status_code, enqueue_time, build_time, reuse_time, jobs, job
+
+def run_report_job_benchmark():
+    rows = 50000
+    print(f"PT-R-020: Reporte Excel en segundo plano ({rows:,} materiales)".replace(',', '.'))
+    print("-" * 40)
+    first, again, enqueue_time, build_time, reuse_time, jobs, job = test_report_job(rows)
+    print(f"Resultado: encolar {enqueue_time * 1000:.0f} ms (HTTP {first}), generación en el procesador "
+          f"{build_time:.2f}s ({job.rows_done} filas, estado {job.status}), segunda solicitud "
+          f"{reuse_time * 1000:.0f} ms (HTTP {again}), trabajos creados: {jobs}")
+    ok = enqueue_time < 0.1 and reuse_time < 0.1 and jobs == 1 and job.status == 'terminado' and again == 200
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: encolar < 100 ms y un solo archivo por reporte y parámetros)")
+    print()
+
+def test_report_cache(rows=20000):
+    """PT-R-021: Caché de reportes por versión de datos: repetición instantánea e invalidación exacta"""
+    from django.test import TestCase
+    from core.versioning import MATERIALS, MOVEMENTS, bump_versions
+    from reports.views import inventory_excel
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_report_cache')
+        # los incrementos de versión se aplican al confirmar; aquí se ejecutan al salir de cada bloque
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            Material.objects.bulk_create((Material(name=f'Material caché {i:06d}', unit='kg', stock=i % 500,
+                                                   min_stock=10) for i in range(rows)), batch_size=5000)
+            project = Project.objects.create(name='Proyecto caché')
+            activity = Activity.objects.create(project=project, name='Actividad caché')
+            bump_versions(MATERIALS, MOVEMENTS)  # bulk_create no emite señales
+        factory = RequestFactory()
+
+        def get(etag=None):
+            request = factory.get('/reports/inventory/excel/', **({'HTTP_IF_NONE_MATCH': etag} if etag else {}))
+            request.user = user
+            start_time = time.time()
+            response = inventory_excel(request)
+            if response.status_code == 200:
+                b''.join(response.streaming_content)
+            return response, time.time() - start_time
+
+        timings = {}
+        first, timings['frío'] = get()
+        etag = first['ETag']
+        _, timings['en caché'] = get()
+        not_modified, timings['304'] = get(etag)
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            activity.progress_percent = 40
+            activity.save()
+        after_activity, _ = get(etag)
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            material = Material.objects.order_by('pk').first()
+            material.stock += 1
+            material.save()
+        after_material, timings['tras editar material'] = get(etag)
+        transaction.set_rollback(True)
+    return timings, not_modified.status_code, after_activity.status_code, after_material.status_code
+
+def run_report_cache_benchmark():
+    rows = 20000
+    print(f"PT-R-021: Caché versionada del Excel de inventario ({rows:,} materiales)".replace(',', '.'))
+    print("-" * 40)
+    timings, not_modified, after_activity, after_material = test_report_cache(rows)
+    print("Resultado:")
+    for label, elapsed in timings.items():
+        print(f"  {label:<22} {elapsed * 1000:8.1f} ms")
+    print(f"  Con ETag: {not_modified} sin cambios, {after_activity} tras editar una actividad, "
+          f"{after_material} tras editar un material")
+    ok = (timings['en caché'] < 0.1 and timings['304'] < 0.05 and not_modified == 304
+          and after_activity == 304 and after_material == 200)
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: repetición < 100 ms, 304 < 50 ms, solo el reporte afectado se regenera)")
+    print()
+
+def test_movement_ledger(materials=1000, movements=300000, days=360):
+    """PT-R-022: Libro de movimientos de un mes recorriendo el índice (material, created_at)"""
+    from datetime import timedelta
+    from django.utils import timezone
+    from reports.views import ledger_csv
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_ledger')
+        created = Material.objects.bulk_create([Material(name=f'Material libro {i:04d}', unit='kg') for i in range(materials)])
+        rows = MaterialMovement.objects.bulk_create((
+            MaterialMovement(material=created[i % materials], kind='ingreso' if i % 3 else 'salida',
+                             quantity=1 + i % 9, user=user, notes=f'Movimiento {i}')
+            for i in range(movements)), batch_size=5000)
+        # bulk_create fija created_at en ahora: se reparten los movimientos en el año
+        now = timezone.now()
+        meta, quote = MaterialMovement._meta, connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.executemany(f'UPDATE {quote(meta.db_table)} SET {quote("created_at")} = %s WHERE {quote("id")} = %s',
+                               [(now - timedelta(days=i % days, seconds=i), m.pk) for i, m in enumerate(rows)])
+        today = timezone.localdate()
+        factory = RequestFactory()
+
+        def export(query):
+            request = factory.get('/reports/ledger/csv/', query)
+            request.user = user
+            start_time = time.time()
+            lines = sum(chunk.count(b'\n') for chunk in ledger_csv(request).streaming_content)
+            return lines - 1, time.time() - start_time
+
+        month = {'start': (today - timedelta(days=29)).isoformat(), 'end': today.isoformat()}
+        results = {
+            'mes completo': export(month),
+            'mes, un material': export({**month, 'material': created[0].pk}),
+            'mes, solo salidas': export({**month, 'kind': 'salida'}),
+        }
+        transaction.set_rollback(True)
+    return results
+
+def run_movement_ledger_benchmark():
+    print("PT-R-022: Libro de movimientos (300.000 movimientos, 1.000 materiales)")
+    print("-" * 40)
+    results = test_movement_ledger()
+    print("Resultado:")
+    for label, (lines, elapsed) in results.items():
+        print(f"  {label:<18} {lines:>7} filas en {elapsed:.2f}s")
+    status = "✅ PASÓ" if results['mes completo'][1] < 5.0 and results['mes, un material'][1] < 0.5 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: un mes < 5s; un material < 0.5s)")
+    print()
+
+def test_material_pivot(materials=5000, days=365, step=3):
+    """PT-R-023: Tabla dinámica material x mes leída del resumen mensual"""
+    from datetime import timedelta
+    from django.test import TestCase
+    from django.utils import timezone
+    from core.versioning import MATERIALS, MOVEMENTS, bump_versions
+    from inventory.rollups import rebuild_monthly_totals
+    from reports.views import material_pivot
+    with transaction.atomic():
+        user = User.objects.create(username='benchmark_pivot')
+        created = Material.objects.bulk_create([Material(name=f'Material tabla {i:04d}', unit='kg') for i in range(materials)])
+        today = timezone.localdate()
+        MaterialDailyTotal.objects.bulk_create((
+            MaterialDailyTotal(material=m, day=today - timedelta(days=d), ingreso_total=d % 7,
+                               salida_total=d % 5, movement_count=2)
+            for i, m in enumerate(created) for d in range(i % step, days, step)
+        ), batch_size=5000)
+        rebuild_monthly_totals()
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            bump_versions(MATERIALS, MOVEMENTS)  # bulk_create no emite señales
+        factory = RequestFactory()
+
+        def view(query):
+            request = factory.get('/reports/pivot/', query)
+            request.user = user
+            start_time = time.time()
+            response = material_pivot(request)
+            return response, time.time() - start_time
+
+        query = {'end': f'{today:%Y-%m}', 'months': 12, 'measure': 'salida'}
+        first, cold = view(query)
+        _, cached = view({**query, 'page': 5})
+        _, other_measure = view({**query, 'measure': 'neto'})
+        cells = MaterialMonthlyTotal.objects.filter(material__in=created).count()
+        transaction.set_rollback(True)
+    return cells, first.status_code, {'frío': cold, 'en caché (página 5)': cached, 'en caché (neto)': other_measure}
+
+def run_material_pivot_benchmark():
+    print("PT-R-023: Tabla material x mes (5.000 materiales, 12 meses)")
+    print("-" * 40)
+    cells, status_code, timings = test_material_pivot()
+    print(f"Resultado: {cells:,} filas del resumen mensual".replace(',', '.') + f" (HTTP {status_code})")
+    for label, elapsed in timings.items():
+        print(f"  {label:<22} {elapsed * 1000:8.1f} ms")
+    ok = status_code == 200 and timings['frío'] < 1.0 and max(timings['en caché (página 5)'], timings['en caché (neto)']) < 0.2
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: primera consulta < 1s, repetición < 200 ms)")
+    print()
+
+def test_dashboard(movements=20000, loads=50):
+    """PT-R-024: Panel de control con contadores en caché y últimos movimientos por índice"""
+    from django.test import TestCase
+    from core.dashboard import count_stats
+    from core.versioning import ACTIVITIES, MATERIALS, MOVEMENTS, bump_versions
+    from core.views import dashboard
+    with transaction.atomic():
+        user = User.objects.create(username=f'benchmark_dashboard_{movements}')
+        created = Material.objects.bulk_create((Material(name=f'Material panel {i:06d}', stock=i % 20, min_stock=10,
+                                                         below_min=i % 20 < 10) for i in range(movements // 10)),
+                                               batch_size=5000)
+        MaterialMovement.objects.bulk_create((
+            MaterialMovement(material=created[i % len(created)], kind='ingreso', quantity=1, user=user)
+            for i in range(movements)), batch_size=5000)
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            bump_versions(MATERIALS, MOVEMENTS, ACTIVITIES)  # bulk_create no emite señales
+        request = RequestFactory().get('/dashboard/')
+        request.user = user
+
+        def load():
+            start_time = time.time()
+            dashboard(request)
+            return time.time() - start_time
+
+        with CaptureQueriesContext(connection) as queries:
+            start_time = time.time()
+            count_stats()
+            stats_time = time.time() - start_time
+        stats_queries = len(queries)
+        cold = load()
+        warm = sorted(load() for _ in range(loads))
+        transaction.set_rollback(True)
+    return stats_queries, stats_time, cold, warm[int(len(warm) * 0.95) - 1]
+
+def run_dashboard_benchmark():
+    print("PT-R-024: Panel de control con tablas crecientes")
+    print("-" * 40)
+    results = {size: test_dashboard(size) for size in (20000, 200000)}
+    print("Resultado:")
+    for size, (queries, stats_time, cold, p95) in results.items():
+        print(f"  {size:>7} movimientos: contadores en {queries} consulta ({stats_time * 1000:.1f} ms), "
+              f"primera carga {cold * 1000:.1f} ms, p95 en caché {p95 * 1000:.1f} ms")
+    small, large = results[20000], results[200000]
+    ok = large[0] == 1 and large[3] < 0.05 and large[3] < small[3] * 2 + 0.005
+    status = "✅ PASÓ" if ok else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: una consulta, p95 en caché < 50 ms e independiente del tamaño)")
+    print()
+
+def test_group_queries():
+    """PT-R-025: has_group lee los grupos del usuario una sola vez por página"""
+    from django.contrib.auth.models import Group
+    from core.views import dashboard
+    from inventory.views import material_list
+    from activities.views import project_list
+    group_table = Group._meta.db_table
+    counts = {}
+    with transaction.atomic():
+        group, _ = Group.objects.get_or_create(name='Bodeguero')
+        user = User.objects.create(username='benchmark_grupos')
+        user.groups.add(group)
+        for name, view, path in (('dashboard', dashboard, '/dashboard/'), ('material_list', material_list, '/inventory/'),
+                                 ('project_list', project_list, '/activities/')):
+            request = RequestFactory().get(path)
+            request.user = User.objects.get(pk=user.pk)
+            with CaptureQueriesContext(connection) as ctx:
+                response = view(request)
+            assert response.status_code == 200, response.status_code
+            counts[name] = sum(group_table in query['sql'] for query in ctx.captured_queries)
+        transaction.set_rollback(True)
+    return counts
+
+def run_group_queries_benchmark():
+    print("PT-R-025: Grupos del usuario por página")
+    print("-" * 40)
+    counts = test_group_queries()
+    print("Resultado: consultas de grupos por página: " + ", ".join(f"{name} {count}" for name, count in counts.items()))
+    status = "✅ PASÓ" if max(counts.values()) <= 1 else "❌ FALLÓ"
+    print(f"Estado: {status} (Objetivo: a lo sumo 1 consulta de grupos por página)")
+    print()
+
+BENCHMARKS = {
+    'stock': run_stock_benchmark,
+    'import': run_import_benchmark,
+    'low_stock': run_low_stock_benchmark,
+    'queries': run_query_count_checks,
+    'checkout': run_checkout_benchmark,
+    'batch_scan': run_batch_scan_benchmark,
+    'consumption': run_consumption_benchmark,
+    'forecast': run_forecast_benchmark,
+    'project_list': run_project_list_benchmark,
+    'project_progress': run_project_progress_benchmark,
+    'log_batch': run_log_batch_benchmark,
+    'critical_path': run_critical_path_benchmark,
+    'timeline': run_timeline_benchmark,
+    'scurve': run_scurve_benchmark,
+    'streaming_csv': run_streaming_csv_benchmark,
+    'excel_export': run_excel_export_benchmark,
+    'report_job': run_report_job_benchmark,
+    'report_cache': run_report_cache_benchmark,
+    'movement_ledger': run_movement_ledger_benchmark,
+    'material_pivot': run_material_pivot_benchmark,
+    'dashboard': run_dashboard_benchmark,
+    'groups': run_group_queries_benchmark,
+}
+
 if __name__ == "__main__":
-    run_performance_tests()
+    if len(sys.argv) > 1:
+        for name in sys.argv[1:]:
+            BENCHMARKS[name]()
+    else:
+        run_performance_tests()
@@ -0,0 +1,81 @@
+"""Caché en disco de los reportes de descarga directa.
+
+La clave de cada archivo combina el reporte, sus parámetros y las
+versiones de los grupos de datos de los que depende (``core.versioning``):
+mientras esos datos no cambien, una descarga repetida envía el archivo ya
+generado y el ETag permite responder 304 sin leerlo. Un cambio en otro
+grupo (p. ej. un avance de actividad para el reporte de inventario) no
+invalida el archivo. Al generar un archivo se borran los del mismo reporte
+generados con datos anteriores.
+"""
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from django.conf import settings
+from django.http import FileResponse
+from core.versioning import data_stamp
+from .catalog import REPORTS
+
+
+def params_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def report_stamp(kind, params):
+    """``<reporte>-<hash de parámetros>-<versiones>``: cambia exactamente cuando cambia el contenido."""
+    return f"{kind}-{params_hash(params)}-{data_stamp(REPORTS[kind].data)}"
+
+
+def _request_stamp(request, kind):
+    stamps = request.__dict__.setdefault('_report_stamps', {})
+    if kind not in stamps:
+        stamps[kind] = report_stamp(kind, REPORTS[kind].parse_params(request.GET))
+    return stamps[kind]
+
+
+def report_etag(kind):
+    """``etag_func`` para ``@condition`` de la vista de descarga de ``kind`` (sin ETag si los parámetros son inválidos)."""
+    def etag(request, *args, **kwargs):
+        try:
+            return _request_stamp(request, kind)
+        except ValueError:
+            return None
+    return etag
+
+
+def cached_file(kind, params, stamp=None):
+    """Ruta del archivo del reporte para los datos actuales; lo genera si no existe."""
+    report = REPORTS[kind]
+    stamp = stamp or report_stamp(kind, params)
+    folder = Path(settings.REPORT_ROOT) / 'cache'
+    path = folder / f"{stamp}-{report.output_name(params)}"
+    if path.exists():
+        return path
+    folder.mkdir(parents=True, exist_ok=True)
+    partial = folder / f"{path.name}.{uuid.uuid4().hex}.part"
+    try:
+        with open(partial, 'wb') as output:
+            report.write(output, params)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    # los archivos del mismo reporte generados con datos anteriores ya no se usarán
+    current = stamp.rsplit('-', 1)[1]
+    for old in folder.glob(f"{kind}-*"):
+        if old.name.endswith('.part') or old.name[len(kind) + 1:].split('-')[1] == current:
+            continue
+        try:
+            old.unlink()
+        except OSError:  # en Windows, abierto por otra descarga
+            pass
+    return path
+
+
+def cached_response(request, kind):
+    report = REPORTS[kind]
+    params = report.parse_params(request.GET)
+    path = cached_file(kind, params, _request_stamp(request, kind))
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=report.output_name(params),
+                        content_type=report.content_type(params))
@@ -0,0 +1,198 @@
+"""Reportes descargables: cómo se arma cada archivo a partir de la base de datos.
+
+Las vistas de descarga directa y los trabajos en segundo plano
+(``reports.jobs``) usan las mismas definiciones. ``params`` son los
+parámetros ya validados del reporte (serializables en JSON) y ``progress``,
+si se indica, recibe el número de filas escritas después de cada bloque.
+"""
+from datetime import date
+from core.versioning import ACTIVITIES, MATERIALS, MOVEMENTS, TOOLS
+from inventory.models import Material, Tool
+from activities.models import Activity
+from .excel import XLSX_CONTENT_TYPE, ExcelWorkbook, with_labels
+from .exports import csv_chunks, gzip_chunks, iterate_rows
+from .forms import LedgerFilterForm, PivotForm
+from .ledger import (LEDGER_HEADER, LEDGER_WIDTHS, archived_ledger_rows, includes_archive,
+                     ledger_movements, ledger_rows)
+from .pivot import MEASURES, cached_pivot
+
+
+def counted(blocks, progress=None):
+    for rows in blocks:
+        yield rows
+        if progress:
+            progress(len(rows))
+
+
+def inventory_sections(params=None, progress=None):
+    return [
+        (['Material','Unidad','Stock','Stock Minimo'],
+         counted(iterate_rows(Material.objects.all(), ['name', 'unit', 'stock', 'min_stock']), progress)),
+        (['Herramienta','Código','Estado'],
+         counted(iterate_rows(Tool.objects.all(), ['name', 'code', 'status']), progress)),
+    ]
+
+
+def activities_sections(params=None, progress=None):
+    return [
+        (['Proyecto','Actividad','Progreso','Estado'],
+         counted(iterate_rows(Activity.objects.all(), ['project__name', 'name', 'progress_percent', 'status']), progress)),
+    ]
+
+
+def inventory_workbook(params=None, progress=None):
+    book = ExcelWorkbook()
+    sheet = book.sheet("Inventario", [20, 15, 15, 15])
+    sheet.header(['Material', 'Unidad', 'Stock', 'Stock Mínimo'])
+    sheet.rows(with_labels(counted(iterate_rows(Material.objects.all(), ['name', 'unit', 'stock', 'min_stock']), progress),
+                           {1: dict(Material.UNIT_CHOICES)}))
+    sheet.blank()
+    sheet.header(['Herramienta', 'Código', 'Estado'])
+    sheet.rows(with_labels(counted(iterate_rows(Tool.objects.all(), ['name', 'code', 'status']), progress),
+                           {2: dict(Tool.STATUS)}))
+    return book
+
+
+def activities_workbook(params=None, progress=None):
+    book = ExcelWorkbook()
+    sheet = book.sheet("Actividades", [20, 25, 15, 15])
+    sheet.header(['Proyecto', 'Actividad', 'Progreso (%)', 'Estado'])
+    sheet.rows(with_labels(counted(iterate_rows(Activity.objects.all(),
+                                                ['project__name', 'name', 'progress_percent', 'status']), progress),
+                           {3: dict(Activity.STATUS)}))
+    return book
+
+
+def ledger_sections(params, progress=None):
+    sections = [(LEDGER_HEADER, counted(ledger_rows(params), progress))]
+    if includes_archive(params):
+        sections.append((LEDGER_HEADER, counted(archived_ledger_rows(params), progress)))
+    return sections
+
+
+def ledger_workbook(params, progress=None):
+    book = ExcelWorkbook()
+    sheet = book.sheet("Movimientos", LEDGER_WIDTHS)
+    sheet.header(LEDGER_HEADER)
+    sheet.rows(counted(ledger_rows(params), progress))
+    if includes_archive(params):
+        sheet = book.sheet("Archivados", LEDGER_WIDTHS)
+        sheet.header(LEDGER_HEADER)
+        sheet.rows(counted(archived_ledger_rows(params), progress))
+    return book
+
+
+def pivot_data(params):
+    return cached_pivot(date.fromisoformat(f"{params['end']}-01"), params['months'], params.get('unit'))
+
+
+def pivot_workbook(params, progress=None):
+    """Una hoja por medida (salidas, ingresos, neto) con un material por fila y un mes por columna."""
+    pivot = pivot_data(params)
+    units = dict(Material.UNIT_CHOICES)
+    labels = [f'{month:%Y-%m}' for month in pivot['months']]
+    book = ExcelWorkbook()
+    for measure, title in MEASURES:
+        sheet = book.sheet(title, [30, 12] + [12] * len(labels) + [14])
+        sheet.header(['Material', 'Unidad', *labels, 'Total'])
+        sheet.rows(counted([[[row['name'], units.get(row['unit'], row['unit']), *row[measure], row[f'{measure}_total']]
+                             for row in pivot['rows']]], progress))
+    return book
+
+
+def _gzip_param(data):
+    return {'gzip': True} if data.get('gzip') else {}
+
+
+def _ledger_params(data):
+    form = LedgerFilterForm(data)
+    if not form.is_valid():
+        raise ValueError(' '.join(message for errors in form.errors.values() for message in errors))
+    return form.params()
+
+
+def _pivot_params(data):
+    form = PivotForm(data)
+    if not form.is_valid():
+        raise ValueError(' '.join(message for errors in form.errors.values() for message in errors))
+    return form.params()
+
+
+def _ledger_csv_params(data):
+    return {**_ledger_params(data), **_gzip_param(data)}
+
+
+class Report:
+    """Un reporte del catálogo: ``build`` devuelve las secciones CSV o el libro Excel.
+
+    ``data`` son los grupos de datos (``core.versioning``) de los que depende;
+    ``parse_params`` valida los parámetros de la solicitud y lanza
+    ``ValueError`` si son inválidos.
+    """
+
+    def __init__(self, title, filename, build, count, data, parse_params=None):
+        self.title = title
+        self.filename = filename
+        self.build = build
+        self.count = count
+        self.data = data
+        self.parse_params = parse_params or (lambda data: {})
+
+    @property
+    def is_excel(self):
+        return self.filename.endswith('.xlsx')
+
+    def output_name(self, params):
+        if not self.is_excel and params.get('gzip'):
+            return self.filename + '.gz'
+        return self.filename
+
+    def content_type(self, params):
+        if self.is_excel:
+            return XLSX_CONTENT_TYPE
+        return 'application/gzip' if params.get('gzip') else 'text/csv; charset=utf-8'
+
+    def write(self, output, params, progress=None):
+        """Escribe el archivo completo en ``output`` (archivo binario abierto)."""
+        if self.is_excel:
+            self.build(params, progress).save(output)
+            return
+        chunks = (text.encode('utf-8') for text in csv_chunks(self.build(params, progress)))
+        if params.get('gzip'):
+            chunks = gzip_chunks(chunks)
+        for chunk in chunks:
+            output.write(chunk)
+
+
+def _inventory_count(params):
+    return Material.objects.count() + Tool.objects.count()
+
+
+def _activities_count(params):
+    return Activity.objects.count()
+
+
+def _ledger_count(params):
+    return ledger_movements(params).count()
+
+
+def _pivot_count(params):
+    return len(pivot_data(params)['rows']) * len(MEASURES)
+
+
+REPORTS = {
+    'inventory_csv': Report('Inventario (CSV)', 'inventario.csv', inventory_sections, _inventory_count,
+                            [MATERIALS, TOOLS], _gzip_param),
+    'inventory_excel': Report('Inventario (Excel)', 'inventario.xlsx', inventory_workbook, _inventory_count,
+                              [MATERIALS, TOOLS]),
+    'activities_csv': Report('Actividades (CSV)', 'actividades.csv', activities_sections, _activities_count,
+                             [ACTIVITIES], _gzip_param),
+    'activities_excel': Report('Actividades (Excel)', 'actividades.xlsx', activities_workbook, _activities_count,
+                               [ACTIVITIES]),
+    'ledger_csv': Report('Libro de movimientos (CSV)', 'movimientos.csv', ledger_sections, _ledger_count,
+                         [MOVEMENTS, MATERIALS], _ledger_csv_params),
+    'ledger_excel': Report('Libro de movimientos (Excel)', 'movimientos.xlsx', ledger_workbook, _ledger_count,
+                           [MOVEMENTS, MATERIALS], _ledger_params),
+    'material_pivot': Report('Consumo por material y mes (Excel)', 'consumo_mensual.xlsx', pivot_workbook,
+                             _pivot_count, [MOVEMENTS, MATERIALS], _pivot_params),
+}
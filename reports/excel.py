@@ -0,0 +1,93 @@
+"""Exportación a Excel con openpyxl en modo ``write_only``.
+
+Cada fila se agrega una vez y se escribe enseguida a un archivo temporal,
+así que la memoria no crece con el número de filas. Los formatos se
+registran una sola vez en el libro como estilos con nombre (encabezado y
+celda) y todas las celdas los comparten, en lugar de crear un ``Border`` y
+una fuente por celda. Las filas vienen de ``iterate_rows`` (tuplas de
+``values_list``, sin instanciar modelos).
+"""
+from copy import copy
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+HEADER_STYLE = 'encabezado'
+CELL_STYLE = 'celda'
+
+
+def _named_styles():
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(name=HEADER_STYLE, border=border, font=Font(bold=True),
+                   fill=PatternFill(start_color='FFD3D3D3', end_color='FFD3D3D3', fill_type='solid'),
+                   alignment=Alignment(horizontal='center')),
+        NamedStyle(name=CELL_STYLE, border=border),
+    ]
+
+
+def with_labels(blocks, choices):
+    """Reemplaza códigos por etiquetas: ``choices`` es ``{columna: dict(Modelo.CHOICES)}``."""
+    for rows in blocks:
+        block = []
+        for row in rows:
+            row = list(row)
+            for column, labels in choices.items():
+                row[column] = labels.get(row[column], row[column])
+            block.append(row)
+        yield block
+
+
+class ExcelSheet:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+        # el estilo con nombre se resuelve una vez; cada celda recibe una copia de su índice
+        self.styles = {}
+        for name in (HEADER_STYLE, CELL_STYLE):
+            template = WriteOnlyCell(worksheet)
+            template.style = name
+            self.styles[name] = template._style
+
+    def _cells(self, values, style):
+        style = self.styles[style]
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(self.worksheet, value)
+            cell._style = copy(style)
+            cells.append(cell)
+        return cells
+
+    def header(self, labels):
+        self.worksheet.append(self._cells(labels, HEADER_STYLE))
+
+    def rows(self, blocks):
+        """Agrega fila por fila los bloques de ``iterate_rows`` (o cualquier iterable de listas de filas)."""
+        append = self.worksheet.append
+        for rows in blocks:
+            for row in rows:
+                append(self._cells(row, CELL_STYLE))
+
+    def blank(self):
+        self.worksheet.append([])
+
+
+class ExcelWorkbook:
+    """Libro de solo escritura con los estilos compartidos del sistema."""
+
+    def __init__(self):
+        self.workbook = Workbook(write_only=True)
+        for style in _named_styles():
+            self.workbook.add_named_style(style)
+
+    def sheet(self, title, widths):
+        """Nueva hoja; los anchos de columna se fijan antes de agregar filas, como exige ``write_only``."""
+        worksheet = self.workbook.create_sheet(title)
+        for i, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = width
+        return ExcelSheet(worksheet)
+
+    def save(self, target):
+        self.workbook.save(target)
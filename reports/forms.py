@@ -0,0 +1,56 @@
+from datetime import date
+from django import forms
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from inventory.models import Material, MaterialMovement
+from .pivot import MEASURES
+User = get_user_model()
+
+class LedgerFilterForm(forms.Form):
+    start = forms.DateField(required=False, label='Desde', widget=forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'))
+    end = forms.DateField(required=False, label='Hasta', widget=forms.DateInput(attrs={'type': 'date'}, format='%Y-%m-%d'))
+    material = forms.ModelChoiceField(queryset=Material.objects.order_by('name'), required=False,
+                                      label='Material', empty_label='Todos')
+    kind = forms.ChoiceField(choices=[('', 'Todos')] + MaterialMovement.KIND, required=False, label='Tipo')
+    user = forms.ModelChoiceField(queryset=User.objects.order_by('username'), required=False,
+                                  label='Usuario', empty_label='Todos')
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get('start'), cleaned.get('end')
+        if start and end and end < start:
+            raise forms.ValidationError('La fecha final no puede ser anterior a la inicial.')
+        return cleaned
+
+    def params(self):
+        """Filtros como parámetros de reporte (serializables en JSON, sin los vacíos)."""
+        values = {
+            'start': self.cleaned_data['start'].isoformat() if self.cleaned_data['start'] else None,
+            'end': self.cleaned_data['end'].isoformat() if self.cleaned_data['end'] else None,
+            'material': self.cleaned_data['material'].pk if self.cleaned_data['material'] else None,
+            'kind': self.cleaned_data['kind'] or None,
+            'user': self.cleaned_data['user'].pk if self.cleaned_data['user'] else None,
+        }
+        return {key: value for key, value in values.items() if value}
+
+class PivotForm(forms.Form):
+    end = forms.CharField(required=False, label='Hasta el mes', widget=forms.TextInput(attrs={'type': 'month'}))
+    months = forms.IntegerField(required=False, min_value=1, max_value=24, initial=12, label='Meses')
+    unit = forms.ChoiceField(choices=[('', 'Todas')] + Material.UNIT_CHOICES, required=False, label='Unidad')
+    measure = forms.ChoiceField(choices=MEASURES, required=False, label='Mostrar')
+
+    def clean_end(self):
+        value = self.cleaned_data['end']
+        if not value:
+            return timezone.localdate().replace(day=1)
+        try:
+            return date.fromisoformat(f'{value}-01')
+        except ValueError:
+            raise forms.ValidationError('Mes inválido (use AAAA-MM).')
+
+    def params(self):
+        """Parámetros de la tabla (sin ``measure``, que solo elige qué columnas se muestran)."""
+        params = {'end': f"{self.cleaned_data['end']:%Y-%m}", 'months': self.cleaned_data['months'] or 12}
+        if self.cleaned_data['unit']:
+            params['unit'] = self.cleaned_data['unit']
+        return params
@@ -0,0 +1,107 @@
+"""Cola de reportes en la base de datos, sin broker externo.
+
+Las vistas crean un ``ReportJob`` y responden de inmediato; el comando
+``report_worker`` toma los trabajos pendientes con un UPDATE condicional
+(``status='pendiente'``: de varios procesos, solo uno gana cada trabajo),
+escribe el archivo en ``REPORT_ROOT`` informando el avance y lo deja
+disponible hasta su vencimiento. Una solicitud igual a otra (mismo reporte
+y parámetros, sin cambios en sus datos desde entonces) pendiente, en curso
+o terminada y vigente reutiliza ese trabajo en lugar de generar el archivo
+de nuevo.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from core.versioning import data_stamp
+from .catalog import REPORTS
+from .models import ReportJob
+
+PROGRESS_SECONDS = 1.0
+
+
+def job_key(kind, params):
+    """Clave del archivo: reporte, parámetros y versión de los datos de los que depende."""
+    stamp = data_stamp(REPORTS[kind].data)
+    return hashlib.sha256(json.dumps([kind, params, stamp], sort_keys=True).encode()).hexdigest()
+
+
+def job_path(job):
+    return Path(settings.REPORT_ROOT) / job.file
+
+
+def enqueue(kind, params=None, user=None):
+    """Encola el reporte ``kind`` o reutiliza uno igual; devuelve ``(trabajo, creado)``."""
+    if kind not in REPORTS:
+        raise KeyError(kind)
+    params = params or {}
+    key = job_key(kind, params)
+    reusable = (ReportJob.objects.filter(key=key)
+                .filter(Q(status__in=['pendiente', 'en_proceso']) | Q(status='terminado', expires_at__gt=timezone.now()))
+                .order_by('-created_at').first())
+    if reusable and (reusable.status != 'terminado' or job_path(reusable).exists()):
+        return reusable, False
+    return ReportJob.objects.create(kind=kind, params=params, key=key, requested_by=user), True
+
+
+def claim_next():
+    """Toma el trabajo pendiente más antiguo; ``None`` si no hay."""
+    for pk in ReportJob.objects.filter(status='pendiente').order_by('created_at', 'id').values_list('id', flat=True)[:10]:
+        now = timezone.now()
+        if ReportJob.objects.filter(pk=pk, status='pendiente').update(status='en_proceso', started_at=now, updated_at=now):
+            return ReportJob.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Genera el archivo del trabajo; un error queda registrado en el trabajo, no se propaga."""
+    report = REPORTS[job.kind]
+    job.file = f"{job.pk}-{report.output_name(job.params)}"
+    path = job_path(job)
+    partial = path.with_name(path.name + '.part')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ReportJob.objects.filter(pk=job.pk).update(rows_total=report.count(job.params), file=job.file)
+
+    written = [0, time.monotonic()]
+
+    def progress(rows):
+        written[0] += rows
+        if time.monotonic() - written[1] >= PROGRESS_SECONDS:
+            written[1] = time.monotonic()
+            ReportJob.objects.filter(pk=job.pk).update(rows_done=written[0], updated_at=timezone.now())
+
+    try:
+        with open(partial, 'wb') as output:
+            report.write(output, job.params, progress)
+        os.replace(partial, path)
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        ReportJob.objects.filter(pk=job.pk).update(status='error', error=str(e) or e.__class__.__name__,
+                                                   finished_at=timezone.now(), updated_at=timezone.now())
+    else:
+        now = timezone.now()
+        ReportJob.objects.filter(pk=job.pk).update(
+            status='terminado', rows_done=written[0], size=path.stat().st_size, finished_at=now, updated_at=now,
+            expires_at=now + timedelta(hours=settings.REPORT_TTL_HOURS))
+    job.refresh_from_db()
+    return job
+
+
+def expire_jobs():
+    """Borra los archivos vencidos y marca sus trabajos; devuelve cuántos venció."""
+    expired = list(ReportJob.objects.filter(status='terminado', expires_at__lte=timezone.now()))
+    for job in expired:
+        job_path(job).unlink(missing_ok=True)
+    return ReportJob.objects.filter(pk__in=[job.pk for job in expired]).update(status='vencido', updated_at=timezone.now())
+
+
+def requeue_stale(minutes):
+    """Devuelve a la cola los trabajos en curso sin avance por ``minutes`` (procesador detenido)."""
+    limit = timezone.now() - timedelta(minutes=minutes)
+    return (ReportJob.objects.filter(status='en_proceso', updated_at__lt=limit)
+            .update(status='pendiente', rows_done=0, updated_at=timezone.now()))
@@ -0,0 +1,101 @@
+"""Libro de movimientos de material para auditoría (CSV y Excel).
+
+Los movimientos filtrados por fecha y tipo se leen en un solo recorrido
+ordenado por ``(material, created_at, id)``, con paginación por esa clave
+y el nombre del material en la misma consulta: cada página continúa donde
+terminó la anterior, así que el costo depende de las filas exportadas y no
+de cuántos materiales hay (los que no tienen movimientos en el rango no
+cuestan nada).
+Si el rango alcanza el historial archivado (``archive_history``), esos
+movimientos se agregan en una sección aparte, leídos en streaming desde
+los archivos.
+"""
+from datetime import date, timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils import timezone
+from core.archive import archived_before, local_midnight
+from inventory.archive import KIND as ARCHIVE_KIND, archived_movements
+from inventory.models import Material, MaterialMovement
+from .exports import CHUNK_ROWS
+
+LEDGER_HEADER = ['Fecha', 'Tipo', 'Material', 'Cantidad', 'Usuario', 'Notas']
+LEDGER_WIDTHS = [20, 10, 30, 12, 15, 40]
+KINDS = dict(MaterialMovement.KIND)
+
+
+def ledger_bounds(params):
+    """Instantes ``[desde, hasta)`` del rango de fechas de ``params`` (``None`` si no hay límite)."""
+    start = local_midnight(date.fromisoformat(params['start'])) if params.get('start') else None
+    end = local_midnight(date.fromisoformat(params['end']) + timedelta(days=1)) if params.get('end') else None
+    return start, end
+
+
+def ledger_movements(params):
+    start, end = ledger_bounds(params)
+    movements = MaterialMovement.objects.order_by()
+    if start:
+        movements = movements.filter(created_at__gte=start)
+    if end:
+        movements = movements.filter(created_at__lt=end)
+    if params.get('kind'):
+        movements = movements.filter(kind=params['kind'])
+    if params.get('user'):
+        movements = movements.filter(user_id=params['user'])
+    if params.get('material'):
+        movements = movements.filter(material_id=params['material'])
+    return movements
+
+
+def _row(created_at, kind, material, quantity, username, notes):
+    return [timezone.localtime(created_at).strftime('%Y-%m-%d %H:%M:%S'), KINDS.get(kind, kind),
+            material, quantity, username or '', notes]
+
+
+def ledger_rows(params, chunk_size=CHUNK_ROWS):
+    """Bloques de filas del libro vigente, ordenado por material y fecha."""
+    qs = (ledger_movements(params).order_by('material', 'created_at', 'id')
+          .values_list('created_at', 'kind', 'material__name', 'quantity', 'user__username', 'notes',
+                       'material_id', 'id'))
+    last = None
+    while True:
+        page = qs
+        if last:
+            material_id, created_at, pk = last
+            page = qs.filter(Q(material_id__gt=material_id)
+                             | Q(material_id=material_id, created_at__gt=created_at)
+                             | Q(material_id=material_id, created_at=created_at, id__gt=pk))
+        rows = list(page[:chunk_size])
+        if rows:
+            yield [_row(*row[:6]) for row in rows]
+        if len(rows) < chunk_size:
+            break
+        last = rows[-1][6], rows[-1][0], rows[-1][7]
+
+
+def includes_archive(params):
+    cutoff = archived_before(ARCHIVE_KIND)
+    start, end = ledger_bounds(params)
+    return cutoff is not None and (start is None or start < cutoff)
+
+
+def archived_ledger_rows(params, chunk_size=CHUNK_ROWS):
+    """Bloques de filas archivadas dentro del rango, en el orden de los archivos (por fecha)."""
+    start, end = ledger_bounds(params)
+    material_id = int(params['material']) if params.get('material') else None
+    user_id = int(params['user']) if params.get('user') else None
+    names = dict(Material.objects.values_list('pk', 'name'))
+    usernames = dict(get_user_model().objects.values_list('pk', 'username'))
+    # archived_movements incluye el extremo final; el rango del libro lo excluye
+    until = end - timedelta(microseconds=1) if end else None
+    block = []
+    for row in archived_movements(material_id, start, until):
+        if (params.get('kind') and row['kind'] != params['kind']) or (user_id and row['user_id'] != user_id):
+            continue
+        block.append(_row(row['created_at'], row['kind'], names.get(row['material_id'], row['material_id']),
+                          row['quantity'], usernames.get(row['user_id']), row['notes']))
+        if len(block) >= chunk_size:
+            yield block
+            block = []
+    if block:
+        yield block
@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from reports.jobs import claim_next, expire_jobs, requeue_stale, run_job
+
+
+class Command(BaseCommand):
+    help = ("Procesa los reportes encolados desde la web (ReportJob) y deja los archivos en REPORT_ROOT; "
+            "también borra los archivos vencidos.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Procesa los pendientes y termina.')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Segundos de espera cuando no hay trabajos (2).')
+        parser.add_argument('--stale-minutes', type=int, default=15,
+                            help='Reencola trabajos en curso sin avance por estos minutos (15).')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            requeue_stale(options['stale_minutes'])
+            expired = expire_jobs()
+            if expired:
+                self.stdout.write(f"{expired} reporte(s) vencido(s) eliminados.")
+            job = claim_next()
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+            job = run_job(job)
+            if job.status == 'terminado':
+                self.stdout.write(self.style.SUCCESS(f"{job}: {job.rows_done} filas, {job.size} bytes."))
+            else:
+                self.stdout.write(self.style.ERROR(f"{job}: {job.error}"))
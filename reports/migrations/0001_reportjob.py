@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-18 08:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50, verbose_name='Reporte')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parámetros')),
+                ('key', models.CharField(max_length=64, verbose_name='Clave')),
+                ('status', models.CharField(choices=[('pendiente', 'Pendiente'), ('en_proceso', 'En proceso'), ('terminado', 'Terminado'), ('error', 'Error'), ('vencido', 'Vencido')], default='pendiente', max_length=20, verbose_name='Estado')),
+                ('rows_total', models.PositiveIntegerField(default=0, verbose_name='Filas Totales')),
+                ('rows_done', models.PositiveIntegerField(default=0, verbose_name='Filas Escritas')),
+                ('file', models.CharField(blank=True, max_length=255, verbose_name='Archivo')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='Tamaño')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Solicitado')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Actualización')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Término')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Vence')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='report_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de Reporte',
+                'verbose_name_plural': 'Trabajos de Reportes',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['key', 'status'], name='reports_rep_key_c40d58_idx'), models.Index(fields=['status', 'created_at'], name='reports_rep_status_051565_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+User = get_user_model()
+
+
+class ReportJob(models.Model):
+    """Reporte generado en segundo plano por el comando ``report_worker``."""
+    STATUS = [
+        ('pendiente', 'Pendiente'),
+        ('en_proceso', 'En proceso'),
+        ('terminado', 'Terminado'),
+        ('error', 'Error'),
+        ('vencido', 'Vencido'),
+    ]
+    kind = models.CharField(max_length=50, verbose_name='Reporte')
+    params = models.JSONField(default=dict, blank=True, verbose_name='Parámetros')
+    key = models.CharField(max_length=64, verbose_name='Clave')
+    status = models.CharField(max_length=20, choices=STATUS, default='pendiente', verbose_name='Estado')
+    rows_total = models.PositiveIntegerField(default=0, verbose_name='Filas Totales')
+    rows_done = models.PositiveIntegerField(default=0, verbose_name='Filas Escritas')
+    file = models.CharField(max_length=255, blank=True, verbose_name='Archivo')
+    size = models.PositiveBigIntegerField(default=0, verbose_name='Tamaño')
+    error = models.TextField(blank=True, verbose_name='Error')
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL,
+                                     related_name='report_jobs', verbose_name='Solicitado por')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Solicitado')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Inicio')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Última Actualización')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Término')
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name='Vence')
+
+    def __str__(self): return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def progress_percent(self):
+        if self.status == 'terminado':
+            return 100
+        if not self.rows_total:
+            return 0
+        return min(99, self.rows_done * 100 // self.rows_total)
+
+    class Meta:
+        verbose_name = 'Trabajo de Reporte'
+        verbose_name_plural = 'Trabajos de Reportes'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['key', 'status']),
+            models.Index(fields=['status', 'created_at']),
+        ]
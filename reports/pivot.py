@@ -0,0 +1,66 @@
+"""Tabla dinámica material × mes: ingresos, salidas y neto.
+
+Se lee directo del resumen mensual ``MaterialMonthlyTotal`` (mantenido con
+cada movimiento), no de los movimientos ni del resumen diario: a Python
+llega exactamente una fila por material y mes con movimientos, sin agrupar
+nada en la consulta. El resultado se guarda en caché por parámetros y por
+versión de los movimientos y los materiales (``core.versioning``), así que
+un movimiento nuevo lo invalida sin borrar nada.
+
+Los modelos no tienen obra ni proyecto asociado a los movimientos, por lo
+que el único filtro adicional es la unidad del material.
+"""
+from datetime import date
+from django.core.cache import cache
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from core.versioning import MATERIALS, MOVEMENTS, data_stamp
+from inventory.models import MaterialMonthlyTotal
+
+CACHE_SECONDS = 60 * 60
+MEASURES = [('salida', 'Salidas'), ('ingreso', 'Ingresos'), ('neto', 'Neto')]
+
+
+def month_starts(end_month, months):
+    """Primer día de los ``months`` meses que terminan en ``end_month`` (inclusive)."""
+    index = end_month.year * 12 + end_month.month - 1
+    return [date(i // 12, i % 12 + 1, 1) for i in range(index - months + 1, index + 1)]
+
+
+def build_pivot(end_month, months, unit=None):
+    """``{'months': [fechas], 'rows': [{material, nombre, unidad, ingreso[], salida[], neto[]}]}``."""
+    starts = month_starts(end_month, months)
+    position = {month: i for i, month in enumerate(starts)}
+    totals = MaterialMonthlyTotal.objects.filter(month__gte=starts[0], month__lte=starts[-1])
+    if unit:
+        totals = totals.filter(material__unit=unit)
+    # montos como float (igual que en los pronósticos): sin convertir a Decimal cada celda ni serializarlos en la caché
+    cells = (totals.order_by()
+             .annotate(ingreso=Cast('ingreso_total', FloatField()), salida=Cast('salida_total', FloatField()))
+             .values_list('material_id', 'material__name', 'material__unit', 'month', 'ingreso', 'salida'))
+    rows = {}
+    for material_id, name, material_unit, month, ingreso, salida in cells:
+        row = rows.get(material_id)
+        if row is None:
+            row = rows[material_id] = {
+                'material': material_id, 'name': name, 'unit': material_unit,
+                'ingreso': [0] * months, 'salida': [0] * months,
+            }
+        i = position[month]
+        row['ingreso'][i] = ingreso
+        row['salida'][i] = salida
+    ordered = sorted(rows.values(), key=lambda r: (r['name'], r['material']))
+    for row in ordered:
+        row['neto'] = [i - s for i, s in zip(row['ingreso'], row['salida'])]
+        for measure, _ in MEASURES:
+            row[f'{measure}_total'] = sum(row[measure])
+    return {'months': starts, 'rows': ordered}
+
+
+def cached_pivot(end_month, months, unit=None):
+    key = f"pivot:{end_month:%Y-%m}:{months}:{unit or ''}:{data_stamp([MOVEMENTS, MATERIALS])}"
+    pivot = cache.get(key)
+    if pivot is None:
+        pivot = build_pivot(end_month, months, unit)
+        cache.set(key, pivot, CACHE_SECONDS)
+    return pivot
@@ -2,8 +2,19 @@ from django.urls import path
 from . import views
 urlpatterns = [
     path('', views.reports_home, name='reports_home'),
+    path('consumption/', views.consumption, name='consumption'),
+    path('forecast/', views.reorder_forecast, name='reorder_forecast'),
+    path('scurve/', views.scurve, name='scurve'),
     path('inventory/csv/', views.inventory_csv, name='inventory_csv'),
     path('inventory/excel/', views.inventory_excel, name='inventory_excel'),
     path('activities/csv/', views.activities_csv, name='activities_csv'),
     path('activities/excel/', views.activities_excel, name='activities_excel'),
+    path('ledger/', views.movement_ledger, name='movement_ledger'),
+    path('ledger/csv/', views.ledger_csv, name='ledger_csv'),
+    path('ledger/excel/', views.ledger_excel, name='ledger_excel'),
+    path('pivot/', views.material_pivot, name='material_pivot'),
+    path('pivot/excel/', views.pivot_excel, name='pivot_excel'),
+    path('jobs/<str:kind>/new/', views.report_job_create, name='report_job_create'),
+    path('jobs/<int:pk>/', views.report_job_status, name='report_job_status'),
+    path('jobs/<int:pk>/download/', views.report_job_download, name='report_job_download'),
 ]
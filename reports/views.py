@@ -1,148 +1,226 @@
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
-from django.shortcuts import render
-import csv
-from openpyxl import Workbook
-from inventory.models import Material, Tool
-from activities.models import Project, Activity
+from django.contrib import messages
+from django.http import FileResponse, Http404, HttpResponseBadRequest, JsonResponse
+from django.core.paginator import Paginator
+from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import condition, require_POST
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import timedelta
+from inventory.models import Material, MaterialDailyTotal
+from inventory.rollups import cached_monthly_totals
+from inventory.forecasting import cached_forecast, WINDOW_DAYS, LEAD_TIME_DAYS
+from activities.models import Project
+from activities.scurve import cached_scurve, weekly_points
+from .cache import cached_response, report_etag
+from .catalog import REPORTS, inventory_sections, activities_sections, ledger_sections, pivot_data
+from .exports import streaming_csv
+from .forms import LedgerFilterForm, PivotForm
+from .ledger import includes_archive, ledger_movements
+from .jobs import enqueue, job_path
+from .pivot import MEASURES
+from .models import ReportJob
 
 @login_required
 def reports_home(request):
     return render(request, 'reports/reports_home.html')
 
 @login_required
+def consumption(request):
+    since = (timezone.localdate() - timedelta(days=365)).replace(day=1)
+    material = None
+    if request.GET.get('material'):
+        if not request.GET['material'].isdecimal():
+            return HttpResponseBadRequest('Material inválido.')
+        material = get_object_or_404(Material, pk=request.GET['material'])
+    top = (MaterialDailyTotal.objects.filter(day__gte=since)
+           .values('material', 'material__name', 'material__unit')
+           .annotate(salida=Sum('salida_total'), ingreso=Sum('ingreso_total'))
+           .order_by('-salida')[:10])
+    return render(request, 'reports/consumption.html', {
+        'since': since,
+        'material': material,
+        'months': cached_monthly_totals(since, material),
+        'top': top,
+    })
+
+@login_required
+def reorder_forecast(request):
+    def int_param(name, default):
+        try:
+            return max(1, min(int(request.GET.get(name, default)), 365))
+        except ValueError:
+            return default
+    window = int_param('window', WINDOW_DAYS)
+    lead_time = int_param('lead_time', LEAD_TIME_DAYS)
+    data = cached_forecast(window, lead_time)
+    return render(request, 'reports/forecast.html', {
+        'rows': data['rows'],
+        'consuming': data['consuming'],
+        'window': window,
+        'lead_time': lead_time,
+    })
+
+@login_required
+def scurve(request):
+    project = None
+    if request.GET.get('project'):
+        project = get_object_or_404(Project, pk=request.GET['project'])
+    include_archive = bool(request.GET.get('archive'))
+    curve = cached_scurve([project.pk] if project else None, include_archive)
+    if request.GET.get('format') == 'json':
+        return JsonResponse(curve)
+    points = weekly_points(curve)
+    return render(request, 'reports/scurve.html', {
+        'project': project,
+        'projects': Project.objects.order_by('name').only('id', 'name'),
+        'points': points,
+        'latest': points[-1] if points else None,
+        'include_archive': include_archive,
+    })
+
+# ETag = reporte + parámetros + versión de sus datos: sin cambios se responde 304.
+# Descargas directas (sin pasar por la cola de ``ReportJob``). Los botones del
+# Centro de Reportes y los Excel del libro de movimientos y de la tabla
+# material × mes usan la cola; estas URL se mantienen para enlaces guardados,
+# scripts y las descargas acotadas de las páginas de filtros, y siguen siendo
+# sincrónicas porque ninguna
+# arma el archivo completo en la solicitud en cada descarga:
+# - los CSV se envían en streaming, con memoria acotada y el primer byte enseguida;
+# - los Excel se generan una vez por versión de los datos (``reports.cache``):
+#   una descarga repetida envía el archivo guardado o un 304 por ETag, y solo
+#   la primera tras un cambio paga la generación.
+@login_required
+@condition(etag_func=report_etag('inventory_csv'))
 def inventory_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="inventario.csv"'
-    writer = csv.writer(response)
-    writer.writerow(['Material','Unidad','Stock','Stock Minimo'])
-    for m in Material.objects.all():
-        writer.writerow([m.name, m.unit, m.stock, m.min_stock])
-    writer.writerow([])
-    writer.writerow(['Herramienta','Código','Estado'])
-    for t in Tool.objects.all():
-        writer.writerow([t.name, t.code, t.status])
-    return response
+    return streaming_csv('inventario.csv', inventory_sections(), compress=bool(request.GET.get('gzip')))
 
 @login_required
+@condition(etag_func=report_etag('activities_csv'))
 def activities_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="actividades.csv"'
-    writer = csv.writer(response)
-    writer.writerow(['Proyecto','Actividad','Progreso','Estado'])
-    for a in Activity.objects.select_related('project').all():
-        writer.writerow([a.project.name, a.name, a.progress_percent, a.status])
-    return response
+    return streaming_csv('actividades.csv', activities_sections(), compress=bool(request.GET.get('gzip')))
 
 @login_required
+@condition(etag_func=report_etag('inventory_excel'))
 def inventory_excel(request):
-    from openpyxl.styles import Border, Side, Alignment, PatternFill, Font
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Inventario"
-
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    header_fill = PatternFill(start_color="FFD3D3D3", end_color="FFD3D3D3", fill_type="solid")
-    header_font = Font(bold=True)
-
-    # Materiales
-    ws['A1'] = 'Material'
-    ws['B1'] = 'Unidad'
-    ws['C1'] = 'Stock'
-    ws['D1'] = 'Stock Mínimo'
-
-    for col in ['A1', 'B1', 'C1', 'D1']:
-        ws[col].border = thin_border
-        ws[col].fill = header_fill
-        ws[col].font = header_font
-        ws[col].alignment = Alignment(horizontal='center')
-
-    row = 2
-    for m in Material.objects.all():
-        ws[f'A{row}'] = m.name
-        ws[f'B{row}'] = m.get_unit_display()
-        ws[f'C{row}'] = m.stock
-        ws[f'D{row}'] = m.min_stock
-        for col in ['A', 'B', 'C', 'D']:
-            ws[f'{col}{row}'].border = thin_border
-        row += 1
-
-    # Espacio
-    row += 1
-
-    # Herramientas
-    ws[f'A{row}'] = 'Herramienta'
-    ws[f'B{row}'] = 'Código'
-    ws[f'C{row}'] = 'Estado'
-
-    for col in ['A', 'B', 'C']:
-        cell = ws[f'{col}{row}']
-        cell.border = thin_border
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-
-    row += 1
-    for t in Tool.objects.all():
-        ws[f'A{row}'] = t.name
-        ws[f'B{row}'] = t.code
-        ws[f'C{row}'] = t.get_status_display()
-        for col in ['A', 'B', 'C']:
-            ws[f'{col}{row}'].border = thin_border
-        row += 1
-
-    # Ajustar ancho de columnas
-    ws.column_dimensions['A'].width = 20
-    ws.column_dimensions['B'].width = 15
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 15
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="inventario.xlsx"'
-    wb.save(response)
-    return response
+    return cached_response(request, 'inventory_excel')
 
 @login_required
+@condition(etag_func=report_etag('activities_excel'))
 def activities_excel(request):
-    from openpyxl.styles import Border, Side, Alignment, PatternFill, Font
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Actividades"
-
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    header_fill = PatternFill(start_color="FFD3D3D3", end_color="FFD3D3D3", fill_type="solid")
-    header_font = Font(bold=True)
-
-    ws['A1'] = 'Proyecto'
-    ws['B1'] = 'Actividad'
-    ws['C1'] = 'Progreso (%)'
-    ws['D1'] = 'Estado'
-
-    for col in ['A1', 'B1', 'C1', 'D1']:
-        ws[col].border = thin_border
-        ws[col].fill = header_fill
-        ws[col].font = header_font
-        ws[col].alignment = Alignment(horizontal='center')
-
-    row = 2
-    for a in Activity.objects.select_related('project').all():
-        ws[f'A{row}'] = a.project.name
-        ws[f'B{row}'] = a.name
-        ws[f'C{row}'] = a.progress_percent
-        ws[f'D{row}'] = a.get_status_display()
-        for col in ['A', 'B', 'C', 'D']:
-            ws[f'{col}{row}'].border = thin_border
-        row += 1
-
-    # Ajustar ancho de columnas
-    ws.column_dimensions['A'].width = 20
-    ws.column_dimensions['B'].width = 25
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 15
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="actividades.xlsx"'
-    wb.save(response)
-    return response
+    return cached_response(request, 'activities_excel')
+
+@login_required
+def movement_ledger(request):
+    form = LedgerFilterForm(request.GET or None)
+    params = form.params() if form.is_valid() else None
+    return render(request, 'reports/ledger.html', {
+        'form': form,
+        'params': params,
+        'query': request.GET.urlencode(),
+        'count': ledger_movements(params).count() if params is not None else None,
+        'archived': includes_archive(params) if params is not None else False,
+    })
+
+@login_required
+@condition(etag_func=report_etag('ledger_csv'))
+def ledger_csv(request):
+    try:
+        params = REPORTS['ledger_csv'].parse_params(request.GET)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    return streaming_csv('movimientos.csv', ledger_sections(params), compress=bool(params.get('gzip')))
+
+@login_required
+@condition(etag_func=report_etag('ledger_excel'))
+def ledger_excel(request):
+    try:
+        return cached_response(request, 'ledger_excel')
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+@login_required
+def material_pivot(request):
+    form = PivotForm(request.GET)
+    pivot, params, measure = None, None, 'salida'
+    if form.is_valid():
+        params = form.params()
+        pivot = pivot_data(params)
+        measure = form.cleaned_data['measure'] or 'salida'
+    rows = pivot['rows'] if pivot else []
+    page = Paginator(rows, 100).get_page(request.GET.get('page'))
+    query = request.GET.copy()
+    query.pop('page', None)
+    units = dict(Material.UNIT_CHOICES)
+    return render(request, 'reports/pivot.html', {
+        'form': form,
+        'params': params,
+        'measure': measure,
+        'measure_label': dict(MEASURES)[measure],
+        'months': pivot['months'] if pivot else [],
+        'page': page,
+        'rows': [(row, units.get(row['unit'], row['unit']), row[measure], row[f'{measure}_total']) for row in page],
+        'totals': [sum(values) for values in zip(*(row[measure] for row in rows))] if rows else [],
+        'grand_total': sum(row[f'{measure}_total'] for row in rows),
+        'query': query.urlencode(),
+    })
+
+@login_required
+@condition(etag_func=report_etag('material_pivot'))
+def pivot_excel(request):
+    try:
+        return cached_response(request, 'material_pivot')
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+def _job_payload(job):
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'progress': job.progress_percent,
+        'rows_done': job.rows_done,
+        'rows_total': job.rows_total,
+        'error': job.error,
+        'status_url': reverse('report_job_status', args=[job.pk]),
+        'download_url': reverse('report_job_download', args=[job.pk]) if job.status == 'terminado' else None,
+    }
+
+@login_required
+@require_POST
+def report_job_create(request, kind):
+    report = REPORTS.get(kind)
+    if report is None:
+        raise Http404('Reporte desconocido.')
+    try:
+        params = report.parse_params(request.POST)
+    except ValueError as e:
+        if request.GET.get('format') == 'json':
+            return JsonResponse({'error': str(e)}, status=400)
+        messages.error(request, str(e))
+        return redirect('reports_home')
+    job, created = enqueue(kind, params, request.user)
+    if request.GET.get('format') == 'json':
+        return JsonResponse(_job_payload(job), status=202 if created else 200)
+    if created:
+        messages.info(request, f'Reporte "{report.title}" en cola. La descarga estará disponible al terminar.')
+    return redirect('report_job_status', pk=job.pk)
+
+@login_required
+def report_job_status(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk)
+    if request.GET.get('format') == 'json':
+        return JsonResponse(_job_payload(job))
+    return render(request, 'reports/report_job.html', {'job': job, 'report': REPORTS.get(job.kind)})
+
+@login_required
+def report_job_download(request, pk):
+    job = get_object_or_404(ReportJob, pk=pk, status='terminado')
+    path = job_path(job)
+    if not path.exists():
+        raise Http404('El archivo del reporte ya no está disponible.')
+    report = REPORTS[job.kind]
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=report.output_name(job.params),
+                        content_type=report.content_type(job.params))